@@ -0,0 +1,266 @@
+"""
+Optional Redis support for response/session caches
+Uses Redis when REDIS_URL is set and redis is installed, so every worker
+shares one cache; falls back to a per-process TTL dict otherwise
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+import numpy as np
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+_redis_client = None
+if redis is not None and REDIS_URL:
+    try:
+        _redis_client = redis.Redis.from_url(REDIS_URL, decode_responses=False)
+        _redis_client.ping()
+        print(f"✅ Shared cache: Redis at {REDIS_URL}")
+    except Exception as e:
+        print(f"⚠️ Redis unavailable ({str(e)[:60]}), using in-process cache")
+        _redis_client = None
+
+REDIS_AVAILABLE = _redis_client is not None
+
+
+class TTLCache:
+    """Key/value cache with a per-entry time-to-live (LRU-bounded when in-process)"""
+
+    def __init__(self, namespace: str, ttl: int, max_entries: int = 256):
+        """
+        Args:
+            namespace: Key prefix, keeps caches apart inside one Redis
+            ttl: Seconds an entry stays valid
+            max_entries: In-process cap; least recently used entries go first
+                (Redis bounds memory itself via maxmemory-policy allkeys-lru)
+        """
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local = OrderedDict()  # key -> (expires_at, value), oldest use first
+        self._lock = threading.Lock()
+
+    def _key(self, key) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key):
+        """Return the cached value, or None when missing or expired"""
+        if _redis_client is not None:
+            try:
+                raw = _redis_client.get(self._key(key))
+                return pickle.loads(raw) if raw is not None else None
+            except Exception as e:
+                print(f"⚠️ Redis get failed: {str(e)[:60]}")
+                return None
+
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value):
+        """Store a value for ttl seconds"""
+        if _redis_client is not None:
+            try:
+                _redis_client.setex(self._key(key), self.ttl, pickle.dumps(value))
+            except Exception as e:
+                print(f"⚠️ Redis set failed: {str(e)[:60]}")
+            return
+
+        now = time.monotonic()
+        local = self._local
+        with self._lock:
+            local[key] = (now + self.ttl, value)
+            local.move_to_end(key)
+            # Evict past the cap, plus any expired entries at the cold end
+            while len(local) > self.max_entries or next(iter(local.values()))[0] < now:
+                local.popitem(last=False)
+
+
+def cacheable(namespace: str, ttl: int, max_entries: int = 256):
+    """
+    Cache a read-only function's results in a TTLCache keyed by its arguments
+
+    Only for INFORMATIONAL calls (pure retrieval, no side effects). Empty
+    results and error dicts are not cached, so failures are retried.
+
+    Args:
+        namespace: TTLCache namespace
+        ttl: Seconds a result stays valid
+        max_entries: In-process cap
+    """
+    def decorator(fn):
+        cache = TTLCache(namespace, ttl, max_entries)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = hashlib.blake2b(repr((args, sorted(kwargs.items()))).encode("utf-8"),
+                                  digest_size=16).hexdigest()
+            value = cache.get(key)
+            if value is None:
+                value = fn(*args, **kwargs)
+                if value and not (isinstance(value, dict) and "error" in value):
+                    cache.set(key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+class SingleFlight:
+    """Collapses concurrent calls for the same key into one call (per process)"""
+
+    def __init__(self):
+        self._calls = {}  # key -> Future of the call in flight
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args):
+        """
+        Run fn(*args), or wait for the identical call already in flight
+
+        Args:
+            key: Identifies calls that return the same result
+            fn: Function to run when no call for key is in flight
+
+        Returns:
+            fn's result (its exception is raised to every waiter)
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            with self._lock:
+                del self._calls[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._calls[key]
+        future.set_result(result)
+        return result
+
+
+class SimilarityCache:
+    """
+    In-process cache that also answers for nearby inputs
+
+    Inputs are numeric feature vectors, scaled by the caller so that a
+    distance of 1.0 means "meaningfully different". A lookup returns the
+    value of the closest live entry in the same group within max_distance.
+    """
+
+    def __init__(self, ttl: int, max_distance: float = 1.0, max_entries: int = 512):
+        """
+        Args:
+            ttl: Seconds an entry stays valid
+            max_distance: Largest Euclidean distance still counted as a hit
+            max_entries: Cap across all groups; oldest entries go first
+        """
+        self.ttl = ttl
+        self.max_distance = max_distance
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (group, vector bytes) -> (expires_at, group, vector, value)
+        self._lock = threading.Lock()
+
+    def get(self, group, vector):
+        """
+        Args:
+            group: Exact-match partition (entries never match across groups)
+            vector: Scaled feature vector
+
+        Returns:
+            (value, distance) of the nearest live entry, or (None, None)
+        """
+        vector = np.asarray(vector, dtype=np.float64)
+        now = time.monotonic()
+        with self._lock:
+            candidates = [(key, entry) for key, entry in self._entries.items()
+                          if entry[1] == group and entry[0] >= now]
+            if not candidates:
+                return None, None
+            distances = np.linalg.norm(np.stack([entry[2] for _, entry in candidates]) - vector, axis=1)
+            best = int(np.argmin(distances))
+            if distances[best] > self.max_distance:
+                return None, None
+            key, entry = candidates[best]
+            self._entries.move_to_end(key)
+            return entry[3], float(distances[best])
+
+    def set(self, group, vector, value):
+        """Store a value for ttl seconds"""
+        vector = np.asarray(vector, dtype=np.float64)
+        now = time.monotonic()
+        key = (group, vector.tobytes())
+        with self._lock:
+            self._entries[key] = (now + self.ttl, group, vector, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries or next(iter(self._entries.values()))[0] < now:
+                self._entries.popitem(last=False)
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket (per process)
+
+    Callers wait for a token instead of firing requests that would be
+    rejected upstream and then sleeping through retries.
+    """
+
+    def __init__(self, rate: int, period: float = 60.0):
+        """
+        Args:
+            rate: Requests allowed per period (also the burst size)
+            period: Seconds over which rate refills
+        """
+        self.capacity = float(rate)
+        self.refill_per_second = rate / period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout: float = None) -> bool:
+        """
+        Take one token, waiting up to timeout seconds for the bucket to refill
+
+        Returns:
+            True once a token was taken, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._updated) * self.refill_per_second)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.refill_per_second
+                if deadline is not None:
+                    if now >= deadline:
+                        return False
+                    wait = min(wait, deadline - now)
+                self._cond.wait(wait)
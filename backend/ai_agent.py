@@ -17,6 +17,10 @@ from langchain_community.tools.tavily_search import TavilySearchResults
 from langchain_core.messages.ai import AIMessage
 from langchain.tools import tool
 from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared pool for overlapping blocking Yahoo Finance requests within one report
+_upstream_pool = ThreadPoolExecutor(max_workers=8)
 
 # Finance Analysis Functions
 def calculate_cagr(start_value: float, end_value: float, periods: float) -> float:
@@ -131,9 +135,13 @@ def generate_financial_report(symbol: str, benchmark: str = "^GSPC") -> str:
         stock = yf.Ticker(symbol)
         benchmark_ticker = yf.Ticker(benchmark)
         
-        # Get 2 years of data
-        stock_hist = stock.history(period="2y")
-        benchmark_hist = benchmark_ticker.history(period="2y")
+        # Get 2 years of data - the three downloads are independent, so
+        # issue them together and wait on the slowest instead of the sum
+        stock_hist_future = _upstream_pool.submit(stock.history, period="2y")
+        benchmark_hist_future = _upstream_pool.submit(benchmark_ticker.history, period="2y")
+        info_future = _upstream_pool.submit(lambda: stock.info)
+        stock_hist = stock_hist_future.result()
+        benchmark_hist = benchmark_hist_future.result()
         
         if stock_hist.empty:
             return json.dumps({"error": f"No data found for {symbol}"})
@@ -148,7 +156,7 @@ def generate_financial_report(symbol: str, benchmark: str = "^GSPC") -> str:
         benchmark_returns_aligned = benchmark_returns.loc[common_dates]
         
         # Get stock info
-        info = stock.info
+        info = info_future.result()
         
         # Calculate financial metrics
         start_price = stock_hist['Close'].iloc[0]
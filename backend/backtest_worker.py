@@ -7,33 +7,307 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from array import array
+from collections import OrderedDict
+import hashlib
+import os
+import threading
 import uuid
 
 from indicators import IndicatorEngine, ConditionEvaluator
+from _njit import njit, NUMBA_AVAILABLE
+
+
+# On-disk cache for downloaded OHLCV history (Parquet, one file per request range)
+DATA_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'ohlcv')
+
+# In-memory LRU of indicator results keyed by (OHLCV hash, indicator, params),
+# shared across runs - cached Series must be treated as read-only
+INDICATOR_CACHE_SIZE = 256
+_indicator_cache = OrderedDict()
+_indicator_cache_lock = threading.Lock()
+
+# Action codes understood by the simulation kernel
+ACTION_NONE = 0
+ACTION_BUY = 1
+ACTION_SELL = 2
+ACTION_EXIT_ALL = 3
+ACTION_CODES = {'BUY': ACTION_BUY, 'SELL': ACTION_SELL, 'EXIT_ALL': ACTION_EXIT_ALL}
+
+# Exit reasons, indexed by the reason code stored in the trade log
+EXIT_REASONS = ('stop-loss', 'take-profit', 'logic', 'exit-all')
+
+# Trade log columns written by the simulation kernel
+(T_ENTRY_IDX, T_EXIT_IDX, T_QTY, T_ENTRY_PRICE, T_EXIT_PRICE, T_STOP_LOSS,
+ T_TAKE_PROFIT, T_REASON, T_ENTRY_CASH, T_EXIT_CASH) = range(10)
+TRADE_LOG_COLUMNS = 10
+
+
+@njit(cache=True, nogil=True)
+def _log_trade(row, entry_idx, exit_idx, qty, entry_price, exit_price,
+               sl, tp, reason, entry_cash, exit_cash):
+    """Write one closed trade into a trade log row"""
+    row[T_ENTRY_IDX] = entry_idx
+    row[T_EXIT_IDX] = exit_idx
+    row[T_QTY] = qty
+    row[T_ENTRY_PRICE] = entry_price
+    row[T_EXIT_PRICE] = exit_price
+    row[T_STOP_LOSS] = sl
+    row[T_TAKE_PROFIT] = tp
+    row[T_REASON] = reason
+    row[T_ENTRY_CASH] = entry_cash
+    row[T_EXIT_CASH] = exit_cash
+
+
+@njit(cache=True, nogil=True)
+def _first_exit_bar(high, low, start, sl, tp):
+    """First bar >= start where the stop loss or take profit is hit (len(high) if never)"""
+    n = high.shape[0]
+    has_sl = not np.isnan(sl) and sl != 0.0
+    has_tp = not np.isnan(tp) and tp != 0.0
+    if not has_sl and not has_tp:
+        return n
+    if not has_tp:
+        for j in range(start, n):
+            if low[j] <= sl:
+                return j
+        return n
+    if not has_sl:
+        for j in range(start, n):
+            if high[j] >= tp:
+                return j
+        return n
+    for j in range(start, n):
+        if (low[j] <= sl) | (high[j] >= tp):
+            return j
+    return n
+
+
+@njit(cache=True, nogil=True)
+def _simulate_bars_nb(high, low, close, next_signal, action_codes,
+                      size_pct, sl_pct, tp_pct, cash):
+    """
+    Event-driven simulation on raw arrays
+
+    Only two kinds of bars can change state: bars where a condition fires
+    (next_signal[i] is the first such bar >= i, len(close) if none) and the
+    bar where an open position first hits its stop loss / take profit, which
+    is found with a forward scan when the position opens. The loop jumps
+    between these bars instead of visiting every bar.
+
+    Stop loss / take profit of missing levels are NaN. Only trade events are
+    recorded; the equity curve is rebuilt from them afterwards. Returns the
+    trade log (one row per closed trade, including cash after entry and
+    exit), the number of trades and the final state:
+    [cash, in_position, qty, entry_price, stop_loss, take_profit, entry_idx]
+    """
+    n = close.shape[0]
+    n_act = action_codes.shape[0]
+
+    # Every closed trade was opened by a BUY, and each BUY action can open at
+    # most one position per bar, so this bounds the number of trades
+    n_buy = 0
+    for a in range(n_act):
+        if action_codes[a] == ACTION_BUY:
+            n_buy += 1
+    trade_log = np.empty((n * max(1, n_buy) + 1, TRADE_LOG_COLUMNS))
+    n_trades = 0
+
+    in_pos = False
+    qty = 0.0
+    entry_price = 0.0
+    entry_cash = cash
+    sl = np.nan
+    tp = np.nan
+    entry_idx = 0
+    exit_bar = n
+
+    i = next_signal[0]
+    while i < n:
+        # Stop loss / take profit takes precedence over any signal on this bar
+        if in_pos and i == exit_bar:
+            if not np.isnan(sl) and sl != 0.0 and low[i] <= sl:
+                exit_price = sl
+                reason = 0
+            else:
+                exit_price = tp
+                reason = 1
+            cash += qty * exit_price
+            _log_trade(trade_log[n_trades], entry_idx, i, qty, entry_price,
+                       exit_price, sl, tp, reason, entry_cash, cash)
+            n_trades += 1
+            in_pos = False
+            i = next_signal[i + 1]
+            continue
+
+        # A condition fired on this bar - execute the actions in order
+        price = close[i]
+        for a in range(n_act):
+            code = action_codes[a]
+            if code == ACTION_BUY and not in_pos:
+                position_value = cash * size_pct[a]
+                new_qty = position_value / price
+                if new_qty <= 0:
+                    continue
+                in_pos = True
+                qty = new_qty
+                entry_price = price
+                sl = price * (1 - sl_pct[a]) if sl_pct[a] != 0.0 else np.nan
+                tp = price * (1 + tp_pct[a]) if tp_pct[a] != 0.0 else np.nan
+                entry_idx = i
+                cash -= position_value
+                entry_cash = cash
+                exit_bar = _first_exit_bar(high, low, i + 1, sl, tp)
+            elif (code == ACTION_SELL or code == ACTION_EXIT_ALL) and in_pos:
+                cash += qty * price
+                _log_trade(trade_log[n_trades], entry_idx, i, qty, entry_price,
+                           price, sl, tp, code, entry_cash, cash)
+                n_trades += 1
+                in_pos = False
+
+        i_next = next_signal[i + 1]
+        if in_pos and exit_bar < i_next:
+            i_next = exit_bar
+        i = i_next
+
+    state = np.empty(7)
+    state[0] = cash
+    state[1] = 1.0 if in_pos else 0.0
+    state[2] = qty
+    state[3] = entry_price
+    state[4] = sl
+    state[5] = tp
+    state[6] = entry_idx
+    return trade_log, n_trades, state
+
+
+def _next_signal_index(cond_masks: np.ndarray) -> np.ndarray:
+    """
+    For every bar i, the first bar >= i where any condition fires
+    
+    Returns an int64 array of length n + 1 (n = no further signal), so
+    next_signal[i + 1] is always valid inside the kernel.
+    """
+    n = cond_masks.shape[1]
+    fired = cond_masks.any(axis=0)
+    next_signal = np.full(n + 1, n, dtype=np.int64)
+    next_signal[:n] = np.where(fired, np.arange(n), n)
+    return np.minimum.accumulate(next_signal[::-1])[::-1].copy()
+
+
+def _isoformat_index(index: pd.DatetimeIndex) -> List[str]:
+    """
+    ISO 8601 strings for a whole index, identical to Timestamp.isoformat()
+    
+    Wall-clock times are formatted with one np.datetime_as_string call and
+    the UTC offset is appended per element. Falls back to isoformat() per
+    timestamp for sub-second values or offsets that are not whole minutes.
+    """
+    if not isinstance(index, pd.DatetimeIndex) or len(index) == 0:
+        return [ts.isoformat() if hasattr(ts, 'isoformat') else str(ts) for ts in index]
+    
+    local = index.tz_localize(None).values if index.tz is not None else index.values
+    if (local.astype('datetime64[s]') != local).any():
+        return [ts.isoformat() for ts in index]
+    
+    iso = np.datetime_as_string(local, unit='s')
+    if index.tz is None:
+        return iso.tolist()
+    
+    utc = index.tz_convert('UTC').tz_localize(None).values
+    offsets = (local - utc).astype('timedelta64[s]').astype(np.int64)
+    if (offsets % 60 != 0).any():
+        return [ts.isoformat() for ts in index]
+    
+    unique_offsets, inverse = np.unique(offsets, return_inverse=True)
+    suffixes = np.array([
+        f"{'-' if off < 0 else '+'}{abs(off) // 3600:02d}:{abs(off) % 3600 // 60:02d}"
+        for off in unique_offsets.tolist()
+    ])
+    return np.char.add(iso, suffixes[inverse]).tolist()
+
+
+def _build_equity_values(close: np.ndarray, trade_log: np.ndarray, state: np.ndarray,
+                         initial_cash: float) -> np.ndarray:
+    """
+    Rebuild the per-bar equity curve from trade events
+    
+    Equity at bar i is the cash/position state after the last event on a bar
+    before i, valued at that bar's close (cash only while flat).
+    """
+    n = len(close)
+    n_trades = len(trade_log)
+    has_open = bool(state[1])
+    n_events = 2 * n_trades + (1 if has_open else 0)
+    
+    event_bars = np.empty(n_events, dtype=np.int64)
+    event_cash = np.empty(n_events)
+    event_qty = np.zeros(n_events)
+    
+    event_bars[0:2 * n_trades:2] = trade_log[:, T_ENTRY_IDX]
+    event_bars[1:2 * n_trades:2] = trade_log[:, T_EXIT_IDX]
+    event_cash[0:2 * n_trades:2] = trade_log[:, T_ENTRY_CASH]
+    event_cash[1:2 * n_trades:2] = trade_log[:, T_EXIT_CASH]
+    event_qty[0:2 * n_trades:2] = trade_log[:, T_QTY]
+    if has_open:
+        event_bars[-1] = int(state[6])
+        event_cash[-1] = state[0]
+        event_qty[-1] = state[2]
+    
+    # Index of the last event strictly before each bar (-1 = none yet)
+    last_event = np.searchsorted(event_bars, np.arange(n), side='left') - 1
+    started = last_event >= 0
+    safe_idx = np.where(started, last_event, 0)
+    
+    if n_events:
+        cash = np.where(started, event_cash[safe_idx], initial_cash)
+        qty = np.where(started, event_qty[safe_idx], 0.0)
+    else:
+        cash = np.full(n, initial_cash)
+        qty = np.zeros(n)
+    
+    return np.where(qty != 0.0, cash + qty * close, cash)
 
 
 class BacktestEngine:
     """Execute backtest on historical data"""
     
     def __init__(self, strategy: Dict, symbol: str, start_date: str, 
-                 end_date: str, initial_capital: float = 100000):
+                 end_date: str, initial_capital: float = 100000,
+                 data: Optional[pd.DataFrame] = None):
         self.strategy = strategy
         self.symbol = symbol
         self.start_date = start_date
         self.end_date = end_date
         self.initial_capital = initial_capital
         
+        # Preloaded OHLCV data (shared read-only across sweep runs)
+        self.data = data
+        
         # Trading state
         self.cash = initial_capital
         self.position = None  # {qty, avgPrice, stopLoss, takeProfit}
         self.trades = []
-        self.equity_curve = []
+        self._pnl_buf = array('d')  # trade P&Ls, parallel to self.trades
+        self._run_id = uuid.uuid4().hex  # trade IDs are <run_id>-<n>
+        self._trade_counter = 0
+        self._equity_values = np.empty(0)  # equity per bar, aligned with _timestamps_iso
         
         # Indicator cache
         self.indicators = {}
         self.indicator_blocks = []
         self.condition_blocks = []
         self.action_blocks = []
+        self.condition_masks = None
+        
+        # Raw NumPy column views (filled in _calculate_indicators)
+        self._high = None
+        self._low = None
+        self._close = None
+        self._timestamps = None
+        self._timestamps_iso = None
     
     def run(self) -> Dict[str, Any]:
         """
@@ -44,7 +318,7 @@ class BacktestEngine:
         """
         try:
             # 1. Fetch historical data
-            df = self._fetch_historical_data()
+            df = self.data if self.data is not None else self._fetch_historical_data()
             if df is None or len(df) == 0:
                 raise ValueError("No historical data available")
             
@@ -59,14 +333,14 @@ class BacktestEngine:
             print(f"📈 Calculated {len(self.indicators)} indicators")
             
             # 4. Simulate bar-by-bar
-            self._simulate_bars(df)
+            self._simulate_bars()
             print(f"💼 Executed {len(self.trades)} trades")
             
             # 5. Close any open position at end
             if self.position:
                 self._close_position(
-                    df.iloc[-1]['close'], 
-                    df.index[-1], 
+                    self._close[-1], 
+                    self._timestamps_iso[-1], 
                     'end-of-backtest'
                 )
             
@@ -74,7 +348,7 @@ class BacktestEngine:
             metrics = self._calculate_metrics(df)
             
             return {
-                'equityCurve': self.equity_curve,
+                'equityCurve': self._equity_curve_records(),
                 'trades': [self._trade_to_dict(t) for t in self.trades],
                 'metrics': metrics,
                 'status': 'completed'
@@ -87,13 +361,12 @@ class BacktestEngine:
             }
     
     def _fetch_historical_data(self) -> pd.DataFrame:
-        """Fetch OHLCV data from yfinance"""
+        """Fetch OHLCV data from yfinance (cached when the range is fully in the past)"""
         try:
-            ticker = yf.Ticker(self.symbol)
-            df = ticker.history(start=self.start_date, end=self.end_date)
-            
-            # Rename columns to lowercase
-            df.columns = [c.lower() for c in df.columns]
+            if _is_closed_range(self.end_date):
+                df = _load_cached_history(self.symbol, self.start_date, self.end_date).copy()
+            else:
+                df = _download_history(self.symbol, self.start_date, self.end_date)
             
             # Ensure we have required columns
             required = ['open', 'high', 'low', 'close', 'volume']
@@ -118,107 +391,109 @@ class BacktestEngine:
                 self.action_blocks.append(block)
     
     def _calculate_indicators(self, df: pd.DataFrame):
-        """Pre-calculate all indicators"""
-        for block in self.indicator_blocks:
-            block_id = block['id']
-            indicator_type = block['indicator']
-            params = block.get('params', {})
-            
-            result = IndicatorEngine.calculate(df, indicator_type, params)
-            
+        """Pre-calculate all indicators (batched, reusing results cached by earlier runs)"""
+        results = _calculate_indicators_cached(df, [
+            (block['id'], block['indicator'], block.get('params', {}))
+            for block in self.indicator_blocks
+        ])
+        
+        for block_id, result in results.items():
             # Handle indicators that return multiple series (MACD, Bollinger)
             if isinstance(result, dict):
                 for key, series in result.items():
                     self.indicators[f"{block_id}_{key}"] = series
                 # Use main series as default
-                self.indicators[block_id] = result.get('macd') or result.get('middle')
+                self.indicators[block_id] = result['macd'] if 'macd' in result else result.get('middle')
             else:
                 self.indicators[block_id] = result
+        
+        # Cache raw columns so the simulation never touches pandas per bar
+        self._high = df['high'].to_numpy(dtype=np.float64)
+        self._low = df['low'].to_numpy(dtype=np.float64)
+        self._close = df['close'].to_numpy(dtype=np.float64)
+        self._timestamps = df.index
     
-    def _simulate_bars(self, df: pd.DataFrame):
-        """Simulate trading bar by bar"""
-        for idx in range(len(df)):
-            timestamp = df.index[idx]
-            bar = df.iloc[idx]
-            
-            # Update equity curve
-            portfolio_value = self.cash
-            if self.position:
-                portfolio_value += self.position['qty'] * bar['close']
-            self.equity_curve.append({
-                'timestamp': timestamp.isoformat(),
-                'value': portfolio_value
-            })
-            
-            # Check stop loss / take profit on existing position
-            if self.position:
-                if self._check_stop_loss(bar):
-                    self._close_position(self.position['stopLoss'], timestamp, 'stop-loss')
-                    continue
-                
-                if self._check_take_profit(bar):
-                    self._close_position(self.position['takeProfit'], timestamp, 'take-profit')
-                    continue
-            
-            # Evaluate conditions
-            for condition_block in self.condition_blocks:
-                condition_expr = condition_block.get('expr')
-                if not condition_expr:
-                    continue
-                
-                if ConditionEvaluator.evaluate(condition_expr, self.indicators, idx):
-                    # Condition met - execute associated actions
-                    self._execute_actions(bar, timestamp, idx)
-                    break  # Only execute first matching condition per bar
-    
-    def _check_stop_loss(self, bar: pd.Series) -> bool:
-        """Check if stop loss is hit"""
-        if not self.position or not self.position.get('stopLoss'):
-            return False
-        return bar['low'] <= self.position['stopLoss']
-    
-    def _check_take_profit(self, bar: pd.Series) -> bool:
-        """Check if take profit is hit"""
-        if not self.position or not self.position.get('takeProfit'):
-            return False
-        return bar['high'] >= self.position['takeProfit']
-    
-    def _execute_actions(self, bar: pd.Series, timestamp, idx: int):
-        """Execute action blocks (BUY, SELL, EXIT)"""
-        for action_block in self.action_blocks:
-            action_type = action_block.get('action')
-            params = action_block.get('params', {})
-            
-            if action_type == 'BUY' and not self.position:
-                self._open_buy_position(bar['close'], timestamp, params)
-            
-            elif action_type == 'SELL' and self.position:
-                self._close_position(bar['close'], timestamp, 'logic')
-            
-            elif action_type == 'EXIT_ALL' and self.position:
-                self._close_position(bar['close'], timestamp, 'exit-all')
-    
-    def _open_buy_position(self, price: float, timestamp, params: Dict):
-        """Open a buy position"""
-        size_pct = params.get('sizePct', 0.25)
-        stop_loss_pct = params.get('stopLossPct', 0.05)
-        take_profit_pct = params.get('takeProfitPct', 0.10)
+    def _simulate_bars(self):
+        """Simulate trading bar by bar (compiled kernel on raw NumPy columns)"""
+        self._precompute_condition_masks(len(self._close))
+        action_codes, size_pct, sl_pct, tp_pct = self._encode_actions()
         
-        position_value = self.cash * size_pct
-        qty = position_value / price
+        initial_cash = float(self.cash)
+        trade_log, n_trades, state = _simulate_bars_nb(
+            self._high, self._low, self._close,
+            _next_signal_index(self.condition_masks), action_codes,
+            size_pct, sl_pct, tp_pct, initial_cash
+        )
+        trade_log = trade_log[:n_trades]
         
-        if qty <= 0:
-            return
+        self._equity_values = _build_equity_values(self._close, trade_log, state, initial_cash)
         
-        self.position = {
-            'qty': qty,
-            'avgPrice': price,
-            'stopLoss': price * (1 - stop_loss_pct) if stop_loss_pct else None,
-            'takeProfit': price * (1 + take_profit_pct) if take_profit_pct else None,
-            'entryTime': timestamp
-        }
+        # ISO strings for every bar, built in one pass
+        timestamps_iso = self._timestamps_iso = _isoformat_index(self._timestamps)
+        
+        # Build all trade records in one go (no per-trade list / buffer growth)
+        qty = trade_log[:, T_QTY]
+        pnls = qty * trade_log[:, T_EXIT_PRICE] - qty * trade_log[:, T_ENTRY_PRICE]
+        self.trades.extend([
+            self._make_trade(
+                qty=row[T_QTY],
+                entry_price=row[T_ENTRY_PRICE],
+                exit_price=row[T_EXIT_PRICE],
+                stop_loss=self._level_or_none(row[T_STOP_LOSS]),
+                take_profit=self._level_or_none(row[T_TAKE_PROFIT]),
+                entry_time=timestamps_iso[int(row[T_ENTRY_IDX])],
+                exit_time=timestamps_iso[int(row[T_EXIT_IDX])],
+                reason=EXIT_REASONS[int(row[T_REASON])]
+            )
+            for row in trade_log.tolist()
+        ])
+        self._pnl_buf.frombytes(pnls.tobytes())
+        
+        self.cash = state[0]
+        if state[1]:
+            self.position = {
+                'qty': state[2],
+                'avgPrice': state[3],
+                'stopLoss': self._level_or_none(state[4]),
+                'takeProfit': self._level_or_none(state[5]),
+                'entryTime': timestamps_iso[int(state[6])]
+            }
+    
+    def _equity_curve_records(self) -> List[Dict[str, Any]]:
+        """Equity curve in the API format: [{timestamp, value}, ...]"""
+        return [
+            {'timestamp': ts, 'value': value}
+            for ts, value in zip(self._timestamps_iso, self._equity_values.tolist())
+        ]
+    
+    def _precompute_condition_masks(self, n: int):
+        """Evaluate every condition block over the whole series -> bool array (conditions x bars)"""
+        exprs = [b.get('expr') for b in self.condition_blocks if b.get('expr')]
+        self.condition_masks = ConditionEvaluator.evaluate_conditions(
+            exprs, self.indicators, n
+        )
+    
+    def _encode_actions(self):
+        """Encode action blocks as parallel arrays for the simulation kernel"""
+        n_act = len(self.action_blocks)
+        action_codes = np.zeros(n_act, dtype=np.int64)
+        size_pct = np.zeros(n_act)
+        sl_pct = np.zeros(n_act)
+        tp_pct = np.zeros(n_act)
+        
+        for a, action_block in enumerate(self.action_blocks):
+            params = action_block.get('params', {})
+            action_codes[a] = ACTION_CODES.get(action_block.get('action'), ACTION_NONE)
+            size_pct[a] = params.get('sizePct', 0.25)
+            sl_pct[a] = params.get('stopLossPct', 0.05) or 0.0
+            tp_pct[a] = params.get('takeProfitPct', 0.10) or 0.0
         
-        self.cash -= position_value
+        return action_codes, size_pct, sl_pct, tp_pct
+    
+    @staticmethod
+    def _level_or_none(level: float) -> Optional[float]:
+        """Kernel stores missing stop loss / take profit levels as NaN"""
+        return None if np.isnan(level) else float(level)
     
     def _close_position(self, price: float, timestamp, reason: str):
         """Close the current position"""
@@ -226,33 +501,56 @@ class BacktestEngine:
             return
         
         qty = self.position['qty']
-        entry_price = self.position['avgPrice']
-        position_value = qty * price
+        self.cash += qty * price
         
+        self._record_trade(
+            qty=qty,
+            entry_price=self.position['avgPrice'],
+            exit_price=price,
+            stop_loss=self.position.get('stopLoss'),
+            take_profit=self.position.get('takeProfit'),
+            entry_time=self.position['entryTime'],
+            exit_time=timestamp,
+            reason=reason
+        )
+        self.position = None
+    
+    def _record_trade(self, qty: float, entry_price: float, exit_price: float,
+                      stop_loss: Optional[float], take_profit: Optional[float],
+                      entry_time, exit_time, reason: str):
+        """Append a closed trade to the trade list"""
+        trade = self._make_trade(qty, entry_price, exit_price, stop_loss, take_profit,
+                                 entry_time, exit_time, reason)
+        self.trades.append(trade)
+        self._pnl_buf.append(trade['pnl'])
+    
+    def _make_trade(self, qty: float, entry_price: float, exit_price: float,
+                    stop_loss: Optional[float], take_profit: Optional[float],
+                    entry_time, exit_time, reason: str) -> Dict:
+        """Build a closed trade record"""
+        position_value = qty * exit_price
         pnl = position_value - (qty * entry_price)
         pnl_pct = (pnl / (qty * entry_price)) * 100
         
-        self.cash += position_value
+        trade_id = f"{self._run_id}-{self._trade_counter}"
+        self._trade_counter += 1
         
-        # Record trade
         trade = {
-            'id': str(uuid.uuid4()),
+            'id': trade_id,
             'symbol': self.symbol,
             'side': 'BUY',
             'qty': qty,
             'entryPrice': entry_price,
-            'exitPrice': price,
-            'stopLoss': self.position.get('stopLoss'),
-            'takeProfit': self.position.get('takeProfit'),
+            'exitPrice': exit_price,
+            'stopLoss': stop_loss,
+            'takeProfit': take_profit,
             'pnl': pnl,
             'pnlPct': pnl_pct,
             'exitReason': reason,
-            'entryTime': self.position['entryTime'].isoformat() if hasattr(self.position['entryTime'], 'isoformat') else str(self.position['entryTime']),
-            'exitTime': timestamp.isoformat() if hasattr(timestamp, 'isoformat') else str(timestamp)
+            'entryTime': entry_time.isoformat() if hasattr(entry_time, 'isoformat') else str(entry_time),
+            'exitTime': exit_time.isoformat() if hasattr(exit_time, 'isoformat') else str(exit_time)
         }
-        
-        self.trades.append(trade)
-        self.position = None
+        return trade
     
     def _trade_to_dict(self, trade: Dict) -> Dict:
         """Convert trade to serializable dict"""
@@ -260,7 +558,7 @@ class BacktestEngine:
     
     def _calculate_metrics(self, df: pd.DataFrame) -> Dict[str, float]:
         """Calculate backtest performance metrics"""
-        if len(self.equity_curve) == 0:
+        if len(self._equity_values) == 0:
             print("⚠️ Warning: Empty equity curve, returning default metrics")
             return {
                 'totalReturnPct': 0,
@@ -277,8 +575,8 @@ class BacktestEngine:
                 'finalValue': self.initial_capital
             }
         
-        equity_values = [e['value'] for e in self.equity_curve]
-        returns = pd.Series(equity_values).pct_change().dropna()
+        equity_values = self._equity_values
+        returns = equity_values[1:] / equity_values[:-1] - 1
         
         final_value = equity_values[-1]
         total_return = ((final_value - self.initial_capital) / self.initial_capital) * 100
@@ -290,33 +588,36 @@ class BacktestEngine:
         years = days / 252  # Trading days per year
         cagr = (((final_value / self.initial_capital) ** (1 / years)) - 1) * 100 if years > 0 else 0
         
-        # Sharpe Ratio
-        if len(returns) > 0 and returns.std() > 0:
-            sharpe_ratio = (returns.mean() / returns.std()) * np.sqrt(252)
+        # Sharpe Ratio (sample std, as pandas computes it)
+        returns_std = returns.std(ddof=1) if len(returns) > 1 else 0
+        if returns_std > 0:
+            sharpe_ratio = (returns.mean() / returns_std) * np.sqrt(252)
         else:
             sharpe_ratio = 0
         
-        # Max Drawdown
-        equity_series = pd.Series(equity_values)
-        cummax = equity_series.cummax()
-        drawdown = (equity_series - cummax) / cummax * 100
-        max_drawdown = drawdown.min()
+        # Max Drawdown (float32 is plenty for a percentage rounded to 2 places)
+        equity_fp32 = equity_values.astype(np.float32)
+        cummax = np.maximum.accumulate(equity_fp32)
+        drawdown = (equity_fp32 - cummax) / cummax
+        max_drawdown = float(drawdown.min()) * 100
         
         # Trade statistics
-        winning_trades = [t for t in self.trades if t['pnl'] > 0]
-        losing_trades = [t for t in self.trades if t['pnl'] < 0]
+        pnls = np.frombuffer(self._pnl_buf, dtype=np.float64)
+        wins = pnls[pnls > 0]
+        losses = pnls[pnls < 0]
+        n_trades = len(pnls)
         
-        win_rate = (len(winning_trades) / len(self.trades) * 100) if self.trades else 0
+        win_rate = (len(wins) / n_trades * 100) if n_trades else 0
         
         # Calculate gross profit and gross loss
-        gross_profit = sum([t['pnl'] for t in winning_trades]) if winning_trades else 0
-        gross_loss = abs(sum([t['pnl'] for t in losing_trades])) if losing_trades else 0
+        gross_profit = wins.sum() if len(wins) else 0
+        gross_loss = abs(losses.sum()) if len(losses) else 0
         
         # Profit factor = Gross Profit / Gross Loss
         profit_factor = (gross_profit / gross_loss) if gross_loss > 0 else (gross_profit if gross_profit > 0 else 0)
         
-        avg_win = (gross_profit / len(winning_trades)) if winning_trades else 0
-        avg_loss = (gross_loss / len(losing_trades)) if losing_trades else 0
+        avg_win = (gross_profit / len(wins)) if len(wins) else 0
+        avg_loss = (gross_loss / len(losses)) if len(losses) else 0
         
         return {
             'totalReturnPct': round(total_return, 2),
@@ -325,15 +626,153 @@ class BacktestEngine:
             'maxDrawdown': round(max_drawdown, 2),
             'winRate': round(win_rate, 2),
             'profitFactor': round(profit_factor, 2),
-            'totalTrades': len(self.trades),
-            'winningTrades': len(winning_trades),
-            'losingTrades': len(losing_trades),
+            'totalTrades': n_trades,
+            'winningTrades': len(wins),
+            'losingTrades': len(losses),
             'avgWin': round(avg_win, 2),
             'avgLoss': round(avg_loss, 2),
             'finalValue': round(final_value, 2)
         }
 
 
+def _ohlcv_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of the OHLCV frame (index and price/volume columns)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(df.index.dtype).encode())
+    digest.update(np.ascontiguousarray(df.index.values).tobytes())
+    for column in ('open', 'high', 'low', 'close', 'volume'):
+        digest.update(np.ascontiguousarray(df[column].to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+def _calculate_indicators_cached(df: pd.DataFrame, specs: List[tuple]) -> Dict[str, Any]:
+    """
+    IndicatorEngine.calculate_batch with a cross-run LRU cache
+    
+    Sweeps that only vary actions / SL / TP on the same data compute their
+    indicators once; only cache misses go through calculate_batch.
+    
+    Args:
+        df: OHLCV DataFrame
+        specs: List of (block_id, indicator, params) tuples
+    
+    Returns:
+        Dict mapping block_id to the indicator result, in specs order
+    """
+    fingerprint = _ohlcv_fingerprint(df)
+    keys = {}
+    results = {}
+    missing = []
+    
+    with _indicator_cache_lock:
+        for block_id, indicator, params in specs:
+            key = (fingerprint, indicator.upper(), repr(sorted(params.items())))
+            keys[block_id] = key
+            if key in _indicator_cache:
+                _indicator_cache.move_to_end(key)
+                results[block_id] = _indicator_cache[key]
+            else:
+                missing.append((block_id, indicator, params))
+    
+    if missing:
+        computed = IndicatorEngine.calculate_batch(df, missing)
+        with _indicator_cache_lock:
+            for block_id, result in computed.items():
+                _indicator_cache[keys[block_id]] = result
+                _indicator_cache.move_to_end(keys[block_id])
+            while len(_indicator_cache) > INDICATOR_CACHE_SIZE:
+                _indicator_cache.popitem(last=False)
+        results.update(computed)
+    
+    return {block_id: results[block_id] for block_id, _, _ in specs}
+
+
+def _download_history(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """Download OHLCV history from yfinance with lowercase column names"""
+    ticker = yf.Ticker(symbol)
+    df = ticker.history(start=start_date, end=end_date)
+    
+    # Rename columns to lowercase
+    df.columns = [c.lower() for c in df.columns]
+    return df
+
+
+def _is_closed_range(end_date: Optional[str]) -> bool:
+    """History for a range that ended before today no longer changes"""
+    if not end_date:
+        return False
+    try:
+        return pd.Timestamp(end_date).date() < datetime.now().date()
+    except (ValueError, TypeError):
+        return False
+
+
+@lru_cache(maxsize=32)
+def _load_cached_history(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """
+    Load OHLCV history through the Parquet disk cache
+    
+    Wrapped in an in-process LRU so parameter sweeps skip even the disk read.
+    Callers must copy the returned frame before modifying it. An empty
+    download (often a transient Yahoo failure) raises, so it is never cached.
+    """
+    key = hashlib.sha256(f"{symbol}|{start_date}|{end_date}".encode()).hexdigest()
+    path = os.path.join(DATA_CACHE_DIR, f"{key}.parquet")
+    
+    if os.path.exists(path):
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            print(f"Ignoring unreadable cache file for {symbol}: {e}")
+    
+    df = _download_history(symbol, start_date, end_date)
+    if len(df) == 0:
+        raise ValueError(f"No history returned for {symbol}")
+    
+    try:
+        os.makedirs(DATA_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        df.to_parquet(tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+    except Exception as e:
+        # Parquet support (pyarrow) is optional - just skip the disk cache
+        print(f"Could not write data cache for {symbol}: {e}")
+    
+    return df
+
+
+def warm_up_kernels(background: bool = True):
+    """
+    Compile (or load from numba's on-disk cache) the simulation kernels up front
+    
+    The first backtest otherwise pays the JIT compile time. No-op without numba.
+    
+    Args:
+        background: Compile in a daemon thread so startup is not delayed
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    
+    def compile_kernels():
+        try:
+            close = np.linspace(100.0, 110.0, 8)
+            masks = np.zeros((1, len(close)), dtype=np.bool_)
+            masks[0, 1] = True
+            _simulate_bars_nb(
+                close * 1.01, close * 0.99, close, _next_signal_index(masks),
+                np.array([ACTION_BUY], dtype=np.int64),
+                np.array([0.25]), np.array([0.05]), np.array([0.10]), 100000.0
+            )
+            print("⚡ Backtest kernels ready")
+        except Exception as e:
+            print(f"⚠️ Backtest kernel warm-up failed: {e}")
+    
+    if background:
+        threading.Thread(target=compile_kernels, daemon=True).start()
+    else:
+        compile_kernels()
+
+
 def run_backtest(strategy: Dict, symbol: str, start_date: str, 
                  end_date: str, initial_capital: float = 100000) -> Dict:
     """
@@ -351,3 +790,75 @@ def run_backtest(strategy: Dict, symbol: str, start_date: str,
     """
     engine = BacktestEngine(strategy, symbol, start_date, end_date, initial_capital)
     return engine.run()
+
+
+def run_parameter_sweep(strategies: List[Dict], symbol: str, start_date: str,
+                        end_date: str, initial_capital: float = 100000,
+                        max_workers: Optional[int] = None) -> List[Dict]:
+    """
+    Run several strategy variants against the same symbol and date range
+    
+    Historical data is fetched once and shared by all runs. Runs execute on a
+    thread pool; the simulation kernel releases the GIL when numba is
+    available, so variants proceed in parallel.
+    
+    Args:
+        strategies: Strategy JSON variants (e.g. differing SL/TP params)
+        symbol: Stock symbol (e.g., 'RELIANCE.NS')
+        start_date: Start date (YYYY-MM-DD)
+        end_date: End date (YYYY-MM-DD)
+        initial_capital: Starting capital
+        max_workers: Thread pool size (defaults to ThreadPoolExecutor's choice)
+    
+    Returns:
+        Backtest results dicts, in the same order as strategies
+    """
+    loader = BacktestEngine({}, symbol, start_date, end_date, initial_capital)
+    df = loader._fetch_historical_data()
+    if df is None or len(df) == 0:
+        return [{'status': 'failed', 'error': 'No historical data available'}
+                for _ in strategies]
+    
+    def run_one(strategy: Dict) -> Dict:
+        engine = BacktestEngine(strategy, symbol, start_date, end_date,
+                                initial_capital, data=df)
+        return engine.run()
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(run_one, strategies))
+
+
+def _run_backtest_config(config: Dict) -> Dict:
+    """Run one batch config (module-level so it can be pickled to worker processes)"""
+    try:
+        return run_backtest(
+            config['strategy'],
+            config['symbol'],
+            config['start_date'],
+            config['end_date'],
+            config.get('initial_capital', 100000)
+        )
+    except Exception as e:
+        return {'status': 'failed', 'error': str(e)}
+
+
+def run_backtest_batch(configs: List[Dict], max_workers: Optional[int] = None) -> List[Dict]:
+    """
+    Run independent backtests (any mix of strategies and symbols) in parallel processes
+    
+    Each config is a dict with strategy, symbol, start_date, end_date and an
+    optional initial_capital. For many variants on the same symbol and range,
+    run_parameter_sweep is cheaper since it shares the data in one process.
+    
+    Args:
+        configs: Backtest configs
+        max_workers: Process pool size (defaults to the CPU count)
+    
+    Returns:
+        Backtest results dicts, in the same order as configs
+    """
+    if len(configs) <= 1:
+        return [_run_backtest_config(config) for config in configs]
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_run_backtest_config, configs))
@@ -5,22 +5,56 @@ Provides AI-powered actionable insights (Buy/Sell/Hold recommendations)
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree, html as lxml_html
 from deep_translator import GoogleTranslator
+import io
 import json
 import os
+import hashlib
+import sqlite3
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from dateutil import parser as date_parser
+from typing import Dict, List, Any, Optional
+from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from langchain_groq import ChatGroq
 from dotenv import load_dotenv
 import feedparser
 import re
+import threading
+
+try:
+    import orjson  # Faster JSON for LLM responses and the AI cache (optional)
+except ImportError:
+    orjson = None
 
 load_dotenv()
 
 # Initialize Groq LLM for analysis
 groq_llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.3)
 
+# Same model in JSON mode - the API guarantees a bare, valid JSON object
+groq_json_llm = ChatGroq(
+    model="llama-3.3-70b-versatile",
+    temperature=0.3,
+    model_kwargs={"response_format": {"type": "json_object"}}
+)
+
+# Hard cap on in-flight Groq requests across all threads (rate limits)
+AI_MAX_CONCURRENCY = 5
+_groq_semaphore = threading.Semaphore(AI_MAX_CONCURRENCY)
+
+# Cache of AI analyses / summaries / translations keyed by content hash.
+# RSS feeds republish the same items for hours, so most refreshes are hits.
+AI_CACHE_TTL = 24 * 60 * 60  # seconds
+AI_CACHE_MAX_MEMORY_ITEMS = 2048
+AI_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'ai_cache.sqlite3')
+_ai_cache = {}  # key -> (expires_at, value)
+_ai_cache_lock = threading.Lock()
+
 # Trusted Indian Financial News Sources - STRICTLY STOCK MARKET FOCUSED
 OFFICIAL_SOURCES = {
     "moneycontrol_stocks": {
@@ -67,6 +101,55 @@ OFFICIAL_SOURCES = {
     }
 }
 
+# Article id prefix per source name, e.g. "ET Stocks" -> "et_stocks"
+_SOURCE_SLUGS = {info["name"]: info["name"].lower().replace(" ", "_") for info in OFFICIAL_SOURCES.values()}
+
+# Shared HTTP session - pooled keep-alive connections across feeds and retries
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+})
+_http_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32,
+                            max_retries=Retry(total=2, backoff_factor=0.3))
+_SESSION.mount('https://', _http_adapter)
+_SESSION.mount('http://', _http_adapter)
+
+# Precompiled cleanup pattern (used per article)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+# Entities that survive in feed descriptions ('&amp;' last so it is not double-decoded)
+_HTML_ENTITIES = (
+    ('&nbsp;', ' '), ('&quot;', '"'), ('&#39;', "'"),
+    ('&lt;', '<'), ('&gt;', '>'), ('&amp;', '&')
+)
+# Everything except ASCII letters/digits - normalises titles for duplicate detection
+_TITLE_NORM_RE = re.compile(r'[^a-z0-9]+')
+
+# Batched translation: texts are joined with a separator Google Translate leaves intact
+TRANSLATE_MAX_CHARS = 4500
+_TRANSLATE_SEP = "\n<<<SEP>>>\n"
+_TRANSLATE_SEP_RE = re.compile(r'\s*<<<\s*SEP\s*>>>\s*')
+# Sentence boundaries for chunking long texts
+_SENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Fast RSS/Atom parsing with lxml (feedparser is the fallback)
+_ATOM_NS = {'atom': 'http://www.w3.org/2005/Atom'}
+_RSS_PARSER = etree.XMLParser(recover=True, resolve_entities=False, no_network=True, huge_tree=False)
+
+# RFC-822 and ISO-8601 cover nearly every feed timestamp; dateutil handles the rest
+_RSS_DATE_FORMATS = (
+    '%a, %d %b %Y %H:%M:%S %z',
+    '%a, %d %b %Y %H:%M:%S %Z',
+    '%Y-%m-%dT%H:%M:%S%z'
+)
+
+# SEBI listing rows/blocks (same match as find_all(['tr', 'div'], class_=[...]))
+_SEBI_ITEM_XPATH = etree.XPath(
+    "//*[self::tr or self::div][" + " or ".join(
+        f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+        for cls in ('tableblue', 'news-item', 'press-release')
+    ) + "]"
+)
+
 # Supported languages for translation
 LANGUAGES = {
     "hi": "Hindi",
@@ -80,21 +163,209 @@ LANGUAGES = {
 }
 
 
-def scrape_rss_feed(rss_url: str, source_name: str, max_articles: int = 10) -> List[Dict[str, Any]]:
+def _content_key(namespace: str, *parts: str) -> str:
+    """Stable cache key from a namespace and text parts"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\x00')
+    return f"{namespace}:{digest.hexdigest()}"
+
+
+def _json_loads(data):
+    """Decode JSON with orjson when available, else the stdlib"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(value: Any) -> str:
+    """Encode JSON (non-ASCII kept as-is) with orjson when available, else the stdlib"""
+    if orjson is not None:
+        return orjson.dumps(value).decode('utf-8')
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _cache_get(key: str) -> Any:
+    """Look up a cached value (memory first, then the on-disk store)"""
+    now = time.time()
+    with _ai_cache_lock:
+        hit = _ai_cache.get(key)
+        if hit and hit[0] > now:
+            return hit[1]
+    
+    try:
+        with sqlite3.connect(AI_CACHE_PATH, timeout=5) as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM ai_cache WHERE key = ?", (key,)
+            ).fetchone()
+    except sqlite3.Error:
+        return None
+    
+    if row and row[1] > now:
+        value = _json_loads(row[0])
+        with _ai_cache_lock:
+            _ai_cache[key] = (row[1], value)
+        return value
+    return None
+
+
+def _cache_set(key: str, value: Any, ttl: int = AI_CACHE_TTL):
+    """Store a value in memory and in the on-disk store"""
+    expires_at = time.time() + ttl
+    with _ai_cache_lock:
+        _ai_cache[key] = (expires_at, value)
+        while len(_ai_cache) > AI_CACHE_MAX_MEMORY_ITEMS:
+            _ai_cache.pop(next(iter(_ai_cache)))
+    
+    try:
+        os.makedirs(os.path.dirname(AI_CACHE_PATH), exist_ok=True)
+        with sqlite3.connect(AI_CACHE_PATH, timeout=5) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS ai_cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO ai_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, _json_dumps(value), expires_at)
+            )
+    except sqlite3.Error as e:
+        print(f"⚠️ AI cache write failed: {e}")
+
+
+def _parse_rss_fast(xml_bytes: bytes, base_url: str) -> Optional[List[Dict[str, str]]]:
+    """
+    Parse plain RSS 2.0 / Atom feeds with lxml into feedparser-like entry dicts
+    
+    Returns None when the document has no recognisable items, so the caller
+    can fall back to feedparser.
+    """
+    root = etree.fromstring(xml_bytes, parser=_RSS_PARSER)
+    if root is None:
+        return None
+    
+    def text(node, path, namespaces=None):
+        value = node.findtext(path, namespaces=namespaces)
+        return value.strip() if value and value.strip() else None
+    
+    entries = []
+    items = root.findall('.//item')
+    if items:
+        for item in items:
+            entry = {
+                'title': text(item, 'title'),
+                'description': text(item, 'description'),
+                'link': text(item, 'link'),
+                'published': text(item, 'pubDate')
+            }
+            if entry['link']:
+                entry['link'] = urljoin(base_url, entry['link'])
+            entries.append({k: v for k, v in entry.items() if v is not None})
+        return entries
+    
+    atom_entries = root.findall('.//atom:entry', _ATOM_NS)
+    if not atom_entries:
+        return None
+    for item in atom_entries:
+        link = item.find('atom:link', _ATOM_NS)
+        entry = {
+            'title': text(item, 'atom:title', _ATOM_NS),
+            'summary': text(item, 'atom:summary', _ATOM_NS) or text(item, 'atom:content', _ATOM_NS),
+            'link': urljoin(base_url, link.get('href')) if link is not None and link.get('href') else None,
+            'published': text(item, 'atom:published', _ATOM_NS),
+            'updated': text(item, 'atom:updated', _ATOM_NS)
+        }
+        entries.append({k: v for k, v in entry.items() if v is not None})
+    return entries
+
+
+def _title_key(title: str) -> bytes:
+    """
+    Hash of the normalised title, so the same wire story republished by
+    several outlets (different case/punctuation) maps to one key
+    """
+    lowered = title.lower()
+    # Titles with no ASCII letters/digits would all normalise to ''
+    normalized = _TITLE_NORM_RE.sub('', lowered) or lowered.strip()
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest()
+
+
+def _parse_pubdate(published: str, default: datetime) -> datetime:
+    """
+    Parse a feed timestamp into a timezone-naive datetime (wall-clock time kept)
+    
+    Tries the common RSS/Atom formats with strptime before falling back to
+    dateutil; returns default if nothing matches.
+    """
+    for fmt in _RSS_DATE_FORMATS:
+        try:
+            return datetime.strptime(published, fmt).replace(tzinfo=None)
+        except ValueError:
+            continue
+    try:
+        return date_parser.parse(published).replace(tzinfo=None)
+    except (ValueError, OverflowError):
+        return default
+
+
+def scrape_rss_feed(rss_url: str, source_name: str, max_articles: int = 10,
+                    now: Optional[datetime] = None) -> List[Dict[str, Any]]:
     """
     Scrape content from RSS feeds (most reliable for news)
+    
+    Args:
+        now: Reference time for the aggregation run (defaults to the current time)
     """
     try:
-        feed = feedparser.parse(rss_url)
+        # Fetch with a timeout so one slow feed cannot stall the aggregation
+        response = _SESSION.get(rss_url, timeout=(5, 10))
+        response.raise_for_status()
+        
+        # lxml fast path for well-formed RSS/Atom
+        try:
+            entries = _parse_rss_fast(response.content, response.url)
+        except etree.LxmlError:
+            entries = None
+        
+        if entries is None:
+            # Parse the downloaded bytes (BytesIO so feedparser never treats them as
+            # a URL/path); pass the HTTP headers on for charset detection and
+            # relative link resolution, as feedparser's own fetch would
+            feed = feedparser.parse(
+                io.BytesIO(response.content),
+                response_headers={
+                    'content-type': response.headers.get('Content-Type', ''),
+                    'content-location': response.url
+                }
+            )
+            entries = feed.entries
         articles = []
         
-        for entry in feed.entries[:max_articles]:
+        if now is None:
+            now = datetime.now()
+        # (now - pub_date).days <= 7  <=>  pub_date > now - 8 days
+        recent_cutoff = now - timedelta(days=8)
+        
+        for entry in entries[:max_articles]:
             title = entry.get('title', 'No Title')
             
             # Get description/summary
             description = entry.get('description', entry.get('summary', ''))
-            # Clean HTML tags from description
-            description = re.sub(r'<[^>]+>', '', description)
+            # Stripping tags only shortens the text, so anything already under
+            # 50 characters can be rejected without running the regex
+            if not description or len(description) < 50:
+                continue
+            # Clean HTML tags from description (plain-text feeds skip the regex)
+            if '<' in description:
+                description = _HTML_TAG_RE.sub('', description)
+            if '&' in description:
+                for entity, char in _HTML_ENTITIES:
+                    description = description.replace(entity, char)
+            
+            # Only include articles with substantial content (checked before
+            # the link/date work so rejected items cost nothing more)
+            if len(description.strip()) < 50:
+                continue
             
             # Get link
             link = entry.get('link', rss_url)
@@ -102,20 +373,9 @@ def scrape_rss_feed(rss_url: str, source_name: str, max_articles: int = 10) -> L
             # Get published date - FIX: Handle timezone-aware datetimes
             published = entry.get('published', entry.get('updated', ''))
             if published:
-                try:
-                    from dateutil import parser as date_parser
-                    pub_date = date_parser.parse(published)
-                    # Convert to timezone-naive datetime for comparison
-                    if pub_date.tzinfo is not None:
-                        pub_date = pub_date.replace(tzinfo=None)
-                except:
-                    pub_date = datetime.now()
+                pub_date = _parse_pubdate(published.strip(), now)
             else:
-                pub_date = datetime.now()
-            
-            # Only include articles with substantial content
-            if len(description.strip()) < 50:
-                continue
+                pub_date = now
             
             articles.append({
                 "title": title,
@@ -123,7 +383,7 @@ def scrape_rss_feed(rss_url: str, source_name: str, max_articles: int = 10) -> L
                 "url": link,
                 "source": source_name,
                 "published": pub_date.isoformat(),
-                "is_recent": (datetime.now() - pub_date).days <= 7
+                "is_recent": pub_date > recent_cutoff
             })
         
         return articles
@@ -133,35 +393,34 @@ def scrape_rss_feed(rss_url: str, source_name: str, max_articles: int = 10) -> L
         return []
 
 
-def scrape_sebi_content(url: str, max_articles: int = 5) -> List[Dict[str, Any]]:
+def scrape_sebi_content(url: str, max_articles: int = 5,
+                        now: Optional[datetime] = None) -> List[Dict[str, Any]]:
     """
     Scrape content from SEBI website (fallback method)
     """
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=15)
+        response = _SESSION.get(url, timeout=(5, 10))
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        tree = lxml_html.fromstring(response.content)
         articles = []
+        now_iso = (now or datetime.now()).isoformat()
         
         # Try to find press release items or news items
-        news_items = soup.find_all(['tr', 'div'], class_=['tableblue', 'news-item', 'press-release'], limit=max_articles)
+        news_items = _SEBI_ITEM_XPATH(tree)[:max_articles]
         
         if news_items:
             for item in news_items:
                 # Try to find title and link
-                link_tag = item.find('a')
-                if link_tag:
-                    title = link_tag.get_text().strip()
+                link_tag = item.find('.//a')
+                if link_tag is not None:
+                    title = link_tag.text_content().strip()
                     href = link_tag.get('href', '')
                     if href and not href.startswith('http'):
                         href = 'https://www.sebi.gov.in' + href
                     
                     # Get any description text
-                    description = ' '.join([p.get_text().strip() for p in item.find_all('p')])
+                    description = ' '.join([p.text_content().strip() for p in item.findall('.//p')])
                     
                     if title and len(title) > 10:
                         articles.append({
@@ -169,7 +428,7 @@ def scrape_sebi_content(url: str, max_articles: int = 5) -> List[Dict[str, Any]]
                             "content": description[:1500] if description else title,
                             "url": href if href else url,
                             "source": "SEBI",
-                            "published": datetime.now().isoformat(),
+                            "published": now_iso,
                             "is_recent": True
                         })
         
@@ -296,20 +555,8 @@ def get_demo_sebi_content() -> List[Dict[str, Any]]:
     ]
 
 
-def get_ai_analysis_and_action(title: str, content: str, retry_count: int = 0) -> Dict[str, Any]:
-    """
-    Get AI-powered analysis with actionable recommendations (Buy/Sell/Hold)
-    Includes retry logic for rate limiting
-    """
-    import time
-    
-    # If too many retries, return None to skip AI analysis
-    if retry_count >= 3:
-        print(f"    ❌ Max retries reached, skipping AI analysis")
-        return None
-    
-    try:
-        prompt = f"""You are an expert stock market analyst for Indian markets (BSE/NSE). Analyze this news and provide ACTIONABLE trading insights:
+# Prompt templates (str.format; literal braces in the JSON example are doubled)
+_ANALYSIS_PROMPT_TMPL = """You are an expert stock market analyst for Indian markets (BSE/NSE). Analyze this news and provide ACTIONABLE trading insights:
 
 **IMPORTANT**: 
 - If the news mentions specific company/stock names, ALWAYS list them in "affected_stocks" (use proper NSE ticker format like "RELIANCE", "TCS", "INFY")
@@ -318,7 +565,7 @@ def get_ai_analysis_and_action(title: str, content: str, retry_count: int = 0) -
 - Focus on what retail investors should DO
 
 News Title: {title}
-News Content: {content[:1200]}
+News Content: {content}
 
 Return your analysis in this exact JSON format:
 {{
@@ -335,23 +582,51 @@ Return your analysis in this exact JSON format:
 
 **Example for stock news**: If news is about Reliance profits, include "RELIANCE" in affected_stocks.
 If no specific stocks mentioned, focus on sector impact."""
+
+_SUMMARIZE_PROMPT_TMPL = """Create a concise 2-3 sentence summary for retail investors in India. Use simple language.
+
+Content: {text}
+
+Summary:"""
+
+
+def get_cached_analysis(title: str, content: str) -> Optional[Dict[str, Any]]:
+    """
+    Return a cached AI analysis for this article, or None on a miss
+    
+    The result is a copy, so callers may add fields (e.g. translations)
+    without touching the cached entry.
+    """
+    cached = _cache_get(_content_key("analysis", title, content[:1200]))
+    return dict(cached) if cached is not None else None
+
+
+def get_ai_analysis_and_action(title: str, content: str, retry_count: int = 0) -> Dict[str, Any]:
+    """
+    Get AI-powered analysis with actionable recommendations (Buy/Sell/Hold)
+    Includes retry logic for rate limiting
+    """
+    cache_key = _content_key("analysis", title, content[:1200])
+    if retry_count == 0:
+        cached = get_cached_analysis(title, content)
+        if cached is not None:
+            return cached
+    
+    # If too many retries, return None to skip AI analysis
+    if retry_count >= 3:
+        print(f"    ❌ Max retries reached, skipping AI analysis")
+        return None
+    
+    try:
+        prompt = _ANALYSIS_PROMPT_TMPL.format(title=title, content=content[:1200])
         
-        response = groq_llm.invoke(prompt)
-        
-        # Try to parse JSON from response
-        response_text = response.content.strip()
-        
-        # Extract JSON if wrapped in markdown code blocks
-        if '```json' in response_text:
-            response_text = response_text.split('```json')[1].split('```')[0].strip()
-        elif '```' in response_text:
-            response_text = response_text.split('```')[1].split('```')[0].strip()
-        
-        # Clean control characters that might break JSON parsing
-        response_text = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', response_text)
+        with _groq_semaphore:
+            response = groq_json_llm.invoke(prompt)
         
-        analysis = json.loads(response_text)
-        return analysis
+        # JSON mode returns the object directly - no fences to strip
+        analysis = _json_loads(response.content)
+        _cache_set(cache_key, analysis)
+        return dict(analysis)
         
     except Exception as e:
         error_msg = str(e)
@@ -382,15 +657,19 @@ def summarize_content(text: str, max_length: int = 100) -> str:
     """
     Simple summarization (fallback for translation content)
     """
+    cache_key = _content_key("summary", text)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
-        prompt = f"""Create a concise 2-3 sentence summary for retail investors in India. Use simple language.
-
-Content: {text}
-
-Summary:"""
+        prompt = _SUMMARIZE_PROMPT_TMPL.format(text=text)
         
-        response = groq_llm.invoke(prompt)
-        return response.content.strip()
+        with _groq_semaphore:
+            response = groq_llm.invoke(prompt)
+        summary = response.content.strip()
+        _cache_set(cache_key, summary)
+        return summary
         
     except Exception as e:
         print(f"Summarization error: {str(e)}")
@@ -398,6 +677,37 @@ Summary:"""
         return ' '.join(words[:max_length]) + "..."
 
 
+def _split_sentences(text: str, max_chars: int) -> List[str]:
+    """
+    Pack sentences greedily into chunks of at most max_chars
+    
+    A single sentence longer than max_chars is cut at the last space
+    before the limit (or hard-cut if it has none).
+    """
+    chunks = []
+    current = ''
+    for sentence in _SENT_SPLIT_RE.split(text):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            if current:
+                chunks.append(current)
+                current = ''
+            chunks.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if not sentence:
+            continue
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
 def translate_content(text: str, target_language: str) -> str:
     """
     Translate content to target vernacular language
@@ -405,49 +715,174 @@ def translate_content(text: str, target_language: str) -> str:
     try:
         if target_language == "en":
             return text
+        
+        cache_key = _content_key("translation", target_language, text)
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
             
-        translator = GoogleTranslator(source='en', target=target_language)
         # Split long text into chunks (Google Translate has limits)
-        max_chunk_size = 4500
-        if len(text) <= max_chunk_size:
-            return translator.translate(text)
+        if len(text) <= TRANSLATE_MAX_CHARS:
+            translator = GoogleTranslator(source='en', target=target_language)
+            translated = translator.translate(text)
+        else:
+            # Translate in sentence-aligned chunks
+            chunks = _split_sentences(text, TRANSLATE_MAX_CHARS)
+            translated = ' '.join(translate_batch(chunks, target_language))
         
-        # Translate in chunks
-        chunks = [text[i:i+max_chunk_size] for i in range(0, len(text), max_chunk_size)]
-        translated_chunks = [translator.translate(chunk) for chunk in chunks]
-        return ' '.join(translated_chunks)
+        if translated:
+            _cache_set(cache_key, translated)
+        return translated
         
     except Exception as e:
         print(f"Translation error for {target_language}: {str(e)}")
         return text
 
 
+def translate_batch(texts: List[str], target_language: str) -> List[str]:
+    """
+    Translate many texts with as few Google Translate requests as possible
+    
+    Texts are packed greedily into requests of up to TRANSLATE_MAX_CHARS,
+    joined by a separator. If a response does not split back into the
+    expected number of parts, that request's texts are translated one by one.
+    Cached translations are reused and failures return the original text.
+    """
+    if target_language == "en":
+        return list(texts)
+    
+    results = list(texts)
+    pending = []
+    for i, text in enumerate(texts):
+        if not text:
+            continue
+        cached = _cache_get(_content_key("translation", target_language, text))
+        if cached is not None:
+            results[i] = cached
+        elif len(text) > TRANSLATE_MAX_CHARS:
+            results[i] = translate_content(text, target_language)
+        else:
+            pending.append(i)
+    
+    # Greedy packing into requests under the size limit
+    batches = []
+    batch, size = [], 0
+    for i in pending:
+        extra = len(texts[i]) + (len(_TRANSLATE_SEP) if batch else 0)
+        if batch and size + extra > TRANSLATE_MAX_CHARS:
+            batches.append(batch)
+            batch, size, extra = [], 0, len(texts[i])
+        batch.append(i)
+        size += extra
+    if batch:
+        batches.append(batch)
+    
+    batch_texts = [[texts[i] for i in batch] for batch in batches]
+    if len(batches) > 1:
+        # Requests are independent - send them together
+        with ThreadPoolExecutor(max_workers=min(8, len(batches))) as executor:
+            translated = list(executor.map(
+                lambda chunk: _translate_packed(chunk, target_language), batch_texts))
+    else:
+        translated = [_translate_packed(chunk, target_language) for chunk in batch_texts]
+    
+    for batch, parts in zip(batches, translated):
+        for i, text in zip(batch, parts):
+            results[i] = text
+    
+    return results
+
+
+def _translate_packed(texts: List[str], target_language: str) -> List[str]:
+    """
+    Translate texts that fit in one request, joined by the separator
+    
+    Falls back to one (concurrent) request per text if the response does
+    not split back into len(texts) parts.
+    """
+    if len(texts) > 1:
+        try:
+            translator = GoogleTranslator(source='en', target=target_language)
+            joined = _TRANSLATE_SEP.join(texts)
+            parts = _TRANSLATE_SEP_RE.split(translator.translate(joined).strip())
+            if len(parts) == len(texts):
+                for text, part in zip(texts, parts):
+                    if part:
+                        _cache_set(_content_key("translation", target_language, text), part)
+                return parts
+        except Exception as e:
+            print(f"Batch translation error for {target_language}: {str(e)}")
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(texts))) as executor:
+            return list(executor.map(lambda text: translate_content(text, target_language), texts))
+    
+    return [translate_content(text, target_language) for text in texts]
+
+
+def _translate_fields(fields: List[tuple], language: str):
+    """
+    Translate (article, key, text) fields in one batch and store each
+    result under article[key]
+    """
+    translated = translate_batch([text for _, _, text in fields], language)
+    for (article, key, _), text in zip(fields, translated):
+        article[key] = text
+
+
+def _fetch_source(source_info: Dict[str, Any], now: datetime) -> List[Dict[str, Any]]:
+    """
+    Fetch articles from one configured source (runs on the fetch thread pool)
+    """
+    print(f"  → Scraping {source_info['name']}...")
+    
+    if "rss_url" in source_info:
+        # RSS feed scraping (most reliable)
+        return scrape_rss_feed(
+            source_info["rss_url"], 
+            source_info["name"], 
+            max_articles=5,
+            now=now
+        )
+    elif "url" in source_info:
+        # Direct website scraping (fallback)
+        return scrape_sebi_content(source_info["url"], max_articles=3, now=now)
+    return []
+
+
 def get_aggregated_content(language: str = "en", include_summary: bool = True, include_ai_analysis: bool = True) -> Dict[str, Any]:
     """
     Main function to get latest financial news with AI-powered actionable insights
     """
     all_content = []
     
+    # One reference time for the whole run
+    now = datetime.now()
+    now_iso = now.isoformat()
+    
     # Fetch live news from multiple sources
     print("🔄 Fetching latest Indian financial news...")
     
+    # Feeds are IO-bound - fetch them all at once
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {
+            executor.submit(_fetch_source, source_info, now): source_key
+            for source_key, source_info in OFFICIAL_SOURCES.items()
+        }
+        articles_by_source = {}
+        for future in as_completed(futures):
+            articles_by_source[futures[future]] = future.result()
+    
+    # Merge in configured source order, dropping stories already seen from an
+    # earlier source so duplicates never reach the (expensive) AI analysis
+    seen_titles = set()
+    duplicates = 0
     for source_key, source_info in OFFICIAL_SOURCES.items():
-        print(f"  → Scraping {source_info['name']}...")
-        
-        if "rss_url" in source_info:
-            # RSS feed scraping (most reliable)
-            articles = scrape_rss_feed(
-                source_info["rss_url"], 
-                source_info["name"], 
-                max_articles=5
-            )
-        elif "url" in source_info:
-            # Direct website scraping (fallback)
-            articles = scrape_sebi_content(source_info["url"], max_articles=3)
-        else:
-            articles = []
-        
-        for article in articles:
+        for article in articles_by_source.get(source_key, []):
+            title_key = _title_key(article["title"])
+            if title_key in seen_titles:
+                duplicates += 1
+                continue
+            seen_titles.add(title_key)
             article["category"] = source_info["category"]
             article["verified"] = True
             article["news_type"] = source_info.get("news_type", "general")
@@ -463,7 +898,7 @@ def get_aggregated_content(language: str = "en", include_summary: bool = True, i
             "content": []
         }
     else:
-        print(f"✅ Successfully fetched {len(all_content)} news articles")
+        print(f"✅ Successfully fetched {len(all_content)} news articles ({duplicates} duplicates dropped)")
     
     # Sort by date (most recent first)
     all_content.sort(key=lambda x: x.get('published', ''), reverse=True)
@@ -473,59 +908,80 @@ def get_aggregated_content(language: str = "en", include_summary: bool = True, i
     max_articles = min(10, len(all_content))  # Reduced to 10 to avoid rate limits
     print(f"\n📊 Phase 1: AI Analysis for {max_articles} articles...")
     
-    import time
-    for idx, article in enumerate(all_content[:max_articles]):
-        print(f"  🤖 Analyzing article {idx+1}/{max_articles}...")
+    articles_to_process = all_content[:max_articles]
+    run_stamp = int(time.time())
+    for idx, article in enumerate(articles_to_process):
+        # The scrapers and the merge loop already set every output field
+        processed_article = article.copy()
+        processed_article["id"] = f"{_SOURCE_SLUGS[article['source']]}_{idx}_{run_stamp}"
+        processed_article["timestamp"] = now_iso
         
-        processed_article = {
-            "id": f"{article['source'].lower().replace(' ', '_')}_{idx}_{int(time.time())}",
-            "title": article["title"],
-            "content": article["content"],
-            "source": article["source"],
-            "category": article.get("category", "General"),
-            "url": article["url"],
-            "verified": article.get("verified", True),
-            "published": article.get("published", datetime.now().isoformat()),
-            "is_recent": article.get("is_recent", True),
-            "news_type": article.get("news_type", "general"),  # Add news_type field
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        # Add AI-powered analysis and action for ALL articles
-        if include_ai_analysis:
-            try:
-                ai_analysis = get_ai_analysis_and_action(article["title"], article["content"])
-                processed_article["ai_analysis"] = ai_analysis
-                processed_article["summary"] = ai_analysis["summary"]
-                processed_article["action"] = ai_analysis["action"]
-                processed_article["sentiment"] = ai_analysis["sentiment"]
-                
-                # Small delay between API calls to avoid rate limiting
-                time.sleep(0.5)
-            except Exception as e:
-                print(f"    ⚠️  AI analysis failed: {str(e)}")
-                processed_article["summary"] = article["content"][:200] + "..."
-                processed_article["action"] = "WATCH"
-                processed_article["sentiment"] = "Neutral"
-        else:
+        if not include_ai_analysis:
             processed_article["summary"] = article["content"][:200] + "..."
         
         processed_content.append(processed_article)
     
-    # Phase 2: Translation (if needed) - Done separately to avoid blocking
+    # Phase 2: Translation (if needed). Titles and content do not depend on the
+    # AI output, so translate them in the background while Phase 1 runs
+    translate_pool = None
+    base_translation = None
     if language != "en":
-        print(f"\n🌐 Phase 2: Translating to {LANGUAGES.get(language, language)}...")
-        for idx, processed_article in enumerate(processed_content):
-            print(f"  🔄 Translating article {idx+1}/{len(processed_content)}...")
-            try:
-                # Translate in smaller chunks for faster processing
-                processed_article["title_translated"] = translate_content(processed_article["title"], language)
-                processed_article["content_translated"] = translate_content(processed_article["content"][:1000], language)
-                if "summary" in processed_article and processed_article["summary"]:
-                    processed_article["summary_translated"] = translate_content(processed_article["summary"], language)
+        print(f"\n🌐 Phase 2: Translating to {LANGUAGES.get(language, language)} (overlapping AI analysis)...")
+        base_fields = []
+        for processed_article in processed_content:
+            base_fields.append((processed_article, "title_translated", processed_article["title"]))
+            # Translate in smaller chunks for faster processing
+            base_fields.append((processed_article, "content_translated", processed_article["content"][:1000]))
+        translate_pool = ThreadPoolExecutor(max_workers=1)
+        base_translation = translate_pool.submit(_translate_fields, base_fields, language)
+    
+    try:
+        # Add AI-powered analysis and action for ALL articles - calls are independent,
+        # so run them concurrently (the Groq semaphore bounds in-flight requests)
+        if include_ai_analysis:
+            # Cache hits are resolved inline; only misses go to the worker pool
+            analyses = [get_cached_analysis(article["title"], article["content"])
+                        for article in articles_to_process]
+            print(f"  💾 {sum(a is not None for a in analyses)}/{max_articles} analyses served from cache")
+            with ThreadPoolExecutor(max_workers=AI_MAX_CONCURRENCY) as executor:
+                futures = {}
+                for idx, article in enumerate(articles_to_process):
+                    if analyses[idx] is None:
+                        print(f"  🤖 Analyzing article {idx+1}/{max_articles}...")
+                        futures[idx] = executor.submit(
+                            get_ai_analysis_and_action, article["title"], article["content"]
+                        )
+            
+                for idx, (processed_article, article) in enumerate(zip(processed_content, articles_to_process)):
+                    try:
+                        ai_analysis = analyses[idx] if idx not in futures else futures[idx].result()
+                        processed_article["ai_analysis"] = ai_analysis
+                        processed_article["summary"] = ai_analysis["summary"]
+                        processed_article["action"] = ai_analysis["action"]
+                        processed_article["sentiment"] = ai_analysis["sentiment"]
+                    except Exception as e:
+                        print(f"    ⚠️  AI analysis failed: {str(e)}")
+                        processed_article["summary"] = article["content"][:200] + "..."
+                        processed_article["action"] = "WATCH"
+                        processed_article["sentiment"] = "Neutral"
+    
+        if language != "en":
+            # Summaries only exist once Phase 1 is done
+            summary_fields = [
+                (processed_article, "summary_translated", processed_article["summary"])
+                for processed_article in processed_content
+                if "summary" in processed_article and processed_article["summary"]
+            ]
+            print(f"  🔄 Translating {len(summary_fields)} summaries from {len(processed_content)} articles...")
+            _translate_fields(summary_fields, language)
+            base_translation.result()
+            for processed_article in processed_content:
                 processed_article["language"] = LANGUAGES.get(language, language)
-            except Exception as e:
-                print(f"    ⚠️  Translation failed: {str(e)}")
+    
+    finally:
+        # Also on failure, so the background translation thread is not leaked
+        if translate_pool is not None:
+            translate_pool.shutdown(wait=False, cancel_futures=True)
     
     return {
         "success": True,
@@ -534,7 +990,7 @@ def get_aggregated_content(language: str = "en", include_summary: bool = True, i
         "language_name": LANGUAGES.get(language, "English"),
         "content": processed_content,
         "sources": [s["name"] for s in OFFICIAL_SOURCES.values()],
-        "last_updated": datetime.now().isoformat(),
+        "last_updated": now_iso,
         "has_ai_analysis": include_ai_analysis
     }
 
@@ -3,21 +3,299 @@ Forward Testing Runner - Live paper trading with real-time market data
 Evaluates strategies in real-time and executes trades in virtual portfolio
 """
 import yfinance as yf
+import requests
 import pandas as pd
 import numpy as np
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
+import heapq
+import itertools
+import random
 import time
 import threading
 import uuid
 
-from indicators import IndicatorEngine, ConditionEvaluator
+from indicators import StreamingIndicator, ConditionEvaluator
 from models import Portfolio, Trade, DeployedStrategy, portfolios_db, trades_db, deployments_db
 
+# Column order of the bar tuples kept in each rolling window (after the timestamp)
+BAR_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+# Symbols per yf.download request
+YF_BATCH_SIZE = 20
+
+# Yahoo endpoint returning recent prices for many symbols in one request
+SPARK_URL = 'https://query1.finance.yahoo.com/v8/finance/spark'
+SPARK_BATCH_SIZE = 20
+
+# How long fetched bars are reused by other deployments (below the shortest poll interval)
+BUS_TTL_SECONDS = 30
+
+# Retry delay after a failed tick: starts at 1s, doubles per failure, capped
+ERROR_BACKOFF_MAX = 60
+
+
+def fetch_latest_bars(symbols: List[str], timeframe: str) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch recent bars for many symbols with batched yf.download calls
+    
+    Args:
+        symbols: Ticker symbols
+        timeframe: Bar interval ('1m', '5m', '15m', '1h', '1d')
+    
+    Returns:
+        Dict mapping symbol to a DataFrame with lowercase OHLCV columns
+        (symbols with no data are left out)
+    """
+    # Fetch recent data based on timeframe
+    period = '5d' if timeframe == '1d' else '1d'
+    frames = {}
+    
+    for start in range(0, len(symbols), YF_BATCH_SIZE):
+        batch = symbols[start:start + YF_BATCH_SIZE]
+        try:
+            # auto_adjust/actions match the Ticker.history() defaults used before
+            data = yf.download(tickers=batch, period=period, interval=timeframe,
+                               group_by='ticker', auto_adjust=True, actions=False,
+                               threads=True, progress=False)
+        except Exception as e:
+            print(f"Error fetching data for {', '.join(batch)}: {e}")
+            continue
+        
+        if data is None or len(data) == 0:
+            continue
+        
+        for symbol in batch:
+            if isinstance(data.columns, pd.MultiIndex):
+                if symbol not in data.columns.get_level_values(0):
+                    continue
+                df = data[symbol]
+            elif len(batch) == 1:
+                df = data
+            else:
+                continue
+            
+            # The batch shares one index - drop rows this symbol has no data for
+            df = df.dropna(how='all')
+            if len(df) == 0:
+                continue
+            
+            # Rename columns to lowercase
+            df.columns = [c.lower() for c in df.columns]
+            frames[symbol] = df
+    
+    return frames
+
+
+class MarketDataBus:
+    """
+    Process-wide cache of fetched bars shared by all deployments
+    
+    Runners subscribe to their (symbol, timeframe) pairs. When a runner asks
+    for bars and any are stale, every stale subscribed symbol of that
+    timeframe is fetched in the same batched download, so the other
+    deployments find their bars already cached when they tick.
+    """
+    
+    def __init__(self, ttl: float = BUS_TTL_SECONDS):
+        self.ttl = ttl
+        self._subscribers = {}  # (symbol, timeframe) -> set of subscriber ids
+        self._cache = {}  # (symbol, timeframe) -> (fetched_at, DataFrame or None)
+        self._lock = threading.Lock()
+        self._session = requests.Session()  # Keep-alive for the per-tick spot price request
+        self._session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        })
+    
+    def subscribe(self, symbols: List[str], timeframe: str, subscriber_id: str):
+        """Register interest in the symbols' bars"""
+        with self._lock:
+            for symbol in symbols:
+                self._subscribers.setdefault((symbol, timeframe), set()).add(subscriber_id)
+    
+    def unsubscribe(self, symbols: List[str], timeframe: str, subscriber_id: str):
+        """Drop interest in the symbols' bars (and their cache once nobody is left)"""
+        with self._lock:
+            for symbol in symbols:
+                key = (symbol, timeframe)
+                subscribers = self._subscribers.get(key)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscriber_id)
+                if not subscribers:
+                    del self._subscribers[key]
+                    self._cache.pop(key, None)
+    
+    def get_bars(self, symbols: List[str], timeframe: str) -> Dict[str, pd.DataFrame]:
+        """
+        Latest bars for the symbols, fetching only what is not fresh in the cache
+        
+        Returns:
+            Dict mapping symbol to a DataFrame (as fetch_latest_bars)
+        """
+        now = time.monotonic()
+        with self._lock:
+            stale = []
+            if any(self._is_stale((symbol, timeframe), now) for symbol in symbols):
+                # Refresh everything stale for this timeframe in one go
+                stale = [symbol for symbol, tf in self._subscribers
+                         if tf == timeframe and self._is_stale((symbol, tf), now)]
+                stale.extend(symbol for symbol in symbols
+                             if symbol not in stale and self._is_stale((symbol, timeframe), now))
+        
+        # Fetch without the lock so subscribe/unsubscribe aren't held up by Yahoo
+        frames = fetch_latest_bars(stale, timeframe) if stale else {}
+        
+        with self._lock:
+            for symbol in stale:
+                key = (symbol, timeframe)
+                if key not in self._subscribers and symbol not in symbols:
+                    continue  # unsubscribed while fetching
+                # Misses are cached too, so a symbol with no data isn't refetched every tick
+                self._cache[key] = (now, frames.get(symbol))
+            
+            result = {}
+            for symbol in symbols:
+                entry = self._cache.get((symbol, timeframe))
+                if entry is not None and entry[1] is not None:
+                    result[symbol] = entry[1]
+            return result
+    
+    def spot_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Latest traded prices from Yahoo's spark endpoint (one request per 20 symbols)
+        
+        Returns:
+            Dict mapping symbol to price (symbols that failed are left out)
+        """
+        prices = {}
+        for start in range(0, len(symbols), SPARK_BATCH_SIZE):
+            batch = symbols[start:start + SPARK_BATCH_SIZE]
+            try:
+                response = self._session.get(
+                    SPARK_URL,
+                    params={'symbols': ','.join(batch), 'range': '1d', 'interval': '1m'},
+                    timeout=5
+                )
+                response.raise_for_status()
+                prices.update(_parse_spark(response.json()))
+            except Exception as e:
+                print(f"Error fetching spot prices for {', '.join(batch)}: {e}")
+        return prices
+    
+    def _is_stale(self, key: tuple, now: float) -> bool:
+        entry = self._cache.get(key)
+        return entry is None or now - entry[0] >= self.ttl
+
+
+# Shared by all deployments
+market_data_bus = MarketDataBus()
+
+
+def _bar_changed(old: tuple, new: tuple) -> bool:
+    """Whether any field differs, treating NaN as equal to NaN (e.g. missing volume)"""
+    return any(a != b and not (a != a and b != b) for a, b in zip(old, new))
+
+
+def _last_close(closes) -> Optional[float]:
+    """Newest non-null value of a spark close series"""
+    for value in reversed(closes or []):
+        if value is not None:
+            return float(value)
+    return None
+
+
+def _parse_spark(payload: Dict) -> Dict[str, float]:
+    """Symbol -> latest price from a spark response (keyed or legacy 'spark.result' layout)"""
+    prices = {}
+    if 'spark' in payload:
+        for item in (payload['spark'] or {}).get('result') or []:
+            for response in item.get('response') or []:
+                price = (response.get('meta') or {}).get('regularMarketPrice')
+                if price is None:
+                    quote = ((response.get('indicators') or {}).get('quote') or [{}])[0]
+                    price = _last_close(quote.get('close'))
+                if price is not None:
+                    prices[item.get('symbol')] = float(price)
+    else:
+        for symbol, entry in payload.items():
+            if isinstance(entry, dict):
+                price = _last_close(entry.get('close'))
+                if price is not None:
+                    prices[entry.get('symbol', symbol)] = price
+    return prices
+
+
+class ForwardScheduler:
+    """
+    Run every deployed ForwardRunner from one background thread
+    
+    Runners sit in a heap keyed by their next run time; the thread ticks the
+    soonest one and re-queues it after its polling interval, so the thread
+    count stays constant however many strategies are deployed.
+    """
+    
+    def __init__(self):
+        self._heap = []  # (next_run, seq, runner) - seq keeps ties FIFO
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+    
+    def add(self, runner: 'ForwardRunner', delay: float = 0.0):
+        """Queue a runner to tick after delay seconds"""
+        with self._lock:
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), runner))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='forward-scheduler', daemon=True)
+                self._thread.start()
+            self._wakeup.set()
+    
+    def remove(self, runner: 'ForwardRunner'):
+        """Drop a runner from the queue (a tick already in progress finishes)"""
+        with self._lock:
+            self._heap = [entry for entry in self._heap if entry[2] is not runner]
+            heapq.heapify(self._heap)
+    
+    def _run(self):
+        """Scheduler thread - sleep until the soonest runner is due, then tick it"""
+        while True:
+            with self._lock:
+                timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                if timeout is None or timeout > 0:
+                    # add() sets the event under the same lock, so no wakeup is lost
+                    self._wakeup.clear()
+                else:
+                    _, _, runner = heapq.heappop(self._heap)
+            
+            if timeout is None or timeout > 0:
+                self._wakeup.wait(timeout)
+                continue
+            
+            if not runner.is_running:
+                continue
+            delay = runner.tick()
+            if runner.is_running:
+                self.add(runner, delay)
+
+
+# Shared by all deployments
+forward_scheduler = ForwardScheduler()
+
 
 class ForwardRunner:
     """Execute strategy in real-time on live market data"""
     
+    # Fixed attribute layout - read on every tick, and one runner per deployment
+    __slots__ = (
+        'strategy', 'portfolio_id', 'deployment_id', 'symbols', 'timeframe',
+        'is_running', '_backoff', 'window_size', 'data_bars',
+        'indicators', '_streams', '_buf', '_buf_len', '_col_idx',
+        'indicator_blocks', 'condition_blocks', 'action_blocks', 'condition_exprs',
+        '_condition_masks', '_bars_to_check'
+    )
+    
     def __init__(self, strategy: Dict, portfolio_id: str, deployment_id: str):
         self.strategy = strategy
         self.portfolio_id = portfolio_id
@@ -27,66 +305,92 @@ class ForwardRunner:
         
         # Trading state
         self.is_running = False
-        self.thread = None
+        self._backoff = 1.0  # Next error retry delay (seconds), before jitter
         
         # Historical data for indicator calculation (rolling window)
-        self.data_windows = {}  # symbol -> DataFrame
         self.window_size = 100  # Keep last 100 bars
-        
-        # Indicator cache
-        self.indicators = {}
+        self.data_bars = {}  # symbol -> deque of (timestamp, open, high, low, close, volume)
+        
+        # Indicator state: streaming calculators and their outputs per bar
+        self.indicators = {}  # symbol -> {key: column view of _buf aligned with data_bars}
+        self._streams = {}  # symbol -> {block_id: StreamingIndicator}
+        self._buf = {}  # symbol -> float64 array (window_size x indicator columns)
+        self._buf_len = {}  # symbol -> rows of _buf in use
+        self._col_idx = {}  # indicator key -> column in _buf
         self.indicator_blocks = []
         self.condition_blocks = []
         self.action_blocks = []
+        self.condition_exprs = []  # Non-empty condition expressions, in block order
+        self._condition_masks = {}  # symbol -> bool ndarray (conditions x bars)
+        self._bars_to_check = {}  # symbol -> newest bars to act on this tick
         
         # Parse strategy
         self._parse_strategy_blocks()
     
     def start(self):
-        """Start forward testing in background thread"""
+        """Start forward testing on the shared scheduler thread"""
         if self.is_running:
             return
         
         self.is_running = True
-        self.thread = threading.Thread(target=self._run_loop, daemon=True)
-        self.thread.start()
+        market_data_bus.subscribe(self.symbols, self.timeframe, self.deployment_id)
+        forward_scheduler.add(self)
         print(f"Forward runner started for deployment {self.deployment_id}")
     
     def stop(self):
         """Stop forward testing"""
         self.is_running = False
-        if self.thread:
-            self.thread.join(timeout=5)
+        forward_scheduler.remove(self)
+        market_data_bus.unsubscribe(self.symbols, self.timeframe, self.deployment_id)
         print(f"Forward runner stopped for deployment {self.deployment_id}")
     
-    def _run_loop(self):
-        """Main execution loop - polls market data and evaluates strategy"""
-        while self.is_running:
-            try:
-                for symbol in self.symbols:
-                    # 1. Fetch latest market data
-                    self._update_market_data(symbol)
-                    
-                    # 2. Calculate indicators
-                    self._calculate_indicators(symbol)
-                    
-                    # 3. Check stop loss / take profit on existing positions
-                    self._check_exit_conditions(symbol)
-                    
-                    # 4. Evaluate strategy conditions
-                    self._evaluate_strategy(symbol)
+    def tick(self) -> float:
+        """
+        Poll market data once and evaluate the strategy
+        
+        Returns:
+            Seconds until the next tick
+        """
+        try:
+            # 1. Latest market data (shared with other deployments on the same symbols)
+            frames = market_data_bus.get_bars(self.symbols, self.timeframe)
+            
+            # Live prices for open positions in one request, so SL/TP checks
+            # don't wait for the bar close
+            portfolio = portfolios_db.get(self.portfolio_id)
+            positioned = [s for s in self.symbols if portfolio and s in portfolio.holdings]
+            spot = market_data_bus.spot_prices(positioned) if positioned else {}
+            
+            for symbol in self.symbols:
+                new_bars = []
+                if symbol in frames:
+                    new_bars = self._update_market_data(symbol, frames[symbol])
+                
+                # 2. Update indicators with the new/revised bars
+                if new_bars:
+                    self._calculate_indicators(symbol, new_bars)
                 
-                # Update deployment timestamp
-                if self.deployment_id in deployments_db:
-                    deployments_db[self.deployment_id].last_update = datetime.utcnow()
+                # 3. Check stop loss / take profit on existing positions
+                self._check_exit_conditions(symbol, spot.get(symbol))
                 
-                # Sleep based on timeframe
-                sleep_seconds = self._get_sleep_interval()
-                time.sleep(sleep_seconds)
+                # 4. Evaluate strategy conditions (unchanged bars were already evaluated)
+                if new_bars:
+                    self._evaluate_strategy(symbol)
             
-            except Exception as e:
-                print(f"Error in forward runner loop: {e}")
-                time.sleep(60)  # Wait 1 minute on error
+            # Update deployment timestamp
+            if self.deployment_id in deployments_db:
+                deployments_db[self.deployment_id].last_update = datetime.utcnow()
+            
+            # Next poll based on timeframe
+            self._backoff = 1.0
+            return self._get_sleep_interval()
+        
+        except Exception as e:
+            # Exponential backoff; the jitter keeps deployments from retrying in lockstep
+            delay = min(ERROR_BACKOFF_MAX, self._backoff) * (0.5 + random.random())
+            self._backoff = min(ERROR_BACKOFF_MAX, self._backoff * 2)
+            print(f"Error in forward runner loop: {e} (retrying in {delay:.1f}s)")
+            return delay
     
     def _get_sleep_interval(self) -> int:
         """Get polling interval based on timeframe"""
@@ -99,39 +403,41 @@ class ForwardRunner:
         }
         return intervals.get(self.timeframe, 300)
     
-    def _update_market_data(self, symbol: str):
-        """Fetch latest market data and update rolling window"""
+    def _update_market_data(self, symbol: str, df: pd.DataFrame) -> List[tuple]:
+        """
+        Merge freshly fetched bars into the symbol's rolling window
+        
+        Returns:
+            (bar, replace) pairs for the indicators: appended bars, and
+            revisions of the newest bar (replace=True). Empty when nothing
+            changed since the last poll.
+        """
+        new_bars = []
         try:
-            ticker = yf.Ticker(symbol)
-            
-            # Fetch recent data based on timeframe
-            period = '5d' if self.timeframe == '1d' else '1d'
-            interval = self.timeframe
-            
-            df = ticker.history(period=period, interval=interval)
+            bars = self.data_bars.get(symbol)
+            if bars is None:
+                bars = self.data_bars[symbol] = deque(maxlen=self.window_size)
             
-            if df is None or len(df) == 0:
-                return
-            
-            # Rename columns to lowercase
-            df.columns = [c.lower() for c in df.columns]
-            
-            # Update rolling window
-            if symbol not in self.data_windows:
-                self.data_windows[symbol] = df
-            else:
-                # Append new data and keep last window_size bars
-                self.data_windows[symbol] = pd.concat([
-                    self.data_windows[symbol], df
-                ]).tail(self.window_size)
-            
-            # Remove duplicates
-            self.data_windows[symbol] = self.data_windows[symbol][
-                ~self.data_windows[symbol].index.duplicated(keep='last')
-            ]
+            # Append bars newer than the window; bars already held (e.g. the
+            # still-forming latest bar) are refreshed with the fetched values
+            for row in df[list(BAR_FIELDS)].itertuples(name=None):
+                ts = row[0]
+                if bars and ts <= bars[-1][0]:
+                    if ts == bars[-1][0] and _bar_changed(bars[-1], row):
+                        new_bars.append((row, True))
+                    for i in range(len(bars) - 1, -1, -1):
+                        if bars[i][0] == ts:
+                            bars[i] = row
+                            break
+                        if bars[i][0] < ts:
+                            break
+                else:
+                    bars.append(row)
+                    new_bars.append((row, False))
         
         except Exception as e:
-            print(f"Error fetching data for {symbol}: {e}")
+            print(f"Error updating data for {symbol}: {e}")
+        return new_bars
     
     def _parse_strategy_blocks(self):
         """Separate blocks by type"""
@@ -143,34 +449,114 @@ class ForwardRunner:
                 self.condition_blocks.append(block)
             elif block_type == 'action':
                 self.action_blocks.append(block)
+        
+        # Evaluated together by one compiled function (built on first use)
+        self.condition_exprs = [b.get('expr') for b in self.condition_blocks if b.get('expr')]
+        
+        # One buffer column per indicator output: sub-keys first, then the
+        # block's main value (macd line / middle band)
+        for block in self.indicator_blocks:
+            block_id = block['id']
+            for key in StreamingIndicator.output_keys(block.get('indicator', '')) or ():
+                self._col_idx[f"{block_id}_{key}"] = len(self._col_idx)
+            self._col_idx[block_id] = len(self._col_idx)
     
-    def _calculate_indicators(self, symbol: str):
-        """Calculate all indicators for the symbol"""
-        if symbol not in self.data_windows:
+    def _calculate_indicators(self, symbol: str, new_bars: List[tuple]):
+        """
+        Update all indicators for the symbol with the new/revised bars
+        
+        Each block has a StreamingIndicator that consumes one bar in O(1), so
+        a tick costs the same regardless of the window size.
+        """
+        if not new_bars:
             return
         
-        df = self.data_windows[symbol]
         indicators_key = symbol
-        
-        if indicators_key not in self.indicators:
-            self.indicators[indicators_key] = {}
+        pending = new_bars
+        
+        streams = self._streams.get(indicators_key)
+        if streams is None:
+            streams = self._streams[indicators_key] = {
+                block['id']: StreamingIndicator(block['indicator'], block.get('params', {}),
+                                                self.window_size)
+                for block in self.indicator_blocks
+            }
+            self._buf[indicators_key] = np.full((self.window_size, len(self._col_idx)), np.nan)
+            self._buf_len[indicators_key] = 0
+            
+            # First fill: seed every indicator from the fetched history in one pass
+            if not any(replace for _, replace in new_bars):
+                self._warm_up_indicators(indicators_key, streams, [bar for bar, _ in new_bars])
+                pending = []
+        buf = self._buf[indicators_key]
+        length = self._buf_len[indicators_key]
+        col_idx = self._col_idx
+        
+        for bar, replace in pending:
+            # New bars take a new row (shifting the window up once it is full);
+            # revisions of the newest bar overwrite the last row
+            if not replace or length == 0:
+                if length == self.window_size:
+                    buf[:-1] = buf[1:]
+                else:
+                    length += 1
+            row = buf[length - 1]
+            
+            for block in self.indicator_blocks:
+                block_id = block['id']
+                result = streams[block_id].update(*bar[1:], replace=replace)
+                
+                # Handle indicators that return multiple values
+                if isinstance(result, dict):
+                    for key, value in result.items():
+                        row[col_idx[f"{block_id}_{key}"]] = value
+                    row[col_idx[block_id]] = result['macd'] if 'macd' in result else result.get('middle')
+                else:
+                    row[col_idx[block_id]] = result
+        
+        # Column views for the evaluator - once the window is full the rows
+        # shift in place, so the views stay valid
+        if length != self._buf_len[indicators_key] or indicators_key not in self.indicators:
+            self._buf_len[indicators_key] = length
+            self.indicators[indicators_key] = {
+                key: buf[:length, col] for key, col in col_idx.items()
+            }
+        
+        # Conditions over the whole window at once, so a tick that appends
+        # several bars (e.g. after a stall) sees crossovers on all of them.
+        # The first fill is history, so only its latest bar counts.
+        if self.condition_exprs:
+            appended = sum(1 for _, replace in new_bars if not replace)
+            first_fill = indicators_key not in self._condition_masks
+            self._bars_to_check[indicators_key] = 1 if first_fill else max(1, appended)
+            self._condition_masks[indicators_key] = ConditionEvaluator.evaluate_conditions(
+                self.condition_exprs,
+                self.indicators[indicators_key],
+                len(self.data_bars[symbol])
+            )
+    
+    def _warm_up_indicators(self, symbol: str, streams: Dict[str, StreamingIndicator],
+                            bars: List[tuple]):
+        """Feed the first fetched bars to every indicator at once and fill the buffer"""
+        buf = self._buf[symbol]
+        # Bar tuples are (timestamp, open, high, low, close, volume)
+        _, high, low, close, volume = np.array([bar[1:] for bar in bars], dtype=np.float64).T
+        rows = min(len(bars), self.window_size)
         
         for block in self.indicator_blocks:
             block_id = block['id']
-            indicator_type = block['indicator']
-            params = block.get('params', {})
-            
-            result = IndicatorEngine.calculate(df, indicator_type, params)
-            
-            # Handle indicators that return multiple series
-            if isinstance(result, dict):
-                for key, series in result.items():
-                    self.indicators[indicators_key][f"{block_id}_{key}"] = series
-                self.indicators[indicators_key][block_id] = result.get('macd') or result.get('middle')
+            values = streams[block_id].warm_up(high, low, close, volume)[-rows:]
+            keys = StreamingIndicator.output_keys(block['indicator'])
+            if keys:
+                for k, key in enumerate(keys):
+                    buf[:rows, self._col_idx[f"{block_id}_{key}"]] = values[:, k]
+                main = keys.index('macd') if 'macd' in keys else keys.index('middle')
+                buf[:rows, self._col_idx[block_id]] = values[:, main]
             else:
-                self.indicators[indicators_key][block_id] = result
+                buf[:rows, self._col_idx[block_id]] = values[:, 0]
+        self._buf_len[symbol] = rows
     
-    def _check_exit_conditions(self, symbol: str):
+    def _check_exit_conditions(self, symbol: str, spot_price: Optional[float] = None):
         """Check stop loss and take profit on existing positions"""
         portfolio = portfolios_db.get(self.portfolio_id)
         if not portfolio:
@@ -180,12 +566,13 @@ class ForwardRunner:
         if not holding:
             return
         
-        # Get current price
-        current_price = self._get_current_price(symbol)
+        # Get current price (the latest bar close if no spot price was fetched)
+        current_price = spot_price or self._get_current_price(symbol)
         if not current_price:
             return
         
-        # Update current price in holding
+        # Update current price in holding (and the portfolio's mark-to-market value)
+        portfolio.holdings_value += (current_price - holding['currentPrice']) * holding['qty']
         holding['currentPrice'] = current_price
         holding['pnl'] = (current_price - holding['avgPrice']) * holding['qty']
         holding['pnlPct'] = ((current_price - holding['avgPrice']) / holding['avgPrice']) * 100
@@ -203,35 +590,21 @@ class ForwardRunner:
                 return
     
     def _evaluate_strategy(self, symbol: str):
-        """Evaluate strategy conditions and execute actions"""
-        if symbol not in self.data_windows:
+        """Execute actions if any condition fired on the bars new this tick"""
+        bars = self.data_bars.get(symbol)
+        if not bars:
             return
         
-        df = self.data_windows[symbol]
-        if len(df) == 0:
+        masks = self._condition_masks.get(symbol)
+        if masks is None:
             return
         
-        indicators_key = symbol
-        if indicators_key not in self.indicators:
-            return
-        
-        current_idx = len(df) - 1
-        
-        # Evaluate conditions
-        for condition_block in self.condition_blocks:
-            condition_expr = condition_block.get('expr')
-            if not condition_expr:
-                continue
-            
-            if ConditionEvaluator.evaluate(
-                condition_expr, 
-                self.indicators[indicators_key], 
-                current_idx
-            ):
-                # Condition met - execute actions
-                current_price = df.iloc[-1]['close']
-                self._execute_actions(symbol, current_price)
-                break
+        # Indexing the precomputed masks - the conditions were evaluated with the indicators
+        checked = min(self._bars_to_check.get(symbol, 1), masks.shape[1])
+        if masks[:, -checked:].any():
+            # Condition met - execute actions
+            current_price = bars[-1][BAR_FIELDS.index('close') + 1]
+            self._execute_actions(symbol, current_price)
     
     def _execute_actions(self, symbol: str, price: float):
         """Execute action blocks"""
@@ -272,6 +645,7 @@ class ForwardRunner:
         
         # Update portfolio
         portfolio.cash -= position_value
+        portfolio.holdings_value += position_value
         portfolio.holdings[symbol] = {
             'qty': qty,
             'avgPrice': price,
@@ -314,7 +688,10 @@ class ForwardRunner:
         
         # Update portfolio
         portfolio.cash += position_value
+        portfolio.holdings_value -= qty * holding['currentPrice']
         del portfolio.holdings[symbol]
+        if not portfolio.holdings:
+            portfolio.holdings_value = 0.0  # Drop accumulated rounding
         
         # Update trade record
         for trade_dict in portfolio.trades:
@@ -329,10 +706,7 @@ class ForwardRunner:
                 break
         
         # Update equity curve
-        total_value = portfolio.cash + sum(
-            h['qty'] * h['currentPrice'] 
-            for h in portfolio.holdings.values()
-        )
+        total_value = portfolio.cash + portfolio.holdings_value
         portfolio.equity_curve.append({
             'timestamp': datetime.utcnow().isoformat(),
             'value': total_value
@@ -342,8 +716,9 @@ class ForwardRunner:
     
     def _get_current_price(self, symbol: str) -> Optional[float]:
         """Get current market price"""
-        if symbol in self.data_windows and len(self.data_windows[symbol]) > 0:
-            return self.data_windows[symbol].iloc[-1]['close']
+        bars = self.data_bars.get(symbol)
+        if bars:
+            return bars[-1][BAR_FIELDS.index('close') + 1]
         return None
 
 
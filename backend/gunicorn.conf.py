@@ -0,0 +1,27 @@
+"""
+Gunicorn settings for serving the API without the Flask dev server
+Usage (from backend/): gunicorn main:app
+"""
+
+bind = "0.0.0.0:5001"
+
+# One worker process: strategies, backtests, portfolios and the forward-test
+# scheduler live in this process's memory, so a second worker would see a
+# different (empty) copy of them
+workers = 1
+
+# Concurrency comes from threads instead. Handlers mostly wait on Yahoo
+# Finance, news feeds and LLM calls, and real threads (unlike gevent
+# greenlets) keep numba backtest kernels from stalling every other request
+worker_class = "gthread"
+threads = 32
+
+# Reports and AI analysis can take a while on cold caches
+timeout = 120
+keepalive = 5
+
+
+def post_worker_init(worker):
+    """Compile the backtest kernels once the worker has loaded the app"""
+    from backtest_worker import warm_up_kernels
+    warm_up_kernels()
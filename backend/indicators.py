@@ -2,9 +2,312 @@
 Technical indicator calculations for backtesting and forward testing
 All indicators work on pandas DataFrames with OHLCV data
 """
+import ast
+import re
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from _njit import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True, nogil=True)
+def _fused_moving_averages(values, windows, alphas):
+    """
+    All rolling means and EMAs of one series in a single pass
+    
+    Replicates pandas' rolling(window).mean() (Kahan-compensated running sum
+    with separate add/remove compensation, NaN-aware counts) and
+    ewm(span, adjust=False).mean() step for step, so the output is
+    bit-identical. alphas are 2 / (span + 1) as pandas derives them.
+    
+    Returns (sma[len(windows), n], ema[len(alphas), n])
+    """
+    n = values.shape[0]
+    n_sma = windows.shape[0]
+    n_ema = alphas.shape[0]
+    sma = np.empty((n_sma, n))
+    ema = np.empty((n_ema, n))
+    # SMA state (pandas roll_mean: Kahan add/remove with separate compensation)
+    nobs = np.zeros(n_sma, np.int64)
+    neg_ct = np.zeros(n_sma, np.int64)
+    sum_x = np.zeros(n_sma)
+    comp_add = np.zeros(n_sma)
+    comp_rem = np.zeros(n_sma)
+    same_ct = np.zeros(n_sma, np.int64)
+    prev_val = np.zeros(n_sma)
+    # EMA state (pandas ewm, adjust=False)
+    weighted = np.empty(n_ema)
+    old_wt = np.ones(n_ema)
+    e_nobs = np.zeros(n_ema, np.int64)
+    for i in range(n):
+        val = values[i]
+        is_obs = val == val
+        for k in range(n_sma):
+            w = windows[k]
+            s = i + 1 - w
+            if s < 0:
+                s = 0
+            if i == 0 or w == 1:
+                prev_val[k] = values[s]
+                same_ct[k] = 0
+                sum_x[k] = 0.0
+                comp_add[k] = 0.0
+                comp_rem[k] = 0.0
+                nobs[k] = 0
+                neg_ct[k] = 0
+            elif s > 0:
+                old = values[s - 1]
+                if old == old:
+                    nobs[k] -= 1
+                    y = -old - comp_rem[k]
+                    t = sum_x[k] + y
+                    comp_rem[k] = t - sum_x[k] - y
+                    sum_x[k] = t
+                    if np.signbit(old):
+                        neg_ct[k] -= 1
+            if is_obs:
+                nobs[k] += 1
+                y = val - comp_add[k]
+                t = sum_x[k] + y
+                comp_add[k] = t - sum_x[k] - y
+                sum_x[k] = t
+                if np.signbit(val):
+                    neg_ct[k] += 1
+                if val == prev_val[k]:
+                    same_ct[k] += 1
+                else:
+                    same_ct[k] = 1
+                prev_val[k] = val
+            if nobs[k] >= w and nobs[k] > 0:
+                result = sum_x[k] / nobs[k]
+                if same_ct[k] >= nobs[k]:
+                    result = prev_val[k]
+                elif neg_ct[k] == 0 and result < 0:
+                    result = 0.0
+                elif neg_ct[k] == nobs[k] and result > 0:
+                    result = 0.0
+                sma[k, i] = result
+            else:
+                sma[k, i] = np.nan
+        for k in range(n_ema):
+            if i == 0:
+                weighted[k] = val
+                e_nobs[k] = 1 if is_obs else 0
+            else:
+                e_nobs[k] += 1 if is_obs else 0
+                wk = weighted[k]
+                if wk == wk:
+                    old_wt[k] *= 1.0 - alphas[k]
+                    if is_obs:
+                        if wk != val:
+                            wk = old_wt[k] * wk + alphas[k] * val
+                            wk /= old_wt[k] + alphas[k]
+                            weighted[k] = wk
+                        old_wt[k] = 1.0
+                elif is_obs:
+                    weighted[k] = val
+            ema[k, i] = weighted[k] if e_nobs[k] >= 1 else np.nan
+    return sma, ema
+
+@njit(cache=True, nogil=True)
+def _rolling_mean_std(values, window, with_std):
+    """
+    Rolling mean and (optionally) sample std of one series in a single pass
+    
+    The mean replicates pandas roll_mean exactly (same Kahan bookkeeping as
+    _fused_moving_averages); the std follows pandas roll_var (Welford updates
+    with Kahan-compensated means, 0 for constant windows). State is kept in
+    scalars so it stays in registers.
+    
+    Returns (mean, std) - std is empty unless with_std
+    """
+    n = values.shape[0]
+    mean = np.empty(n)
+    std = np.empty(n if with_std else 0)
+    # roll_mean state
+    nobs = 0
+    neg_ct = 0
+    sum_x = 0.0
+    comp_add = 0.0
+    comp_rem = 0.0
+    same_ct = 0
+    prev_val = 0.0
+    # roll_var state
+    mean_x = 0.0
+    ssqdm = 0.0
+    v_comp_add = 0.0
+    v_comp_rem = 0.0
+    for i in range(n):
+        val = values[i]
+        s = i + 1 - window
+        if s < 0:
+            s = 0
+        if i == 0 or window == 1:
+            prev_val = values[s]
+            same_ct = 0
+            sum_x = comp_add = comp_rem = 0.0
+            nobs = 0
+            neg_ct = 0
+            mean_x = ssqdm = v_comp_add = v_comp_rem = 0.0
+        elif s > 0:
+            old = values[s - 1]
+            if old == old:
+                nobs -= 1
+                y = -old - comp_rem
+                t = sum_x + y
+                comp_rem = t - sum_x - y
+                sum_x = t
+                if np.signbit(old):
+                    neg_ct -= 1
+                if with_std:
+                    if nobs:
+                        prev_mean = mean_x - v_comp_rem
+                        y = old - v_comp_rem
+                        t = y - mean_x
+                        v_comp_rem = t + mean_x - y
+                        mean_x = mean_x - t / nobs
+                        ssqdm = ssqdm - (old - prev_mean) * (old - mean_x)
+                    else:
+                        mean_x = 0.0
+                        ssqdm = 0.0
+        if val == val:
+            nobs += 1
+            y = val - comp_add
+            t = sum_x + y
+            comp_add = t - sum_x - y
+            sum_x = t
+            if np.signbit(val):
+                neg_ct += 1
+            if val == prev_val:
+                same_ct += 1
+            else:
+                same_ct = 1
+            prev_val = val
+            if with_std:
+                prev_mean = mean_x - v_comp_add
+                y = val - v_comp_add
+                t = y - mean_x
+                v_comp_add = t + mean_x - y
+                mean_x = mean_x + t / nobs
+                ssqdm = ssqdm + (val - prev_mean) * (val - mean_x)
+        if nobs >= window and nobs > 0:
+            result = sum_x / nobs
+            if same_ct >= nobs:
+                result = prev_val
+            elif neg_ct == 0 and result < 0:
+                result = 0.0
+            elif neg_ct == nobs and result > 0:
+                result = 0.0
+            mean[i] = result
+        else:
+            mean[i] = np.nan
+        if with_std:
+            if nobs >= window and nobs > 1:
+                var = 0.0 if same_ct >= nobs else ssqdm / (nobs - 1)
+                std[i] = 0.0 if var < 0 else np.sqrt(var)
+            else:
+                std[i] = np.nan
+    return mean, std
+
+
+@njit(cache=True, nogil=True)
+def _atr_kernel(high, low, close, window):
+    """True range and its rolling mean (IndicatorEngine.atr)"""
+    n = close.shape[0]
+    true_range = np.empty(n)
+    for i in range(n):
+        tr = high[i] - low[i]
+        if i > 0:
+            # NaN-skipping max, as DataFrame.max(axis=1)
+            high_close = abs(high[i] - close[i - 1])
+            low_close = abs(low[i] - close[i - 1])
+            if tr != tr or high_close > tr:
+                tr = high_close
+            if tr != tr or low_close > tr:
+                tr = low_close
+        true_range[i] = tr
+    return _rolling_mean_std(true_range, window, False)[0]
+
+
+@njit(cache=True, nogil=True)
+def _macd_kernel(close, alpha_fast, alpha_slow, alpha_signal):
+    """
+    Fast EMA, slow EMA and the signal EMA of their difference in lockstep
+    
+    Each EMA follows pandas ewm(adjust=False) as in _fused_moving_averages.
+    Returns (macd, signal, histogram).
+    """
+    n = close.shape[0]
+    macd = np.empty(n)
+    signal = np.empty(n)
+    histogram = np.empty(n)
+    alphas = np.array([alpha_fast, alpha_slow, alpha_signal])
+    weighted = np.empty(3)
+    old_wt = np.ones(3)
+    nobs = np.zeros(3, np.int64)
+    out = np.empty(3)
+    for i in range(n):
+        for k in range(3):
+            # The signal EMA consumes this bar's MACD value
+            val = close[i] if k < 2 else out[0] - out[1]
+            is_obs = val == val
+            if i == 0:
+                weighted[k] = val
+                nobs[k] = 1 if is_obs else 0
+            else:
+                nobs[k] += 1 if is_obs else 0
+                wk = weighted[k]
+                if wk == wk:
+                    old_wt[k] *= 1.0 - alphas[k]
+                    if is_obs:
+                        if wk != val:
+                            wk = old_wt[k] * wk + alphas[k] * val
+                            wk /= old_wt[k] + alphas[k]
+                            weighted[k] = wk
+                        old_wt[k] = 1.0
+                elif is_obs:
+                    weighted[k] = val
+            out[k] = weighted[k] if nobs[k] >= 1 else np.nan
+        macd[i] = out[0] - out[1]
+        signal[i] = out[2]
+        histogram[i] = macd[i] - signal[i]
+    return macd, signal, histogram
+
+
+def _valid_window(window) -> bool:
+    """Rolling window the kernels accept (others go to pandas for its errors)"""
+    return isinstance(window, (int, np.integer)) and not isinstance(window, bool) and window >= 1
+
+
+def _valid_span(span) -> bool:
+    """EMA span the kernels accept (others go to pandas for its errors)"""
+    return (isinstance(span, (int, float, np.integer, np.floating))
+            and not isinstance(span, bool) and span >= 1)
+
+
+def _span_alpha(span) -> float:
+    """Smoothing factor pandas derives from an EMA span"""
+    return 1. / (1. + (span - 1) / 2)
+
+
+def _moving_average_lookbacks(specs) -> Tuple[List[int], List[float]]:
+    """Distinct rolling-mean windows and EMA spans used by a batch of specs"""
+    windows, spans = [], []
+    for _, indicator, params in specs:
+        indicator = indicator.upper()
+        if indicator in ('SMA', 'BOLLINGER'):
+            windows.append(params.get('period', 20))
+        elif indicator == 'EMA':
+            spans.append(params.get('period', 20))
+        elif indicator == 'MACD':
+            spans.extend((params.get('fast', 12), params.get('slow', 26)))
+    
+    # Anything else is left to pandas so it raises the usual errors
+    windows = sorted({w for w in windows if _valid_window(w)})
+    spans = sorted({s for s in spans if _valid_span(s)})
+    return windows, spans
 
 
 class IndicatorEngine:
@@ -47,6 +350,107 @@ class IndicatorEngine:
         else:
             raise ValueError(f"Unknown indicator: {indicator}")
     
+    @staticmethod
+    def calculate_batch(df: pd.DataFrame,
+                        specs: List[Tuple[str, str, Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Calculate several indicators at once, sharing intermediate results
+        
+        Rolling means are shared between SMA and Bollinger blocks, EMAs between
+        EMA and MACD blocks, and the close diff / true range are computed once.
+        With numba, all rolling means and EMAs come from one fused pass.
+        Results are identical to calling calculate() for every spec.
+        
+        Args:
+            df: DataFrame with columns ['open', 'high', 'low', 'close', 'volume']
+            specs: List of (key, indicator, params) tuples
+        
+        Returns:
+            Dict mapping key to the indicator result (Series or dict of Series)
+        """
+        close = df['close']
+        memo = {}
+        
+        def cached(key, compute):
+            if key not in memo:
+                memo[key] = compute()
+            return memo[key]
+        
+        # Every SMA window and EMA span in one compiled pass over close
+        if NUMBA_AVAILABLE and len(close) > 0:
+            windows, spans = _moving_average_lookbacks(specs)
+            if windows or spans:
+                sma, ema = _fused_moving_averages(
+                    close.to_numpy(dtype=np.float64),
+                    np.array(windows, dtype=np.int64),
+                    np.array([_span_alpha(span) for span in spans], dtype=np.float64)
+                )
+                for k, window in enumerate(windows):
+                    memo[('sma', window)] = pd.Series(sma[k], index=close.index, name=close.name)
+                for k, span in enumerate(spans):
+                    memo[('ema', span)] = pd.Series(ema[k], index=close.index, name=close.name)
+        
+        def rolling_mean(period):
+            return cached(('sma', period), lambda: close.rolling(window=period).mean())
+        
+        def ema(span):
+            return cached(('ema', span), lambda: close.ewm(span=span, adjust=False).mean())
+        
+        def delta():
+            return cached('delta', lambda: close.diff())
+        
+        def true_range():
+            def compute():
+                prev_close = close.shift()
+                high_low = df['high'] - df['low']
+                high_close = np.abs(df['high'] - prev_close)
+                low_close = np.abs(df['low'] - prev_close)
+                return pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+            return cached('true_range', compute)
+        
+        def compute_one(indicator, params):
+            if indicator == 'SMA':
+                return rolling_mean(params.get('period', 20))
+            elif indicator == 'EMA':
+                return ema(params.get('period', 20))
+            elif indicator == 'RSI':
+                period = params.get('period', 14)
+                d = delta()
+                gain = (d.where(d > 0, 0)).rolling(window=period).mean()
+                loss = (-d.where(d < 0, 0)).rolling(window=period).mean()
+                return 100 - (100 / (1 + gain / loss))
+            elif indicator == 'MACD':
+                macd_line = ema(params.get('fast', 12)) - ema(params.get('slow', 26))
+                signal_line = macd_line.ewm(span=params.get('signal', 9), adjust=False).mean()
+                return {
+                    'macd': macd_line,
+                    'signal': signal_line,
+                    'histogram': macd_line - signal_line
+                }
+            elif indicator == 'BOLLINGER':
+                period = params.get('period', 20)
+                middle = rolling_mean(period)
+                std_dev = cached(('std', period), lambda: close.rolling(window=period).std())
+                std = params.get('std', 2)
+                return {
+                    'upper': middle + (std_dev * std),
+                    'middle': middle,
+                    'lower': middle - (std_dev * std)
+                }
+            elif indicator == 'VWAP':
+                return cached('vwap', lambda: IndicatorEngine.vwap(df))
+            elif indicator == 'ATR':
+                return true_range().rolling(window=params.get('period', 14)).mean()
+            else:
+                raise ValueError(f"Unknown indicator: {indicator}")
+        
+        results = {}
+        for key, indicator, params in specs:
+            indicator = indicator.upper()
+            spec_key = (indicator, tuple(sorted(params.items())))
+            results[key] = cached(spec_key, lambda: compute_one(indicator, params))
+        return results
+    
     @staticmethod
     def sma(df: pd.DataFrame, period: int) -> pd.Series:
         """Simple Moving Average"""
@@ -71,6 +475,13 @@ class IndicatorEngine:
     @staticmethod
     def macd(df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, pd.Series]:
         """MACD indicator - returns dict with macd, signal, histogram"""
+        if NUMBA_AVAILABLE and len(df) > 0 and all(map(_valid_span, (fast, slow, signal))):
+            close = df['close']
+            lines = _macd_kernel(close.to_numpy(dtype=np.float64), _span_alpha(fast),
+                                 _span_alpha(slow), _span_alpha(signal))
+            return {key: pd.Series(values, index=close.index, name=close.name)
+                    for key, values in zip(('macd', 'signal', 'histogram'), lines)}
+        
         ema_fast = df['close'].ewm(span=fast, adjust=False).mean()
         ema_slow = df['close'].ewm(span=slow, adjust=False).mean()
         macd_line = ema_fast - ema_slow
@@ -86,8 +497,14 @@ class IndicatorEngine:
     @staticmethod
     def bollinger(df: pd.DataFrame, period: int = 20, std: float = 2) -> Dict[str, pd.Series]:
         """Bollinger Bands - returns dict with upper, middle, lower"""
-        middle = df['close'].rolling(window=period).mean()
-        std_dev = df['close'].rolling(window=period).std()
+        if NUMBA_AVAILABLE and len(df) > 0 and _valid_window(period):
+            close = df['close']
+            middle, std_dev = _rolling_mean_std(close.to_numpy(dtype=np.float64), period, True)
+            middle = pd.Series(middle, index=close.index, name=close.name)
+            std_dev = pd.Series(std_dev, index=close.index, name=close.name)
+        else:
+            middle = df['close'].rolling(window=period).mean()
+            std_dev = df['close'].rolling(window=period).std()
         upper = middle + (std_dev * std)
         lower = middle - (std_dev * std)
         
@@ -97,6 +514,23 @@ class IndicatorEngine:
             'lower': lower
         }
     
+    @staticmethod
+    def crossover_mask(series1, series2, is_over: bool = True) -> np.ndarray:
+        """
+        Bars where series1 crosses over (or under) series2, in one vectorized pass
+        
+        Args:
+            series1: Indicator values (Series or array)
+            series2: Indicator values aligned with series1
+            is_over: True for cross_over, False for cross_under
+        
+        Returns:
+            Boolean NumPy array, same length as the inputs
+        """
+        return _cross_mask(np.asarray(series1, dtype=np.float64),
+                           np.asarray(series2, dtype=np.float64),
+                           is_over)
+    
     @staticmethod
     def vwap(df: pd.DataFrame) -> pd.Series:
         """Volume Weighted Average Price"""
@@ -107,6 +541,12 @@ class IndicatorEngine:
     @staticmethod
     def atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
         """Average True Range"""
+        if NUMBA_AVAILABLE and len(df) > 0 and _valid_window(period):
+            atr = _atr_kernel(df['high'].to_numpy(dtype=np.float64),
+                              df['low'].to_numpy(dtype=np.float64),
+                              df['close'].to_numpy(dtype=np.float64), period)
+            return pd.Series(atr, index=df.index)
+        
         high_low = df['high'] - df['low']
         high_close = np.abs(df['high'] - df['close'].shift())
         low_close = np.abs(df['low'] - df['close'].shift())
@@ -116,6 +556,468 @@ class IndicatorEngine:
         return atr
 
 
+# Streaming state layout. A rolling window occupies _WIN_HDR header slots
+# followed by `period` ring-buffer slots; an EMA occupies _EMA_SIZE slots.
+_WIN_TOTAL, _WIN_TOTAL_SQ, _WIN_VALID, _WIN_SHIFT, _WIN_HAS_SHIFT, _WIN_PUSHES, _WIN_POS, _WIN_COUNT = range(8)
+_WIN_HDR = 8
+_EMA_ALPHA, _EMA_WEIGHTED, _EMA_OLD_WT, _EMA_NOBS, _EMA_STARTED = range(5)
+_EMA_SIZE = 5
+
+# Indicator kinds understood by _stream_update
+_STREAM_KINDS = {'SMA': 0, 'EMA': 1, 'RSI': 2, 'MACD': 3, 'BOLLINGER': 4, 'VWAP': 5, 'ATR': 6}
+
+
+@njit(cache=True, nogil=True)
+def _win_push(state, off, period, value):
+    """
+    Push one value into the rolling window at state[off:]
+    
+    Sums are kept relative to the first value seen (keeps the variance
+    numerically stable) and rebuilt from the buffer once per full turn of the
+    window so rounding cannot drift.
+    """
+    buf = off + _WIN_HDR
+    pos = int(state[off + _WIN_POS])
+    if state[off + _WIN_COUNT] == period:
+        old = state[buf + pos]
+        if old == old:
+            d = old - state[off + _WIN_SHIFT]
+            state[off + _WIN_TOTAL] -= d
+            state[off + _WIN_TOTAL_SQ] -= d * d
+            state[off + _WIN_VALID] -= 1
+    else:
+        state[off + _WIN_COUNT] += 1
+    state[buf + pos] = value
+    state[off + _WIN_POS] = (pos + 1) % period
+    
+    if value == value:
+        if state[off + _WIN_HAS_SHIFT] == 0:
+            state[off + _WIN_SHIFT] = value
+            state[off + _WIN_HAS_SHIFT] = 1
+        d = value - state[off + _WIN_SHIFT]
+        state[off + _WIN_TOTAL] += d
+        state[off + _WIN_TOTAL_SQ] += d * d
+        state[off + _WIN_VALID] += 1
+    
+    state[off + _WIN_PUSHES] += 1
+    if state[off + _WIN_PUSHES] % period == 0 and state[off + _WIN_HAS_SHIFT] == 1:
+        shift = state[off + _WIN_SHIFT]
+        total = 0.0
+        total_sq = 0.0
+        for i in range(int(state[off + _WIN_COUNT])):
+            v = state[buf + i]
+            if v == v:
+                total += v - shift
+                total_sq += (v - shift) * (v - shift)
+        state[off + _WIN_TOTAL] = total
+        state[off + _WIN_TOTAL_SQ] = total_sq
+
+
+@njit(cache=True, nogil=True)
+def _win_sum(state, off):
+    """Sum of the non-NaN values in the window (0.0 when there are none)"""
+    if state[off + _WIN_VALID] == 0:
+        return 0.0
+    return state[off + _WIN_SHIFT] * state[off + _WIN_VALID] + state[off + _WIN_TOTAL]
+
+
+@njit(cache=True, nogil=True)
+def _win_mean(state, off, period):
+    """Window mean, NaN until the window holds `period` non-NaN values (pandas rolling)"""
+    if state[off + _WIN_VALID] < period:
+        return np.nan
+    return state[off + _WIN_SHIFT] + state[off + _WIN_TOTAL] / period
+
+
+@njit(cache=True, nogil=True)
+def _win_std(state, off, period):
+    """Window sample standard deviation (ddof=1, as pandas)"""
+    if state[off + _WIN_VALID] < period or period < 2:
+        return np.nan
+    total = state[off + _WIN_TOTAL]
+    var = (state[off + _WIN_TOTAL_SQ] - total * total / period) / (period - 1)
+    return np.sqrt(var) if var > 0 else 0.0
+
+
+@njit(cache=True, nogil=True)
+def _ema_push(state, off, value):
+    """One step of ewm(span, adjust=False).mean() (same recurrence as pandas)"""
+    is_obs = value == value
+    if state[off + _EMA_STARTED] == 0:
+        state[off + _EMA_STARTED] = 1
+        state[off + _EMA_WEIGHTED] = value
+    else:
+        wt = state[off + _EMA_WEIGHTED]
+        alpha = state[off + _EMA_ALPHA]
+        if wt == wt:
+            state[off + _EMA_OLD_WT] *= 1.0 - alpha
+            if is_obs:
+                if wt != value:
+                    old_wt = state[off + _EMA_OLD_WT]
+                    state[off + _EMA_WEIGHTED] = (old_wt * wt + alpha * value) / (old_wt + alpha)
+                state[off + _EMA_OLD_WT] = 1.0
+        elif is_obs:
+            state[off + _EMA_WEIGHTED] = value
+    if is_obs:
+        state[off + _EMA_NOBS] += 1
+    return state[off + _EMA_WEIGHTED] if state[off + _EMA_NOBS] >= 1 else np.nan
+
+
+@njit(cache=True, nogil=True)
+def _stream_update(kind, state, p1, mult, high, low, close, volume, out):
+    """
+    Advance one streaming indicator by one bar, writing its value(s) to out
+    
+    p1 is the window length (see StreamingIndicator for the state layout of
+    each kind); mult is the Bollinger band width.
+    """
+    if kind == 0:  # SMA
+        _win_push(state, 0, p1, close)
+        out[0] = _win_mean(state, 0, p1)
+    
+    elif kind == 1:  # EMA
+        out[0] = _ema_push(state, 0, close)
+    
+    elif kind == 2:  # RSI - diff().where(...) turns the leading NaN into 0 gain / 0 loss
+        delta = close - state[0]
+        state[0] = close
+        gain_off = 1
+        loss_off = 1 + _WIN_HDR + p1
+        _win_push(state, gain_off, p1, delta if delta > 0 else 0.0)
+        _win_push(state, loss_off, p1, -delta if delta < 0 else 0.0)
+        gain = _win_mean(state, gain_off, p1)
+        loss = _win_mean(state, loss_off, p1)
+        if gain != gain or loss != loss or (gain == 0 and loss == 0):
+            out[0] = np.nan
+        elif loss == 0:
+            out[0] = 100.0
+        else:
+            out[0] = 100 - (100 / (1 + gain / loss))
+    
+    elif kind == 3:  # MACD
+        macd_line = _ema_push(state, 0, close) - _ema_push(state, _EMA_SIZE, close)
+        signal_line = _ema_push(state, 2 * _EMA_SIZE, macd_line)
+        out[0] = macd_line
+        out[1] = signal_line
+        out[2] = macd_line - signal_line
+    
+    elif kind == 4:  # BOLLINGER
+        _win_push(state, 0, p1, close)
+        middle = _win_mean(state, 0, p1)
+        std_dev = _win_std(state, 0, p1)
+        out[0] = middle + std_dev * mult
+        out[1] = middle
+        out[2] = middle - std_dev * mult
+    
+    elif kind == 5:  # VWAP over the last p1 bars
+        pv = (high + low + close) / 3 * volume
+        vol_off = _WIN_HDR + p1
+        _win_push(state, 0, p1, pv)
+        _win_push(state, vol_off, p1, volume)
+        pv_sum = _win_sum(state, 0)
+        vol_sum = _win_sum(state, vol_off)
+        if pv != pv:
+            out[0] = np.nan
+        elif vol_sum == 0:
+            out[0] = np.nan if pv_sum == 0 else (np.inf if pv_sum > 0 else -np.inf)
+        else:
+            out[0] = pv_sum / vol_sum
+    
+    elif kind == 6:  # ATR
+        prev_close = state[0]
+        state[0] = close
+        tr = high - low
+        high_close = abs(high - prev_close)
+        low_close = abs(low - prev_close)
+        # max(axis=1) skips NaN
+        if tr != tr or (high_close == high_close and high_close > tr):
+            tr = high_close
+        if tr != tr or (low_close == low_close and low_close > tr):
+            tr = low_close
+        _win_push(state, 1, p1, tr)
+        out[0] = _win_mean(state, 1, p1)
+
+
+@njit(cache=True, nogil=True)
+def _stream_run(kind, state, before_last, p1, mult, high, low, close, volume, out):
+    """
+    Feed a run of bars through _stream_update in one compiled loop
+    
+    Row i of out receives the value(s) for bar i; before_last is left holding
+    the state before the final bar, as update() would.
+    """
+    n = close.shape[0]
+    for i in range(n):
+        if i == n - 1:
+            before_last[:] = state
+        _stream_update(kind, state, p1, mult, high[i], low[i], close[i], volume[i], out[i])
+
+
+def _new_window(period: int) -> np.ndarray:
+    """Empty rolling-window state (see _win_push)"""
+    state = np.zeros(_WIN_HDR + period)
+    state[_WIN_HDR:] = np.nan
+    return state
+
+
+def _new_ema(span: float) -> np.ndarray:
+    """Empty EMA state (see _ema_push)"""
+    if isinstance(span, bool) or not isinstance(span, (int, float, np.integer, np.floating)) or span < 1:
+        raise ValueError(f"span must be a number >= 1, got {span!r}")
+    state = np.zeros(_EMA_SIZE)
+    state[_EMA_ALPHA] = 1. / (1. + (span - 1) / 2)
+    state[_EMA_WEIGHTED] = np.nan
+    state[_EMA_OLD_WT] = 1.0
+    return state
+
+
+def _check_window(name: str, value) -> int:
+    """Validate a rolling window length"""
+    if isinstance(value, bool) or not isinstance(value, (int, np.integer)) or value < 1:
+        raise ValueError(f"{name} must be a positive integer, got {value!r}")
+    return int(value)
+
+
+class StreamingIndicator:
+    """
+    Incremental version of an IndicatorEngine indicator for live data
+    
+    Consumes one bar at a time and keeps only the state the next value needs,
+    so each update is O(1) instead of recomputing the whole window. update()
+    returns what calculate() would give for the newest bar: a float, or a dict
+    of floats for MACD and Bollinger. VWAP accumulates over the last
+    `window_size` bars, like calculate() on a rolling window of that size.
+    
+    The state is a flat float64 array advanced by the compiled _stream_update
+    kernel (plain Python when numba is not installed).
+    """
+    
+    _OUTPUT_KEYS = {'MACD': ('macd', 'signal', 'histogram'),
+                    'BOLLINGER': ('upper', 'middle', 'lower')}
+    
+    @staticmethod
+    def output_keys(indicator: str) -> Optional[Tuple[str, ...]]:
+        """Keys of the dict update() returns for an indicator (None if it returns a float)"""
+        return StreamingIndicator._OUTPUT_KEYS.get(indicator.upper())
+    
+    def __init__(self, indicator: str, params: Dict[str, Any], window_size: int = 100):
+        self.indicator = indicator.upper()
+        self.params = params
+        if self.indicator not in _STREAM_KINDS:
+            raise ValueError(f"Unknown indicator: {self.indicator}")
+        self._kind = _STREAM_KINDS[self.indicator]
+        self._p1 = 1
+        self._mult = 0.0
+        
+        if self.indicator in ('SMA', 'BOLLINGER'):
+            self._p1 = _check_window('period', params.get('period', 20))
+            self._mult = float(params.get('std', 2))
+            parts = [_new_window(self._p1)]
+        elif self.indicator == 'EMA':
+            parts = [_new_ema(params.get('period', 20))]
+        elif self.indicator == 'RSI':
+            self._p1 = _check_window('period', params.get('period', 14))
+            parts = [np.full(1, np.nan), _new_window(self._p1), _new_window(self._p1)]
+        elif self.indicator == 'MACD':
+            parts = [_new_ema(params.get('fast', 12)), _new_ema(params.get('slow', 26)),
+                     _new_ema(params.get('signal', 9))]
+        elif self.indicator == 'VWAP':
+            self._p1 = _check_window('window_size', window_size)
+            parts = [_new_window(self._p1), _new_window(self._p1)]
+        else:  # ATR
+            self._p1 = _check_window('period', params.get('period', 14))
+            parts = [np.full(1, np.nan), _new_window(self._p1)]
+        
+        self._state = np.concatenate(parts)
+        self._before_last = self._state.copy()  # State before the newest bar (for revisions)
+        self._has_bar = False
+        self._out = np.full(3, np.nan)
+    
+    def update(self, open_: float, high: float, low: float, close: float, volume: float,
+               replace: bool = False):
+        """
+        Feed one bar and return the indicator value for it
+        
+        Args:
+            open_, high, low, close, volume: The bar
+            replace: True when the bar revises the newest one (e.g. a candle
+                that is still forming) instead of following it
+        
+        Returns:
+            float, or dict of floats for MACD / Bollinger
+        """
+        if replace and self._has_bar:
+            self._state[:] = self._before_last
+        else:
+            self._before_last[:] = self._state
+        self._has_bar = True
+        
+        _stream_update(self._kind, self._state, self._p1, self._mult,
+                       float(high), float(low), float(close), float(volume), self._out)
+        
+        keys = self._OUTPUT_KEYS.get(self.indicator)
+        if keys is None:
+            return float(self._out[0])
+        return {key: float(value) for key, value in zip(keys, self._out)}
+    
+    def warm_up(self, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                volume: np.ndarray) -> np.ndarray:
+        """
+        Feed a history of bars at once (e.g. the first fetch) in one compiled pass
+        
+        Leaves the same state as calling update() for every bar.
+        
+        Returns:
+            float64 array (bars x outputs) - one column, or one per output key
+            for MACD / Bollinger
+        """
+        n = len(close)
+        keys = self._OUTPUT_KEYS.get(self.indicator)
+        out = np.full((n, 3), np.nan)
+        if n:
+            _stream_run(self._kind, self._state, self._before_last, self._p1, self._mult,
+                        np.asarray(high, dtype=np.float64), np.asarray(low, dtype=np.float64),
+                        np.asarray(close, dtype=np.float64), np.asarray(volume, dtype=np.float64),
+                        out)
+            self._has_bar = True
+        return out[:, :len(keys) if keys else 1]
+
+
+_BLOCK_ID_RE = re.compile(r'b\d+')
+
+
+@lru_cache(maxsize=256)
+def _block_refs(expr: str) -> Tuple[str, ...]:
+    """Block IDs referenced by a condition expression (parsed once per expression)"""
+    return tuple(_BLOCK_ID_RE.findall(expr))
+
+# AST nodes allowed in compiled condition expressions
+_SAFE_NODES = (
+    ast.Expression, ast.Compare, ast.BoolOp, ast.UnaryOp, ast.BinOp, ast.Name,
+    ast.Load, ast.Constant, ast.And, ast.Or, ast.Not, ast.USub, ast.UAdd,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.Pow,
+    ast.Gt, ast.GtE, ast.Lt, ast.LtE, ast.Eq, ast.NotEq
+)
+
+
+def _cross_mask(values1: np.ndarray, values2: np.ndarray, is_over: bool) -> np.ndarray:
+    """Crossover/crossunder of two aligned arrays (same semantics as the per-bar check)"""
+    mask = np.zeros(len(values1), dtype=np.bool_)
+    if len(values1) < 2:
+        return mask
+    
+    prev_below = values1[:-1] < values2[:-1]
+    curr_above = values1[1:] > values2[1:]
+    
+    if is_over:
+        mask[1:] = prev_below & curr_above
+    else:
+        mask[1:] = ~prev_below & ~curr_above
+    return mask
+
+
+def _truth(value) -> np.ndarray:
+    """Element-wise truthiness (bool() of every element)"""
+    return np.asarray(value).astype(np.bool_)
+
+
+class _VectorizeBoolOps(ast.NodeTransformer):
+    """Rewrite and/or/not and chained comparisons into element-wise &, |, ~"""
+    
+    @staticmethod
+    def _truth(node):
+        return ast.Call(func=ast.Name(id='_truth', ctx=ast.Load()), args=[node], keywords=[])
+    
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        result = self._truth(node.values[0])
+        for value in node.values[1:]:
+            result = ast.BinOp(left=result, op=op, right=self._truth(value))
+        return result
+    
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return ast.UnaryOp(op=ast.Invert(), operand=self._truth(node.operand))
+        return node
+    
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return node
+        # a < b < c -> (a < b) & (b < c)
+        left = node.left
+        result = None
+        for op, right in zip(node.ops, node.comparators):
+            part = ast.Compare(left=left, ops=[op], comparators=[right])
+            result = part if result is None else ast.BinOp(left=result, op=ast.BitAnd(), right=part)
+            left = right
+        return result
+
+
+@lru_cache(maxsize=128)
+def _compile_conditions(condition_exprs: Tuple[str, ...], block_ids: Tuple[str, ...]) -> Callable:
+    """
+    Generate and compile one function that evaluates every condition over whole arrays
+    
+    Block IDs are substituted exactly as in the per-bar evaluator, then each
+    expression is checked against a whitelist of AST nodes and rewritten to
+    element-wise NumPy operations. The compiled function takes the indicator
+    values in block_ids order and returns a bool array (conditions x bars).
+    Raises ValueError for expressions that cannot be compiled.
+    """
+    body = []
+    arrays_used = set()
+    nan_checked = set()
+    
+    for k, expr in enumerate(condition_exprs):
+        if 'cross_over' in expr or 'cross_under' in expr:
+            matches = _block_refs(expr)
+            if len(matches) != 2 or matches[0] not in block_ids or matches[1] not in block_ids:
+                continue  # never fires
+            a, b = block_ids.index(matches[0]), block_ids.index(matches[1])
+            arrays_used.update((a, b))
+            body.append(f"masks[{k}] = _cross(_v{a}, _v{b}, {'cross_over' in expr})")
+            continue
+        
+        expr_src = expr
+        refs = []
+        for j, block_id in enumerate(block_ids):
+            if block_id in expr_src:
+                expr_src = expr_src.replace(block_id, f"_v{j}")
+                refs.append(j)
+        
+        tree = ast.parse(expr_src.strip(), mode='eval')
+        for node in ast.walk(tree):
+            if not isinstance(node, _SAFE_NODES):
+                raise ValueError(f"Unsupported syntax in condition '{expr}'")
+            if isinstance(node, ast.Name) and node.id not in {f"_v{j}" for j in refs}:
+                raise ValueError(f"Unknown name '{node.id}' in condition '{expr}'")
+        tree = ast.fix_missing_locations(_VectorizeBoolOps().visit(tree))
+        
+        arrays_used.update(refs)
+        nan_checked.update(refs)
+        valid = ' & '.join(f"_ok{j}" for j in refs) or '_all'
+        body.append(
+            f"masks[{k}] = _np.broadcast_to(_truth({ast.unparse(tree.body)}), (length,)) & {valid}"
+        )
+    
+    lines = ["def _strategy_masks(arrays, length):",
+             f"    masks = _np.zeros(({len(condition_exprs)}, length), dtype=_np.bool_)",
+             "    _all = _np.ones(length, dtype=_np.bool_)"]
+    for j in sorted(arrays_used):
+        lines.append(f"    _v{j} = _np.asarray(arrays[{j}], dtype=_np.float64)[:length]")
+    for j in sorted(nan_checked):
+        lines.append(f"    _ok{j} = ~_np.isnan(_v{j})")
+    lines.extend(f"    {line}" for line in body)
+    lines.append("    return masks")
+    
+    namespace = {'__builtins__': {}, '_np': np, '_cross': _cross_mask, '_truth': _truth}
+    exec(compile("\n".join(lines), '<strategy conditions>', 'exec'), namespace)
+    return namespace['_strategy_masks']
+
+
 class ConditionEvaluator:
     """Evaluate trading conditions and rules"""
     
@@ -153,12 +1055,140 @@ class ConditionEvaluator:
             print(f"Error evaluating condition '{condition_expr}': {e}")
             return False
     
+    @staticmethod
+    def evaluate_conditions(condition_exprs: List[str], indicators: Dict[str, pd.Series],
+                            length: int) -> np.ndarray:
+        """
+        Evaluate a strategy's condition expressions over all bars at once
+        
+        The whole condition list is compiled into one specialized function
+        (cached per expression list), falling back to evaluate_vectorized()
+        per condition when an expression cannot be compiled.
+        
+        Args:
+            condition_exprs: Expressions like "cross_over(b1,b2)" or "b1 > 70"
+            indicators: Dict mapping block_id to indicator series
+            length: Number of bars
+        
+        Returns:
+            Boolean NumPy array of shape (len(condition_exprs), length)
+        """
+        try:
+            compiled = _compile_conditions(tuple(condition_exprs), tuple(indicators))
+            return compiled(list(indicators.values()), length)
+        except Exception:
+            masks = np.zeros((len(condition_exprs), length), dtype=np.bool_)
+            for k, expr in enumerate(condition_exprs):
+                masks[k] = ConditionEvaluator.evaluate_vectorized(expr, indicators, length)
+            return masks
+    
+    @staticmethod
+    def evaluate_conditions_at(condition_exprs: List[str], indicators: Dict[str, pd.Series],
+                               idx: int) -> np.ndarray:
+        """
+        Evaluate a strategy's condition expressions at a single bar
+        
+        Runs the compiled strategy function (see evaluate_conditions) on the
+        two bars a crossover needs, so expressions are parsed once per strategy
+        rather than on every call. Falls back to evaluate() per condition when
+        the expressions cannot be compiled.
+        
+        Args:
+            condition_exprs: Expressions like "cross_over(b1,b2)" or "b1 > 70"
+            indicators: Dict mapping block_id to indicator series
+            idx: Bar index
+        
+        Returns:
+            Boolean NumPy array of shape (len(condition_exprs),)
+        """
+        try:
+            compiled = _compile_conditions(tuple(condition_exprs), tuple(indicators))
+            start = max(idx - 1, 0)
+            window = [np.asarray(series, dtype=np.float64)[start:idx + 1]
+                      for series in indicators.values()]
+            return compiled(window, idx + 1 - start)[:, -1]
+        except Exception:
+            return np.array([bool(ConditionEvaluator.evaluate(expr, indicators, idx))
+                             for expr in condition_exprs], dtype=np.bool_)
+    
+    @staticmethod
+    def evaluate_vectorized(condition_expr: str, indicators: Dict[str, pd.Series],
+                            length: int) -> np.ndarray:
+        """
+        Evaluate a condition expression over all bars at once
+        
+        Same semantics as evaluate() applied to every index, but computed with
+        NumPy array operations. Expressions that cannot be vectorized (e.g. using
+        'and'/'or') fall back to bar-by-bar evaluation.
+        
+        Args:
+            condition_expr: Expression like "cross_over(b1,b2)" or "b1 > 70"
+            indicators: Dict mapping block_id to indicator series
+            length: Number of bars
+        
+        Returns:
+            Boolean NumPy array of shape (length,)
+        """
+        try:
+            if 'cross_over' in condition_expr:
+                return ConditionEvaluator._crossover_mask(
+                    condition_expr, indicators, length, True
+                )
+            elif 'cross_under' in condition_expr:
+                return ConditionEvaluator._crossover_mask(
+                    condition_expr, indicators, length, False
+                )
+            
+            return ConditionEvaluator._comparison_mask(
+                condition_expr, indicators, length
+            )
+        
+        except Exception:
+            return np.fromiter(
+                (bool(ConditionEvaluator.evaluate(condition_expr, indicators, idx))
+                 for idx in range(length)),
+                dtype=np.bool_, count=length
+            )
+    
+    @staticmethod
+    def _crossover_mask(expr: str, indicators: Dict, length: int, is_over: bool) -> np.ndarray:
+        """Vectorized crossover/crossunder over all bars"""
+        matches = _block_refs(expr)
+        if len(matches) != 2:
+            return np.zeros(length, dtype=np.bool_)
+        
+        series1 = indicators.get(matches[0])
+        series2 = indicators.get(matches[1])
+        if series1 is None or series2 is None:
+            return np.zeros(length, dtype=np.bool_)
+        
+        return IndicatorEngine.crossover_mask(np.asarray(series1)[:length],
+                                              np.asarray(series2)[:length],
+                                              is_over)
+    
+    @staticmethod
+    def _comparison_mask(expr: str, indicators: Dict, length: int) -> np.ndarray:
+        """Vectorized comparison: block IDs are bound to whole arrays instead of values"""
+        expr_eval = expr
+        namespace = {}
+        valid = np.ones(length, dtype=np.bool_)
+        for block_id, series in indicators.items():
+            if block_id in expr_eval:
+                values = np.asarray(series, dtype=np.float64)[:length]
+                valid &= ~np.isnan(values)
+                name = f"__v{len(namespace)}"
+                namespace[name] = values
+                expr_eval = expr_eval.replace(block_id, name)
+        
+        result = eval(expr_eval, {'__builtins__': {}}, namespace)
+        result = np.broadcast_to(np.asarray(result).astype(np.bool_), (length,))
+        return result & valid
+    
     @staticmethod
     def _evaluate_crossover(expr: str, indicators: Dict, idx: int, is_over: bool) -> bool:
         """Evaluate crossover/crossunder conditions"""
         # Extract block IDs from expression like "cross_over(b1,b2)"
-        import re
-        matches = re.findall(r'b\d+', expr)
+        matches = _block_refs(expr)
         if len(matches) != 2:
             return False
         
@@ -168,9 +1198,13 @@ class ConditionEvaluator:
         if series1 is None or series2 is None or idx < 1:
             return False
         
+        # Positional access on the underlying arrays (Series or ndarray)
+        values1 = np.asarray(series1)
+        values2 = np.asarray(series2)
+        
         # Check if series1 crosses series2
-        prev_below = series1.iloc[idx - 1] < series2.iloc[idx - 1]
-        curr_above = series1.iloc[idx] > series2.iloc[idx]
+        prev_below = values1[idx - 1] < values2[idx - 1]
+        curr_above = values1[idx] > values2[idx]
         
         if is_over:
             return prev_below and curr_above
@@ -180,13 +1214,11 @@ class ConditionEvaluator:
     @staticmethod
     def _evaluate_comparison(expr: str, indicators: Dict, idx: int) -> bool:
         """Evaluate comparison conditions like 'b1 > 70' or 'b1 < b2'"""
-        import re
-        
         # Replace block IDs with actual values
         expr_eval = expr
         for block_id, series in indicators.items():
             if block_id in expr_eval:
-                value = series.iloc[idx] if idx < len(series) else np.nan
+                value = np.asarray(series)[idx] if idx < len(series) else np.nan
                 if pd.isna(value):
                     return False
                 expr_eval = expr_eval.replace(block_id, str(value))
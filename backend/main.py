@@ -1,7 +1,11 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from ai_agent import get_agent_response, get_financial_report_json
-from content_aggregator import get_aggregated_content, LANGUAGES
+from ai_agent import get_agent_response, get_financial_report_json, get_stock_data
+from content_aggregator import (
+    get_aggregated_content, get_ai_analysis_and_action, translate_content,
+    translate_batch, LANGUAGES
+)
 from risk_assessment import (
     get_risk_questions, calculate_risk_score, analyze_portfolio_risk,
     suggest_asset_allocation, get_risk_profiles, calculate_corpus_investment_plan
@@ -22,16 +26,159 @@ from models import (
     Strategy, Backtest, Portfolio, Trade, DeployedStrategy,
     strategies_db, backtests_db, portfolios_db, trades_db, deployments_db
 )
-from backtest_worker import run_backtest
+from backtest_worker import run_backtest, warm_up_kernels
 from forward_runner import deploy_strategy, stop_deployment, active_runners
+from progressive_fetcher import get_all_news_articles, process_article_progressive
+from _cache import TTLCache, SingleFlight, SimilarityCache, RateLimiter, cacheable
 import os
+import sys
+import math
+import hashlib
+import json
+import gzip
+import atexit
+import queue
+import logging
+import logging.handlers
+import time
+from string import Template
 from werkzeug.utils import secure_filename
 import uuid
 import threading
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+from langchain_groq import ChatGroq
+from langchain_core.messages import SystemMessage, HumanMessage
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson  # Fast JSON encoding for API responses (optional)
+except ImportError:
+    orjson = None
+
+# Request logging goes through a queue: handlers only enqueue the record and
+# a background listener thread does the (blocking) stdout writes. The queue is
+# bounded - under a flood, records are dropped rather than piling up in memory.
+LOG_QUEUE_SIZE = 10000
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops the record when the queue is full"""
+
+    def prepare(self, record):
+        # The queue stays in-process, so the record is passed as-is and the
+        # listener thread does the message and traceback formatting
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+_log_queue = queue.Queue(LOG_QUEUE_SIZE)
+_log_stream = logging.StreamHandler(sys.stdout)
+_log_stream.setFormatter(logging.Formatter("%(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+log = logging.getLogger("moneymitra.api")
+log.addHandler(_DroppingQueueHandler(_log_queue))
+log.setLevel(logging.INFO)
+log.propagate = False
 
 app = Flask(__name__)
 
+
+if orjson is not None:
+    class OrjsonProvider(DefaultJSONProvider):
+        """jsonify() through orjson - same output shape as Flask's default provider"""
+
+        def _dumpb(self, obj, indent=False) -> bytes:
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            # Dates/UUIDs/dataclasses still go through Flask's default hook
+            return orjson.dumps(obj, default=self.default, option=option)
+
+        def dumps(self, obj, **kwargs) -> str:
+            if kwargs:  # custom json.dumps arguments - keep stdlib semantics
+                return super().dumps(obj, **kwargs)
+            return self._dumpb(obj).decode('utf-8')
+
+        def response(self, *args, **kwargs):
+            obj = self._prepare_response_obj(args, kwargs)
+            indent = (self.compact is None and self._app.debug) or self.compact is False
+            return self._app.response_class(self._dumpb(obj, indent) + b"\n", mimetype=self.mimetype)
+
+    app.json = OrjsonProvider(app)
+
+
+def _encode_json(payload) -> bytes:
+    """Encode a JSON payload with orjson when available, else Flask's encoder"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return app.json.dumps(payload).encode('utf-8')
+
+# One Groq chat client, created once so requests reuse its pooled HTTPS
+# connections instead of opening a new client (and TLS handshake) each time.
+# Endpoints that need other settings bind them per call on the same client.
+# Each call is time-bounded so a stalled completion cannot pin a server
+# thread (and with it a slot of the worker's thread pool) indefinitely.
+LLM_TIMEOUT_SECONDS = 60
+_groq_llm = ChatGroq(
+    model="llama-3.3-70b-versatile",
+    temperature=0.7,
+    api_key=os.getenv("GROQ_API_KEY"),
+    timeout=LLM_TIMEOUT_SECONDS
+)
+_insights_llm = _groq_llm.bind(max_tokens=2000)
+_summary_llm = _groq_llm.bind(temperature=0.5)
+_lesson_llm = _groq_llm
+
+# All Groq calls from these endpoints draw from one token bucket sized to the
+# account's requests-per-minute limit, so bursts queue here briefly instead of
+# being rejected upstream and each request sleeping through its own retries.
+GROQ_RPM = int(os.getenv("GROQ_RPM", "30"))
+LLM_QUEUE_SECONDS = 20  # longest a request waits for a slot before giving up
+LLM_MAX_RETRY_AFTER = 10
+_groq_limiter = RateLimiter(GROQ_RPM, 60)
+
+
+def _acquire_llm_slot():
+    if not _groq_limiter.acquire(timeout=LLM_QUEUE_SECONDS):
+        raise RuntimeError("Rate limit: too many AI requests right now, please retry shortly")
+
+
+def _retry_after_seconds(error):
+    """Seconds Groq asked us to wait on a 429, or None for other errors"""
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) != 429:
+        return None
+    try:
+        return min(float(response.headers.get("retry-after", 1)), LLM_MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+def _groq_invoke(llm, prompt):
+    """Invoke a Groq chat model within the shared rate limit (one retry if still told to back off)"""
+    _acquire_llm_slot()
+    try:
+        return llm.invoke(prompt)
+    except Exception as e:
+        retry_after = _retry_after_seconds(e)
+        if retry_after is None:
+            raise
+        print(f"    ⏳ Groq rate limited, retrying in {retry_after:.0f}s...")
+        time.sleep(retry_after)
+        _acquire_llm_slot()
+        return llm.invoke(prompt)
+
 # Configure upload folder (Friend's work)
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf', 'csv'}
@@ -41,24 +188,51 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 # Create upload folder if it doesn't exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# Configure CORS properly - allow both React dev servers and Vite
-CORS(app, origins=[
-    "http://localhost:3000", "http://127.0.0.1:3000",
-    "http://localhost:5173", "http://127.0.0.1:5173",  # Vite default port
-    "http://localhost:5174", "http://127.0.0.1:5174"
-], 
-     methods=["GET", "POST", "OPTIONS"],
-     allow_headers=["Content-Type", "Authorization"])
-
-# Add a preflight handler for all origins during development
-@app.before_request
-def handle_preflight():
-    if request.method == "OPTIONS":
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response 
+# Configure CORS - any origin by default, as the views always allowed.
+# Deployments can restrict it with a comma-separated CORS_ORIGINS, e.g.
+# CORS_ORIGINS=http://localhost:5173,https://app.example.com
+# Flask-CORS adds Access-Control-Allow-Origin to responses, so views don't
+# set it themselves; preflights are answered by the middleware
+ALLOWED_ORIGINS = frozenset(
+    origin.strip() for origin in os.getenv("CORS_ORIGINS", "*").split(",") if origin.strip()
+)
+CORS_METHODS = ["GET", "POST", "OPTIONS"]
+CORS_HEADERS = ["Content-Type", "Authorization"]
+
+CORS(app, resources={r"/*": {"origins": "*" if "*" in ALLOWED_ORIGINS else sorted(ALLOWED_ORIGINS)}},
+     methods=CORS_METHODS,
+     allow_headers=CORS_HEADERS)
+
+class PreflightMiddleware:
+    """
+    Answers CORS preflight (OPTIONS) requests for the allowed origins
+    Runs at the WSGI layer, so preflights never reach Flask's routing or views
+    """
+
+    _HEADERS = [
+        ('Access-Control-Allow-Headers', ', '.join(CORS_HEADERS)),
+        ('Access-Control-Allow-Methods', ', '.join(CORS_METHODS)),
+        ('Vary', 'Origin'),
+        ('Content-Length', '0'),
+    ]
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        if environ['REQUEST_METHOD'] == 'OPTIONS':
+            headers = list(self._HEADERS)
+            origin = environ.get('HTTP_ORIGIN')
+            if '*' in ALLOWED_ORIGINS:
+                headers.append(('Access-Control-Allow-Origin', '*'))
+            elif origin in ALLOWED_ORIGINS:
+                headers.append(('Access-Control-Allow-Origin', origin))
+            start_response('200 OK', headers)
+            return [b'']
+        return self.wsgi_app(environ, start_response)
+
+
+app.wsgi_app = PreflightMiddleware(app.wsgi_app)
 
 @app.route('/get_response', methods=['POST'])
 def get_response():
@@ -68,23 +242,66 @@ def get_response():
         query = data.get('query')
         
         if not query:
-            response = jsonify({"error": "Query is required"})
-            response.headers.add("Access-Control-Allow-Origin", "*")
-            return response, 400
+            return jsonify({"error": "Query is required"}), 400
         
-        print(f"Received query: {query[:100]}...")  # Debug log
+        log.info("Received query: %s...", query[:100])
         response_text = get_agent_response(query)
-        print(f"Response generated successfully")  # Debug log
-        response = jsonify({"response": response_text})
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
+        log.info("Response generated successfully")
+        return jsonify({"response": response_text})
     except Exception as e:
-        print(f"Error in get_response: {str(e)}")  # Debug log
-        import traceback
-        traceback.print_exc()
-        response = jsonify({"error": str(e)})
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+        log.exception("Error in get_response: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+# Financial reports per (symbol, benchmark): the raw analysis is shared by
+# /financial_report and /generate_report, the encoded bodies (plain and
+# gzipped) serve repeat hits
+REPORT_CACHE_TTL = 3600
+_report_cache = TTLCache("finrep_raw", REPORT_CACHE_TTL)
+_report_body_cache = TTLCache("finrep_body", REPORT_CACHE_TTL)
+_report_flight = SingleFlight()  # concurrent cold requests share one download
+
+
+def _json_body_response(body, gzipped):
+    """
+    JSON response from pre-encoded bodies, gzipped when the client accepts it
+    
+    Args:
+        body: Encoded JSON bytes
+        gzipped: The same bytes, gzip-compressed
+    """
+    if request.accept_encodings['gzip'] > 0:
+        response = app.response_class(gzipped, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = app.response_class(body, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def _get_financial_report(symbol, benchmark):
+    """
+    Cached get_financial_report_json (error results are not cached)
+    
+    Args:
+        symbol: Upper-cased stock symbol
+        benchmark: Benchmark index symbol
+    
+    Returns:
+        Report dict from get_financial_report_json
+    """
+    key = f"{symbol}:{benchmark}"
+    report = _report_cache.get(key)
+    if report is None:
+        report = _report_flight.do(key, _build_financial_report, key, symbol, benchmark)
+    return report
+
+
+def _build_financial_report(key, symbol, benchmark):
+    """Cache-miss path of _get_financial_report (runs once per key at a time)"""
+    report = get_financial_report_json(symbol, benchmark)
+    if "error" not in report:
+        _report_cache.set(key, report)
+    return report
 
 @app.route('/financial_report', methods=['POST'])
 def financial_report():
@@ -101,7 +318,7 @@ def financial_report():
             return jsonify({"error": "Stock symbol is required"}), 400
         
         # Generate comprehensive financial report
-        report = get_financial_report_json(symbol.upper(), benchmark)
+        report = _get_financial_report(symbol.upper(), benchmark)
         
         if "error" in report:
             return jsonify(report), 400
@@ -128,10 +345,9 @@ def get_stock_data_endpoint():
         if not symbol:
             return jsonify({"error": "Stock symbol is required"}), 400
         
-        # Import the tool function
-        from ai_agent import get_stock_data
+        # The tool returns a JSON string - parse it, never eval it
         stock_data_str = get_stock_data.invoke({"symbol": symbol.upper()})
-        stock_data = eval(stock_data_str)  # Convert string back to dict
+        stock_data = json.loads(stock_data_str)
         
         if "error" in stock_data:
             return jsonify(stock_data), 400
@@ -151,20 +367,13 @@ def generate_comprehensive_report():
     Expected JSON payload: {"symbol": "AAPL", "benchmark": "^GSPC"}
     Returns: Structured financial report with all key metrics
     """
-    # Handle preflight request
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
-        print(f"Received request: {request.method} {request.url}")
-        print(f"Request headers: {dict(request.headers)}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Received request: %s %s", request.method, request.url)
+            log.debug("Request headers: %s", dict(request.headers))
         
         data = request.get_json()
-        print(f"Request data: {data}")
+        log.debug("Request data: %s", data)
         
         symbol = data.get('symbol')
         benchmark = data.get('benchmark', '^GSPC')
@@ -176,15 +385,19 @@ def generate_comprehensive_report():
                 "code": "MISSING_SYMBOL"
             }), 400
         
-        print(f"Processing report for symbol: {symbol}, benchmark: {benchmark}")
+        log.info("Processing report for symbol: %s, benchmark: %s", symbol, benchmark)
+        
+        cache_key = f"{symbol.upper()}:{benchmark}"
+        cached = _report_body_cache.get(cache_key)
+        if cached is not None:
+            log.info("⚡ Serving cached report for %s", symbol)
+            return _json_body_response(*cached)
         
         # Generate comprehensive financial report
         try:
-            report_data = get_financial_report_json(symbol.upper(), benchmark)
+            report_data = _get_financial_report(symbol.upper(), benchmark)
         except Exception as report_error:
-            print(f"Error generating report: {str(report_error)}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error generating report: %s", report_error)
             return jsonify({
                 "success": False,
                 "error": f"Failed to generate report: {str(report_error)}",
@@ -192,17 +405,25 @@ def generate_comprehensive_report():
             }), 500
         
         if "error" in report_data:
-            print(f"Report contains error: {report_data['error']}")
+            log.warning("Report contains error: %s", report_data['error'])
             return jsonify({
                 "success": False,
                 "error": report_data["error"],
                 "code": "ANALYSIS_ERROR"
             }), 400
         
+        # Headline metrics, looked up once for the rating helpers
+        cagr = report_data["performance_metrics"]["cagr"]["value"]
+        volatility = report_data["performance_metrics"]["volatility"]["value"]
+        sharpe = report_data["risk_metrics"]["sharpe_ratio"]["value"]
+        beta = report_data["risk_metrics"]["beta"]["value"]
+        max_drawdown = report_data["risk_metrics"]["max_drawdown"]["value"]
+        overall_rating, risk_factors = _rate_metrics(cagr, sharpe, volatility, beta, max_drawdown)
+        
         # Structure the response as a proper financial report
         financial_report = {
             "success": True,
-            "generated_at": "2025-09-04T00:00:00Z",
+            "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
             "report_type": "Comprehensive Financial Analysis",
             "analysis_period": report_data.get("analysis_period", "2 Years"),
             "stock_symbol": symbol.upper(),
@@ -217,7 +438,7 @@ def generate_comprehensive_report():
                 "market_cap": report_data["stock_info"]["market_cap"],
                 "investment_grade": report_data["investment_recommendation"]["risk_level"],
                 "suitable_for": report_data["investment_recommendation"]["suitable_for"],
-                "overall_rating": _calculate_overall_rating(report_data)
+                "overall_rating": overall_rating
             },
             
             # Performance Analysis
@@ -226,7 +447,7 @@ def generate_comprehensive_report():
                     "cagr": {
                         "value": report_data["performance_metrics"]["cagr"]["value"],
                         "percentage": report_data["performance_metrics"]["cagr"]["percentage"],
-                        "interpretation": _interpret_cagr(report_data["performance_metrics"]["cagr"]["value"]),
+                        "interpretation": _interpret_cagr(cagr),
                         "explanation": report_data["performance_metrics"]["cagr"]["explanation"]
                     }
                 },
@@ -234,7 +455,7 @@ def generate_comprehensive_report():
                     "volatility": {
                         "value": report_data["performance_metrics"]["volatility"]["value"],
                         "percentage": report_data["performance_metrics"]["volatility"]["percentage"],
-                        "risk_level": _interpret_volatility(report_data["performance_metrics"]["volatility"]["value"]),
+                        "risk_level": _interpret_volatility(volatility),
                         "explanation": report_data["performance_metrics"]["volatility"]["explanation"]
                     },
                     "sharpe_ratio": {
@@ -252,7 +473,7 @@ def generate_comprehensive_report():
                         "percentage": report_data["risk_metrics"]["max_drawdown"]["percentage"],
                         "peak_date": report_data["risk_metrics"]["max_drawdown"]["peak_date"],
                         "trough_date": report_data["risk_metrics"]["max_drawdown"]["trough_date"],
-                        "severity": _interpret_drawdown(report_data["risk_metrics"]["max_drawdown"]["value"]),
+                        "severity": _interpret_drawdown(max_drawdown),
                         "explanation": report_data["risk_metrics"]["max_drawdown"]["explanation"]
                     }
                 }
@@ -283,14 +504,14 @@ def generate_comprehensive_report():
             
             # Investment Recommendation
             "investment_recommendation": {
-                "recommendation": _generate_recommendation(report_data),
+                "recommendation": _generate_recommendation(cagr, sharpe),
                 "risk_assessment": {
                     "overall_risk": report_data["investment_recommendation"]["risk_level"],
                     "investor_profile": report_data["investment_recommendation"]["suitable_for"],
-                    "key_risk_factors": _extract_risk_factors(report_data)
+                    "key_risk_factors": risk_factors
                 },
                 "key_insights": report_data["investment_recommendation"]["key_insights"],
-                "action_points": _generate_action_points(report_data)
+                "action_points": _generate_action_points(cagr, sharpe, volatility)
             },
             
             # Educational Content
@@ -303,128 +524,117 @@ def generate_comprehensive_report():
                     "drawdown": report_data["educational_notes"]["drawdown_protection"],
                     "monte_carlo": report_data["educational_notes"]["monte_carlo_value"]
                 },
-                "learning_resources": {
-                    "beginner_concepts": [
-                        "Understanding CAGR for long-term investment planning",
-                        "Risk vs Return relationship through volatility",
-                        "Market sensitivity analysis using Beta"
-                    ],
-                    "advanced_concepts": [
-                        "Risk-adjusted performance evaluation",
-                        "Portfolio optimization using modern portfolio theory",
-                        "Scenario analysis through Monte Carlo simulations"
-                    ]
-                }
+                "learning_resources": _LEARNING_RESOURCES
             },
             
             # Technical Details
             "technical_details": {
-                "data_source": "Yahoo Finance",
-                "analysis_methodology": "Modern Portfolio Theory & CAPM",
+                **_TECHNICAL_DETAILS,
                 "data_points_analyzed": report_data.get("data_points_analyzed", "500+"),
-                "benchmark_index": benchmark,
-                "risk_free_rate_assumed": "2.0%",
-                "confidence_interval": "95%"
+                "benchmark_index": benchmark
             }
         }
         
-        print(f"✅ Successfully generated report for {symbol}")
-        return jsonify(financial_report)
+        log.info("✅ Successfully generated report for %s", symbol)
+        body = _encode_json(financial_report)
+        # Compressed once here so cache hits never re-compress
+        bodies = (body, gzip.compress(body, compresslevel=6))
+        _report_body_cache.set(cache_key, bodies)
+        return _json_body_response(*bodies)
         
     except Exception as e:
-        print(f"❌ Exception in generate_report endpoint: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("❌ Exception in generate_report endpoint: %s", e)
         return jsonify({
             "success": False,
             "error": f"Internal server error: {str(e)}",
             "code": "INTERNAL_ERROR"
         }), 500
 
-def _calculate_overall_rating(report_data):
-    """Calculate overall investment rating based on key metrics"""
-    cagr = report_data["performance_metrics"]["cagr"]["value"]
-    sharpe = report_data["risk_metrics"]["sharpe_ratio"]["value"]
-    volatility = report_data["performance_metrics"]["volatility"]["value"]
-    
-    score = 0
-    if cagr > 0.15: score += 2
-    elif cagr > 0.08: score += 1
-    
-    if sharpe > 1.5: score += 2
-    elif sharpe > 0.8: score += 1
-    
-    if volatility < 0.2: score += 1
-    elif volatility > 0.4: score -= 1
+# Static parts of /generate_report, shared by every report (never mutated)
+_LEARNING_RESOURCES = {
+    "beginner_concepts": [
+        "Understanding CAGR for long-term investment planning",
+        "Risk vs Return relationship through volatility",
+        "Market sensitivity analysis using Beta"
+    ],
+    "advanced_concepts": [
+        "Risk-adjusted performance evaluation",
+        "Portfolio optimization using modern portfolio theory",
+        "Scenario analysis through Monte Carlo simulations"
+    ]
+}
+_TECHNICAL_DETAILS = {
+    "data_source": "Yahoo Finance",
+    "analysis_methodology": "Modern Portfolio Theory & CAPM",
+    "risk_free_rate_assumed": "2.0%",
+    "confidence_interval": "95%"
+}
+
+# Labels for the rating ladders, indexed by the integer level each helper computes
+_RATING_LABELS = ("Poor", "Fair", "Good", "Excellent")
+_CAGR_LABELS = ("Negative Growth", "Weak Growth", "Moderate Growth", "Strong Growth", "Exceptional Growth")
+_VOLATILITY_LABELS = ("Low Risk", "Moderate Risk", "High Risk", "Very High Risk")
+_DRAWDOWN_LABELS = ("Mild", "Moderate", "Severe", "Extreme")
+_RECOMMENDATIONS = (
+    "Caution - Consider other alternatives or wait for better entry",
+    "Hold - Moderate performance, suitable for balanced portfolios",
+    "Buy - Good growth potential with acceptable risk",
+    "Strong Buy - Excellent risk-adjusted returns",
+)
+
+# Risk factor lists for every combination of the three risk flags, by bitmask
+_RISK_FACTOR_NAMES = (
+    "High price volatility",
+    "Highly sensitive to market movements",
+    "Significant historical drawdowns",
+)
+_RISK_FACTORS_BY_MASK = tuple(
+    tuple(name for bit, name in enumerate(_RISK_FACTOR_NAMES) if mask >> bit & 1)
+    or ("Low to moderate risk profile",)
+    for mask in range(1 << len(_RISK_FACTOR_NAMES))
+)
+
+def _rate_metrics(cagr, sharpe, volatility, beta, drawdown):
+    """
+    Overall investment rating and key risk factors in one pass over the metrics
     
-    if score >= 4: return "Excellent"
-    elif score >= 2: return "Good"
-    elif score >= 0: return "Fair"
-    else: return "Poor"
+    Returns:
+        (rating label, list of risk factor strings)
+    """
+    # Threshold hits summed as ints: +2/+1 for CAGR and Sharpe, +1/-1 for volatility
+    score = ((cagr > 0.15) + (cagr > 0.08) + (sharpe > 1.5) + (sharpe > 0.8)
+             + (volatility < 0.2) - (volatility > 0.4))
+    rating = _RATING_LABELS[(score >= 0) + (score >= 2) + (score >= 4)]
+    risk_mask = (volatility > 0.3) | (beta > 1.3) << 1 | (abs(drawdown) > 0.3) << 2
+    return rating, list(_RISK_FACTORS_BY_MASK[risk_mask])
 
 def _interpret_cagr(cagr):
     """Interpret CAGR value"""
-    if cagr > 0.20: return "Exceptional Growth"
-    elif cagr > 0.15: return "Strong Growth"
-    elif cagr > 0.08: return "Moderate Growth"
-    elif cagr > 0: return "Weak Growth"
-    else: return "Negative Growth"
+    return _CAGR_LABELS[(cagr > 0) + (cagr > 0.08) + (cagr > 0.15) + (cagr > 0.20)]
 
 def _interpret_volatility(volatility):
     """Interpret volatility value"""
-    if volatility > 0.4: return "Very High Risk"
-    elif volatility > 0.3: return "High Risk"
-    elif volatility > 0.2: return "Moderate Risk"
-    else: return "Low Risk"
+    return _VOLATILITY_LABELS[(volatility > 0.2) + (volatility > 0.3) + (volatility > 0.4)]
 
 def _interpret_drawdown(drawdown):
     """Interpret maximum drawdown"""
     drawdown = abs(drawdown)
-    if drawdown > 0.5: return "Extreme"
-    elif drawdown > 0.3: return "Severe"
-    elif drawdown > 0.2: return "Moderate"
-    else: return "Mild"
+    return _DRAWDOWN_LABELS[(drawdown > 0.2) + (drawdown > 0.3) + (drawdown > 0.5)]
 
-def _generate_recommendation(report_data):
+def _generate_recommendation(cagr, sharpe):
     """Generate investment recommendation"""
-    cagr = report_data["performance_metrics"]["cagr"]["value"]
-    sharpe = report_data["risk_metrics"]["sharpe_ratio"]["value"]
-    beta = report_data["risk_metrics"]["beta"]["value"]
-    
     if cagr > 0.15 and sharpe > 1.2:
-        return "Strong Buy - Excellent risk-adjusted returns"
+        return _RECOMMENDATIONS[3]
     elif cagr > 0.08 and sharpe > 0.8:
-        return "Buy - Good growth potential with acceptable risk"
+        return _RECOMMENDATIONS[2]
     elif cagr > 0 and sharpe > 0.5:
-        return "Hold - Moderate performance, suitable for balanced portfolios"
-    else:
-        return "Caution - Consider other alternatives or wait for better entry"
+        return _RECOMMENDATIONS[1]
+    return _RECOMMENDATIONS[0]
 
-def _extract_risk_factors(report_data):
-    """Extract key risk factors"""
-    factors = []
-    
-    volatility = report_data["performance_metrics"]["volatility"]["value"]
-    beta = report_data["risk_metrics"]["beta"]["value"]
-    drawdown = abs(report_data["risk_metrics"]["max_drawdown"]["value"])
-    
-    if volatility > 0.3:
-        factors.append("High price volatility")
-    if beta > 1.3:
-        factors.append("Highly sensitive to market movements")
-    if drawdown > 0.3:
-        factors.append("Significant historical drawdowns")
-    
-    return factors if factors else ["Low to moderate risk profile"]
-
-def _generate_action_points(report_data):
+def _generate_action_points(cagr, sharpe, volatility):
     """Generate actionable investment points"""
     actions = []
     
-    cagr = report_data["performance_metrics"]["cagr"]["value"]
-    sharpe = report_data["risk_metrics"]["sharpe_ratio"]["value"]
-    volatility = report_data["performance_metrics"]["volatility"]["value"]
-    
     if cagr > 0.15:
         actions.append("Consider increasing position size due to strong growth")
     if sharpe < 0.5:
@@ -437,27 +647,48 @@ def _generate_action_points(report_data):
     
     return actions
 
-@app.route('/test', methods=['GET', 'POST', 'OPTIONS'])
-def test_endpoint():
-    """Simple test endpoint to verify connectivity"""
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
-    return jsonify({
+# Static endpoint bodies, encoded once at import
+_HEALTH_BODY = _encode_json({"status": "healthy", "message": "Financial AI Agent API is running"})
+_TEST_BODIES = {
+    method: _encode_json({
         "success": True,
         "message": "Backend is working!",
-        "method": request.method,
+        "method": method,
         "timestamp": "2025-09-04"
     })
+    for method in ('GET', 'HEAD', 'POST')  # Flask adds HEAD to GET routes
+}
+_LANGUAGES_BODY = _encode_json({
+    "success": True,
+    "languages": [{"code": "en", "name": "English"}] + [
+        {"code": code, "name": name} for code, name in LANGUAGES.items()
+    ]
+})
+
+# Questionnaire and profile definitions are fixed for the process lifetime:
+# encoded once, and browsers revalidate with If-None-Match for a bodiless 304
+_RISK_QUESTIONS_BODY = _encode_json({"success": True, "questions": get_risk_questions()})
+_RISK_PROFILES_BODY = _encode_json({"success": True, "profiles": get_risk_profiles()})
+STATIC_MAX_AGE = 3600
+
+
+def _static_json_response(body):
+    """Cacheable response for a body that never changes while the server runs"""
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(hashlib.blake2b(body, digest_size=8).hexdigest())
+    response.cache_control.public = True
+    response.cache_control.max_age = STATIC_MAX_AGE
+    return response.make_conditional(request)
+
+@app.route('/test', methods=['GET', 'POST', 'OPTIONS'])
+def test_endpoint():
+    """Simple test endpoint to verify connectivity"""
+    return app.response_class(_TEST_BODIES[request.method], mimetype='application/json')
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({"status": "healthy", "message": "Financial AI Agent API is running"})
+    return app.response_class(_HEALTH_BODY, mimetype='application/json')
 
 @app.route('/sebi_content', methods=['GET', 'POST', 'OPTIONS'])
 def sebi_content():
@@ -468,13 +699,6 @@ def sebi_content():
     - summary (true/false)
     - ai_analysis (true/false) - Get Buy/Sell/Hold recommendations
     """
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
         # Get parameters
         if request.method == 'POST':
@@ -489,14 +713,12 @@ def sebi_content():
         
         # Validate language
         if language not in ['en'] + list(LANGUAGES.keys()):
-            response = jsonify({
+            return jsonify({
                 "success": False,
                 "error": f"Unsupported language. Supported: en, {', '.join(LANGUAGES.keys())}"
-            })
-            response.headers.add("Access-Control-Allow-Origin", "*")
-            return response, 400
+            }), 400
         
-        print(f"📰 Fetching latest financial news in {language} (AI Analysis: {include_ai_analysis})...")
+        log.info("📰 Fetching latest financial news in %s (AI Analysis: %s)...", language, include_ai_analysis)
         
         # Get aggregated content with AI analysis
         result = get_aggregated_content(
@@ -505,42 +727,71 @@ def sebi_content():
             include_ai_analysis=include_ai_analysis
         )
         
-        response = jsonify(result)
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
+        return jsonify(result)
         
     except Exception as e:
-        print(f"Error in sebi_content endpoint: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        response = jsonify({
+        log.exception("Error in sebi_content endpoint: %s", e)
+        return jsonify({
             "success": False,
             "error": f"Failed to fetch content: {str(e)}"
-        })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+        }), 500
 
 @app.route('/supported_languages', methods=['GET', 'OPTIONS'])
 def supported_languages():
     """Get list of supported vernacular languages"""
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
-    response = jsonify({
-        "success": True,
-        "languages": [{"code": "en", "name": "English"}] + [
-            {"code": code, "name": name} for code, name in LANGUAGES.items()
-        ]
-    })
-    response.headers.add("Access-Control-Allow-Origin", "*")
-    return response
+    return _static_json_response(_LANGUAGES_BODY)
+
+# Article lists per (session, news_type) and processed articles per index.
+# Shared across workers through Redis when configured; 15 minute TTL and
+# LRU-capped entry counts otherwise.
+ARTICLE_CACHE_TTL = 900
+_article_cache = TTLCache("articles", ARTICLE_CACHE_TTL, max_entries=256)
+_processed_cache = TTLCache("proc", ARTICLE_CACHE_TTL, max_entries=2048)
+
+# Articles ahead of the client's cursor are processed in the background while
+# it reads the current one, so the next poll is usually a cache hit
+STREAM_PREFETCH = 4
+_stream_executor = ThreadPoolExecutor(max_workers=8)
+_stream_inflight = {}  # processed key -> Future (this process only)
+_stream_inflight_lock = threading.Lock()
+
+
+def _processed_key(session, article_index, language, include_ai):
+    return f"{session['fetch_id']}:{article_index}:{language}:{int(bool(include_ai))}"
 
-# Global cache for articles per session
-_article_cache = {}
+
+def _process_stream_article(key, article, article_index, language, include_ai):
+    """Process one article into _processed_cache (cache is filled before the future resolves)"""
+    processed = _processed_cache.get(key)
+    if processed is None:
+        processed = process_article_progressive(
+            article, 
+            article_index, 
+            language=language,
+            include_ai_analysis=include_ai
+        )
+        _processed_cache.set(key, processed)
+    return processed
+
+
+def _submit_stream_article(session, article_index, language, include_ai):
+    """
+    Queue an article for background processing unless it is already queued
+    
+    Returns:
+        Future for the processed article
+    """
+    key = _processed_key(session, article_index, language, include_ai)
+    with _stream_inflight_lock:
+        future = _stream_inflight.get(key)
+        if future is None:
+            future = _stream_executor.submit(
+                _process_stream_article, key, session["articles"][article_index],
+                article_index, language, include_ai
+            )
+            _stream_inflight[key] = future
+            future.add_done_callback(lambda _, key=key: _stream_inflight.pop(key, None))
+    return future
 
 @app.route('/sebi_content_stream', methods=['POST', 'OPTIONS'])
 def sebi_content_stream():
@@ -549,13 +800,6 @@ def sebi_content_stream():
     Client calls this with article_index to get next article
     Supports filtering by news_type: 'general' for market news, 'stock' for stock-specific
     """
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
         data = request.get_json() or {}
         language = data.get('language', 'en')
@@ -563,82 +807,73 @@ def sebi_content_stream():
         session_id = data.get('session_id', 'default')
         news_type_filter = data.get('news_type', None)  # 'general' or 'stock' or None (all)
         
-        from progressive_fetcher import get_all_news_articles, process_article_progressive
-        
         # Get all articles (use session-based caching to prevent duplicates)
-        if article_index == 0 or session_id not in _article_cache:
-            # First request - fetch all news
+        session_key = f"{session_id}:{news_type_filter or 'all'}"
+        session = None if article_index == 0 else _article_cache.get(session_key)
+        if session is None:
+            # First request (or expired session) - fetch all news
             all_articles = get_all_news_articles()
             
             # Filter by news type if specified
             if news_type_filter:
                 all_articles = [a for a in all_articles if a.get('news_type') == news_type_filter]
-                print(f"\n🔍 Filtered to {len(all_articles)} '{news_type_filter}' news articles")
+                log.info("🔍 Filtered to %d '%s' news articles", len(all_articles), news_type_filter)
             
-            _article_cache[session_id] = all_articles
+            # fetch_id ties processed articles to this fetch, so a refetch never serves stale ones
+            session = {"fetch_id": uuid.uuid4().hex, "articles": all_articles}
+            _article_cache.set(session_key, session)
             total = len(all_articles)
-            print(f"\n🆕 New session {session_id}: {total} articles cached")
+            log.info("🆕 New session %s: %d articles cached", session_id, total)
         else:
             # Subsequent requests - use cached
-            all_articles = _article_cache.get(session_id, [])
+            all_articles = session["articles"]
             total = len(all_articles)
         
         if article_index >= len(all_articles):
-            response = jsonify({
+            return jsonify({
                 "success": True,
                 "article": None,
                 "has_more": False,
                 "total": total,
                 "current_index": article_index
             })
-            response.headers.add("Access-Control-Allow-Origin", "*")
-            return response
         
-        # Process this specific article
-        article = all_articles[article_index]
+        # Process this specific article (repeated polls reuse the processed result)
         include_ai = data.get('include_ai_analysis', False)
-        print(f"\n📰 Processing article {article_index + 1}/{total}...")
-        
-        processed = process_article_progressive(
-            article, 
-            article_index, 
-            language=language,
-            include_ai_analysis=include_ai
-        )
+        processed_key = _processed_key(session, article_index, language, include_ai)
+        with _stream_inflight_lock:
+            future = _stream_inflight.get(processed_key)
+        processed = _processed_cache.get(processed_key) if future is None else None
+        if processed is None:
+            if future is None:
+                log.info("📰 Processing article %d/%d...", article_index + 1, total)
+                future = _submit_stream_article(session, article_index, language, include_ai)
+            processed = future.result()
+        
+        # Work ahead on the next articles while the client reads this one
+        for next_index in range(article_index + 1, min(article_index + 1 + STREAM_PREFETCH, total)):
+            _submit_stream_article(session, next_index, language, include_ai)
         
-        response = jsonify({
+        return jsonify({
             "success": True,
             "article": processed,
             "has_more": article_index < total - 1,
             "total": total,
             "current_index": article_index
         })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
         
     except Exception as e:
-        print(f"Error in stream endpoint: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        response = jsonify({
+        log.exception("Error in stream endpoint: %s", e)
+        return jsonify({
             "success": False,
             "error": str(e)
-        })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+        }), 500
 
 @app.route('/get_ai_analysis', methods=['POST', 'OPTIONS'])
 def get_ai_analysis():
     """
     Get AI analysis for a specific article on demand
     """
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
         data = request.get_json() or {}
         title = data.get('title', '')
@@ -646,27 +881,21 @@ def get_ai_analysis():
         language = data.get('language', 'en')
         
         if not title or not content:
-            response = jsonify({
+            return jsonify({
                 "success": False,
                 "error": "Title and content are required"
-            })
-            response.headers.add("Access-Control-Allow-Origin", "*")
-            return response, 400
-        
-        print(f"\n🤖 Getting AI analysis for article...")
+            }), 400
         
-        from content_aggregator import get_ai_analysis_and_action, translate_content
+        log.info("🤖 Getting AI analysis for article...")
         
         # Get AI analysis
         ai_analysis = get_ai_analysis_and_action(title, content)
         
         if not ai_analysis:
-            response = jsonify({
+            return jsonify({
                 "success": False,
                 "error": "AI analysis failed due to rate limiting"
-            })
-            response.headers.add("Access-Control-Allow-Origin", "*")
-            return response, 503
+            }), 503
         
         # Translate summary if needed
         if language != 'en' and 'summary' in ai_analysis:
@@ -675,23 +904,17 @@ def get_ai_analysis():
             except:
                 pass
         
-        response = jsonify({
+        return jsonify({
             "success": True,
             "ai_analysis": ai_analysis
         })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
         
     except Exception as e:
-        print(f"Error in AI analysis endpoint: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        response = jsonify({
+        log.exception("Error in AI analysis endpoint: %s", e)
+        return jsonify({
             "success": False,
             "error": str(e)
-        })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+        }), 500
 
 @app.route('/sebi_content_progressive', methods=['POST', 'OPTIONS'])
 def sebi_content_progressive():
@@ -699,19 +922,12 @@ def sebi_content_progressive():
     Progressive loading endpoint - returns articles as they're processed
     Returns initial batch immediately, then client can poll for updates
     """
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
         data = request.get_json() or {}
         language = data.get('language', 'en')
         batch_size = data.get('batch_size', 5)  # Return 5 articles at a time
         
-        print(f"📰 Progressive fetch: language={language}, batch_size={batch_size}")
+        log.info("📰 Progressive fetch: language=%s, batch_size=%s", language, batch_size)
         
         # Get content with AI analysis (no translation yet for speed)
         result = get_aggregated_content(
@@ -721,75 +937,47 @@ def sebi_content_progressive():
         )
         
         if not result.get('success'):
-            response = jsonify(result)
-            response.headers.add("Access-Control-Allow-Origin", "*")
-            return response, 400
+            return jsonify(result), 400
         
         # If translation needed, do it in background for first batch
         if language != 'en' and result.get('content'):
-            from content_aggregator import translate_content, LANGUAGES
-            print(f"🌐 Translating first {batch_size} articles to {language}...")
+            log.info("🌐 Translating first %s articles to %s...", batch_size, language)
+            # Every field of the batch in as few requests as possible
+            fields = []
             for article in result['content'][:batch_size]:
-                try:
-                    article['title_translated'] = translate_content(article['title'], language)
-                    article['content_translated'] = translate_content(article['content'][:1000], language)
-                    if 'summary' in article:
-                        article['summary_translated'] = translate_content(article['summary'], language)
+                fields.append((article, 'title_translated', article['title']))
+                fields.append((article, 'content_translated', article['content'][:1000]))
+                if 'summary' in article:
+                    fields.append((article, 'summary_translated', article['summary']))
+            try:
+                translated = translate_batch([text for _, _, text in fields], language)
+                for (article, key, _), text in zip(fields, translated):
+                    article[key] = text
+                for article in result['content'][:batch_size]:
                     article['language'] = LANGUAGES.get(language, language)
-                except Exception as e:
-                    print(f"Translation error: {str(e)}")
+            except Exception as e:
+                log.warning("Translation error: %s", e)
         
         result['language'] = language
         result['is_progressive'] = True
         
-        response = jsonify(result)
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
+        return jsonify(result)
         
     except Exception as e:
-        print(f"Error in progressive endpoint: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        response = jsonify({
+        log.exception("Error in progressive endpoint: %s", e)
+        return jsonify({
             "success": False,
             "error": f"Failed to fetch content: {str(e)}"
-        })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+        }), 500
 
 @app.route('/risk_questions', methods=['GET', 'OPTIONS'])
 def risk_questions():
     """Get risk assessment questionnaire"""
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
-    try:
-        questions = get_risk_questions()
-        response = jsonify({
-            "success": True,
-            "questions": questions
-        })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
-    except Exception as e:
-        response = jsonify({"success": False, "error": str(e)})
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+    return _static_json_response(_RISK_QUESTIONS_BODY)
 
 @app.route('/calculate_risk_profile', methods=['POST', 'OPTIONS'])
 def calculate_risk_profile():
     """Calculate risk profile from questionnaire answers"""
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
         data = request.get_json()
         answers = data.get('answers', [])
@@ -807,146 +995,145 @@ def calculate_risk_profile():
             risk_result.get('answer_dict', {})
         )
         
-        response = jsonify({
+        return jsonify({
             "success": True,
             "risk_assessment": risk_result,
             "asset_allocation": allocation
         })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
     except Exception as e:
-        print(f"Error in risk profile calculation: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        response = jsonify({"success": False, "error": str(e)})
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+        log.exception("Error in risk profile calculation: %s", e)
+        return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/analyze_portfolio_risk', methods=['POST', 'OPTIONS'])
 def portfolio_risk():
     """Analyze portfolio risk metrics"""
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
         data = request.get_json()
         holdings = data.get('holdings', [])
         
         analysis = analyze_portfolio_risk(holdings)
         
-        response = jsonify({
+        return jsonify({
             "success": True,
             "analysis": analysis
         })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
     except Exception as e:
-        print(f"Error in portfolio risk analysis: {str(e)}")
-        response = jsonify({"success": False, "error": str(e)})
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+        log.exception("Error in portfolio risk analysis: %s", e)
+        return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/risk_profiles', methods=['GET', 'OPTIONS'])
 def risk_profiles():
     """Get all risk profile definitions"""
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
+    return _static_json_response(_RISK_PROFILES_BODY)
+
+def _sse_event(payload) -> str:
+    """Format one Server-Sent Events message carrying a JSON payload"""
+    return f"data: {_encode_json(payload).decode('utf-8')}\n\n"
+
+
+def _sse_response(events):
+    """
+    Streaming text/event-stream response
     
+    Args:
+        events: Iterable of already-formatted SSE messages
+    """
+    response = app.response_class(stream_with_context(events), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # let proxies pass chunks through immediately
+    return response
+
+# AI insights (TTL: 24 hours). Investors with the same risk profile and nearby
+# numbers get the same plan, not just those landing in one coarse bucket.
+# Exact inputs are also kept in the shared TTLCache (Redis when configured),
+# so every worker and restarts reuse plans already paid for.
+AI_INSIGHTS_TTL = 86400
+_ai_insights_cache = SimilarityCache(AI_INSIGHTS_TTL)
+_ai_insights_shared = TTLCache("ai_insights", AI_INSIGHTS_TTL, max_entries=1024)
+
+# Plans precomputed offline for the common input grid (see warm_insights.py).
+# They never expire in-process; regenerate the file to refresh them. Grid
+# points sit a few distance units apart, so seed matches are looser than
+# live ones.
+INSIGHTS_SEED_MAX_DISTANCE = 2.0
+INSIGHTS_SEED_PATH = os.getenv(
+    "INSIGHTS_SEED_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "insights.json")
+)
+
+
+def _load_insights_seed(path):
+    """Load precomputed insights into a never-expiring similarity cache"""
     try:
-        profiles = get_risk_profiles()
-        response = jsonify({
-            "success": True,
-            "profiles": profiles
-        })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
+        with open(path, "rb") as f:
+            entries = json.loads(f.read()).get("entries", [])
+    except FileNotFoundError:
+        return None
     except Exception as e:
-        response = jsonify({"success": False, "error": str(e)})
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+        print(f"⚠️ Could not load precomputed insights from {path}: {str(e)[:80]}")
+        return None
+    
+    seed = SimilarityCache(math.inf, max_distance=INSIGHTS_SEED_MAX_DISTANCE,
+                           max_entries=max(len(entries), 1))
+    for entry in entries:
+        seed.set(entry["risk_profile"], InsightsRequest(entry).features(), entry["insights"])
+    print(f"✅ Loaded {len(entries)} precomputed AI insights")
+    return seed
 
-# Global cache for AI insights (TTL: 24 hours)
-_ai_insights_cache = {}
-_cache_timestamps = {}
 
-@app.route('/ai_risk_insights', methods=['POST', 'OPTIONS'])
-def ai_risk_insights():
-    """
-    Generate AI-powered personalized investment insights and recommendations
-    Uses caching to avoid repeated API calls for same inputs
-    """
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
+class InsightsRequest:
+    """/ai_risk_insights inputs, read out of the request body once"""
     
-    try:
-        from datetime import datetime, timedelta
-        from langchain_groq import ChatGroq
-        from langchain_core.messages import SystemMessage, HumanMessage
-        import os
-        import time
-        
-        data = request.get_json()
-        risk_profile = data.get('risk_profile', 'moderate')
-        risk_score = data.get('risk_score', 50)
-        corpus = data.get('corpus', 100000)
-        age = data.get('age', 30)
-        investment_horizon = data.get('investment_horizon', 5)
-        allocation = data.get('allocation', {})
-        
-        # Create cache key
-        cache_key = f"{risk_profile}_{int(risk_score/10)*10}_{int(corpus/50000)*50000}_{age}_{investment_horizon}"
-        
-        # Check cache (24 hour TTL)
-        if cache_key in _ai_insights_cache:
-            cache_time = _cache_timestamps.get(cache_key)
-            if cache_time and (datetime.now() - cache_time).seconds < 86400:
-                print(f"✅ Returning cached AI insights for key: {cache_key}")
-                response = jsonify({
-                    "success": True,
-                    "insights": _ai_insights_cache[cache_key],
-                    "cached": True
-                })
-                response.headers.add("Access-Control-Allow-Origin", "*")
-                return response
-        
-        print(f"\n🤖 Generating AI insights for {risk_profile} profile...")
-        
-        # Initialize Groq
-        groq_api_key = os.getenv("GROQ_API_KEY")
-        llm = ChatGroq(
-            model="llama-3.3-70b-versatile",
-            temperature=0.7,
-            max_tokens=2000,
-            api_key=groq_api_key
-        )
-        
-        # Construct prompt
-        system_prompt = """You are an expert Indian financial advisor with 20+ years of experience. 
+    __slots__ = (
+        'risk_profile', 'risk_score', 'corpus', 'age', 'investment_horizon',
+        'equity', 'debt', 'gold', 'stream'
+    )
+    
+    def __init__(self, data: Dict):
+        self.risk_profile = data.get('risk_profile', 'moderate')
+        self.risk_score = data.get('risk_score', 50)
+        self.corpus = data.get('corpus', 100000)
+        self.age = data.get('age', 30)
+        self.investment_horizon = data.get('investment_horizon', 5)
+        allocation = data.get('allocation') or {}
+        self.equity = allocation.get('equity', 0)
+        self.debt = allocation.get('debt', 0)
+        self.gold = allocation.get('gold', 0)
+        self.stream = bool(data.get('stream'))
+    
+    def cache_key(self) -> str:
+        """Exact-match key for the shared insights cache"""
+        return ":".join(str(v) for v in (
+            self.risk_profile, self.risk_score, self.corpus, self.age,
+            self.investment_horizon, self.equity, self.debt, self.gold
+        ))
+    
+    def features(self) -> List[float]:
+        """
+        Scaled feature vector for the insights similarity cache
+        
+        Each feature is divided by the change that would make a different plan
+        worth generating, so a Euclidean distance of 1.0 is the hit threshold.
+        """
+        return [
+            self.risk_score / 10,                          # 10 score points
+            math.log(max(float(self.corpus), 1.0)) / 0.1,  # ~10% corpus change
+            self.age / 5,                                  # 5 years of age
+            self.investment_horizon / 2,                   # 2 years of horizon
+            self.equity / 5,                               # 5 allocation points each
+            self.debt / 5,
+            self.gold / 5,
+        ]
+
+
+# Everything invariant lives in the system message and the per-investor
+# numbers come last, so the provider can reuse its cached prompt prefix.
+_INSIGHTS_SYSTEM_PROMPT = """You are an expert Indian financial advisor with 20+ years of experience. 
 Provide personalized, actionable investment insights in a friendly, encouraging tone.
 Focus on Indian market context, SEBI-regulated products, and practical advice.
-Be specific, avoid jargon, and include exact numbers and steps."""
-        
-        user_prompt = f"""Create a personalized investment plan for this investor:
+Be specific, avoid jargon, and include exact numbers and steps.
 
-**Profile:**
-- Risk Profile: {risk_profile.upper()}
-- Risk Score: {risk_score}/100
-- Age: {age} years
-- Investment Horizon: {investment_horizon} years
-- Available Corpus: ₹{corpus:,}
-- Recommended Allocation: {allocation.get('equity', 0)}% Equity, {allocation.get('debt', 0)}% Debt, {allocation.get('gold', 0)}% Gold
+You will be given an investor's profile. Create a personalized investment plan for them.
 
 **Provide exactly these sections (use these exact headings):**
 
@@ -956,7 +1143,7 @@ Be specific, avoid jargon, and include exact numbers and steps."""
    - Important considerations
 
 2. INVESTMENT STRATEGY:
-   - Specific investment approach for your ₹{corpus:,} corpus
+   - Specific investment approach for the available corpus
    - Recommended instruments (mutual funds, ETFs, direct stocks)
    - Entry strategy (lump sum vs SIP)
 
@@ -978,73 +1165,128 @@ Be specific, avoid jargon, and include exact numbers and steps."""
    - Emergency fund recommendations
 
 Keep it concise, actionable, and encouraging. Use Indian rupees (₹) throughout."""
+_INSIGHTS_SYSTEM_MESSAGE = SystemMessage(content=_INSIGHTS_SYSTEM_PROMPT)
+_INSIGHTS_USER_PROMPT = Template("""Create a personalized investment plan for this investor:
+
+**Profile:**
+- Risk Profile: $risk_profile
+- Risk Score: $risk_score/100
+- Age: $age years
+- Investment Horizon: $investment_horizon years
+- Available Corpus: ₹$corpus
+- Recommended Allocation: $equity% Equity, $debt% Debt, $gold% Gold""")
+
+
+def _insights_messages(req: InsightsRequest):
+    """Chat messages asking for a personalized investment plan (shared with warm_insights.py)"""
+    user_prompt = _INSIGHTS_USER_PROMPT.substitute(
+        risk_profile=req.risk_profile.upper(),
+        risk_score=req.risk_score,
+        age=req.age,
+        investment_horizon=req.investment_horizon,
+        corpus=f"{req.corpus:,}",
+        equity=req.equity,
+        debt=req.debt,
+        gold=req.gold
+    )
+    return [_INSIGHTS_SYSTEM_MESSAGE, HumanMessage(content=user_prompt)]
+
+
+_ai_insights_seed = _load_insights_seed(INSIGHTS_SEED_PATH)
+
+
+@app.route('/ai_risk_insights', methods=['POST', 'OPTIONS'])
+def ai_risk_insights():
+    """
+    Generate AI-powered personalized investment insights and recommendations
+    Uses caching to avoid repeated API calls for same inputs
+    """
+    try:
+        req = InsightsRequest(request.get_json())
+        risk_profile = req.risk_profile
+        
+        # Check cache (24 hour TTL) for this profile and nearby inputs
+        features = req.features()
+        exact_key = req.cache_key()
+        cached_insights = _ai_insights_shared.get(exact_key)
+        if cached_insights is not None:
+            _ai_insights_cache.set(risk_profile, features, cached_insights)
+            distance = 0.0
+        else:
+            cached_insights, distance = _ai_insights_cache.get(risk_profile, features)
+            if cached_insights is None and _ai_insights_seed is not None:
+                cached_insights, distance = _ai_insights_seed.get(risk_profile, features)
+                if cached_insights is None:
+                    # Worth adding to the grid if these show up often
+                    log.info("insights grid miss: %s", exact_key)
+        if cached_insights is not None:
+            print(f"✅ Returning cached AI insights for {risk_profile} profile (distance {distance:.2f})")
+            if req.stream:
+                return _sse_response(iter([_sse_event({
+                    "done": True, "success": True, "insights": cached_insights, "cached": True
+                })]))
+            return jsonify({
+                "success": True,
+                "insights": cached_insights,
+                "cached": True
+            })
         
-        # Call AI with retry logic
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                messages = [
-                    SystemMessage(content=system_prompt),
-                    HumanMessage(content=user_prompt)
-                ]
-                
-                result = llm.invoke(messages)
-                ai_response = result.content
-                
-                # Parse response into structured format
-                insights = {
-                    "raw_insights": ai_response,
-                    "profile": risk_profile,
-                    "corpus": corpus,
-                    "generated_at": datetime.now().isoformat()
-                }
-                
-                # Cache the result
-                _ai_insights_cache[cache_key] = insights
-                _cache_timestamps[cache_key] = datetime.now()
-                
-                print(f"✅ AI insights generated successfully")
-                
-                response = jsonify({
-                    "success": True,
-                    "insights": insights,
-                    "cached": False
-                })
-                response.headers.add("Access-Control-Allow-Origin", "*")
-                return response
-                
-            except Exception as e:
-                error_msg = str(e)
-                if "rate_limit" in error_msg.lower() or "429" in error_msg:
-                    wait_time = 2 ** attempt
-                    print(f"    ⏳ Rate limited (attempt {attempt + 1}), waiting {wait_time}s...")
-                    time.sleep(wait_time)
-                    if attempt == max_retries - 1:
-                        raise
-                else:
-                    raise
+        print(f"\n🤖 Generating AI insights for {risk_profile} profile...")
+        
+        messages = _insights_messages(req)
+        
+        def cache_insights(ai_response):
+            insights = {
+                "raw_insights": ai_response,
+                "profile": risk_profile,
+                "corpus": req.corpus,
+                "generated_at": datetime.now().isoformat()
+            }
+            _ai_insights_cache.set(risk_profile, features, insights)
+            _ai_insights_shared.set(exact_key, insights)
+            return insights
+        
+        if req.stream:
+            # Tokens go to the client as they arrive; the full text is cached at the end
+            def generate():
+                parts = []
+                try:
+                    _acquire_llm_slot()
+                    for chunk in _insights_llm.stream(messages):
+                        if chunk.content:
+                            parts.append(chunk.content)
+                            yield _sse_event({"delta": chunk.content})
+                except Exception as e:
+                    log.exception("Error streaming AI insights: %s", e)
+                    yield _sse_event({"done": True, "success": False, "error": f"Failed to generate AI insights: {str(e)}"})
+                    return
+                insights = cache_insights("".join(parts))
+                yield _sse_event({"done": True, "success": True, "insights": insights, "cached": False})
+            return _sse_response(generate())
+        
+        ai_response = _groq_invoke(_insights_llm, messages).content
+        
+        # Parse response into structured format and cache it
+        insights = cache_insights(ai_response)
+        
+        print(f"✅ AI insights generated successfully")
+        
+        return jsonify({
+            "success": True,
+            "insights": insights,
+            "cached": False
+        })
         
     except Exception as e:
-        print(f"Error generating AI insights: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        response = jsonify({
+        log.exception("Error generating AI insights: %s", e)
+        return jsonify({
             "success": False,
             "error": f"Failed to generate AI insights: {str(e)}"
-        })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+        }), 500
 
 @app.route('/corpus_investment_plan', methods=['POST', 'OPTIONS'])
 def corpus_investment_plan():
     """Generate detailed investment plan for given corpus"""
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
         data = request.get_json()
         corpus = data.get('corpus', 100000)
@@ -1053,19 +1295,13 @@ def corpus_investment_plan():
         
         plan = calculate_corpus_investment_plan(corpus, allocation, investment_mode)
         
-        response = jsonify({
+        return jsonify({
             "success": True,
             "investment_plan": plan
         })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
     except Exception as e:
-        print(f"Error in corpus plan: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        response = jsonify({"success": False, "error": str(e)})
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+        log.exception("Error in corpus plan: %s", e)
+        return jsonify({"success": False, "error": str(e)}), 500
 
 # ===== LEGACY ALGO BUILDER ENDPOINTS (DEPRECATED - Use Strategy Builder System) =====
 # NOTE: These endpoints were used by the old AlgoBuilder.jsx (now in src/pages/_legacy/)
@@ -1144,18 +1380,26 @@ def corpus_investment_plan():
 
 # ===== MARKET DATA ENDPOINTS =====
 
+# These are INFORMATIONAL reads, so their results are cached for a short
+# window (shared through Redis when configured). COMMAND endpoints -
+# backtests, portfolios, deployments, risk scoring - are never cached.
+_cached_market_overview = cacheable("market_overview", 60)(get_market_overview)
+_cached_daily_history = cacheable("market_history", 300)(get_historical_data)
+_cached_intraday_history = cacheable("market_intraday", 60)(get_historical_data)
+_cached_intraday_data = cacheable("market_intraday_5m", 60)(get_intraday_data)
+_cached_stock_info = cacheable("stock_info", 900)(get_stock_info)
+
+# Intervals shorter than a day change within minutes
+_INTRADAY_INTERVALS = {'1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h'}
+
 @app.route('/market_overview', methods=['GET'])
 def market_overview():
     """Get complete market overview - indices, gainers, losers"""
     try:
-        data = get_market_overview()
-        response = jsonify(data)
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
+        data = _cached_market_overview()
+        return jsonify(data)
     except Exception as e:
-        response = jsonify({'success': False, 'error': str(e)})
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+        return jsonify({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/market_historical/<ticker>', methods=['GET'])
@@ -1169,20 +1413,17 @@ def market_historical(ticker):
         if ticker in INDIAN_INDICES:
             ticker = INDIAN_INDICES[ticker]
         
-        data = get_historical_data(ticker, period, interval)
-        response = jsonify({
+        fetch = _cached_intraday_history if interval in _INTRADAY_INTERVALS else _cached_daily_history
+        data = fetch(ticker, period, interval)
+        return jsonify({
             'success': True,
             'ticker': ticker,
             'period': period,
             'interval': interval,
             'data': data
         })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
     except Exception as e:
-        response = jsonify({'success': False, 'error': str(e)})
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+        return jsonify({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/market_intraday/<ticker>', methods=['GET'])
@@ -1193,114 +1434,135 @@ def market_intraday(ticker):
         if ticker in INDIAN_INDICES:
             ticker = INDIAN_INDICES[ticker]
         
-        data = get_intraday_data(ticker)
-        response = jsonify({
+        data = _cached_intraday_data(ticker)
+        return jsonify({
             'success': True,
             'ticker': ticker,
             'data': data
         })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
     except Exception as e:
-        response = jsonify({'success': False, 'error': str(e)})
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+        return jsonify({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/stock_info/<ticker>', methods=['GET'])
 def stock_info_endpoint(ticker):
     """Get detailed information about a specific stock"""
     try:
-        data = get_stock_info(ticker)
-        response = jsonify(data)
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
+        data = _cached_stock_info(ticker)
+        return jsonify(data)
     except Exception as e:
-        response = jsonify({'success': False, 'error': str(e)})
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+        return jsonify({'success': False, 'error': str(e)}), 500
 
 # ===== AI LEARNING ENDPOINTS =====
 
+# Lesson text is the same for every learner, so generated summaries and
+# simplified/Hindi versions are cached by a hash of their inputs
+LESSON_CACHE_TTL = 7 * 86400
+_lesson_summary_cache = TTLCache("lesson_summary", LESSON_CACHE_TTL)
+_lesson_content_cache = TTLCache("lesson_content", LESSON_CACHE_TTL, max_entries=1024)
+
+# Simplified and Hindi versions are independent Groq calls, run side by side
+_lesson_executor = ThreadPoolExecutor(max_workers=8)
+
+
+def _lesson_cache_key(*parts):
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+# Lesson prompts put their fixed instructions first and the lesson text last,
+# so requests share a long identical prefix the provider can cache
+_SUMMARY_PROMPT = Template("""You are a financial education expert. Create a concise, crystal-clear summary of the lesson below.
+
+Create a 1-2 sentence summary that captures the CORE concept in simple terms. Format:
+"[Topic] = [Simple Definition/Explanation]. Key insight: [Most important takeaway]"
+
+Examples:
+- "Investing = Making your money grow by buying assets. Key insight: Saving preserves money, investing multiplies it."
+- "Diversification = Spreading money across different investments. Key insight: Don't put all eggs in one basket to reduce risk."
+
+Output ONLY the summary, nothing else.
+
+Lesson: $lesson_title
+
+Content:
+$original_content""")
+
+_SIMPLIFIED_PROMPT = Template("""You are a financial education expert simplifying content for Indian retail investors who are beginners.
+
+Rewrite the lesson below in simple, easy-to-understand language. Use:
+- Short sentences
+- Common everyday words
+- Indian examples (₹, NSE, BSE, Nifty, etc.)
+- Analogies and real-life scenarios
+- Conversational tone
+
+Keep the same length but make it accessible to someone with no financial background.
+Output only the simplified content, no additional commentary.
+
+Module: $module_title
+Lesson: $lesson_title
+
+Original Content:
+$original_content""")
+
+_HINDI_PROMPT = Template("""You are a financial education expert translating content to Hindi for Indian investors.
+
+Translate the lesson below to Hindi (Devanagari script). Requirements:
+- Use simple, conversational Hindi
+- Keep financial terms in English (stocks, bonds, mutual funds, SIP, etc.) with Hindi explanation
+- Use ₹ for rupees
+- Make it natural and easy to read
+- Maintain the same structure and key points
+
+Output only the Hindi translation, no additional commentary.
+
+Module: $module_title
+Lesson: $lesson_title
+
+Original Content:
+$original_content""")
+
 @app.route('/generate_ai_summary', methods=['POST', 'OPTIONS'])
 def generate_ai_summary():
     """Generate AI summary for lesson content using Groq AI"""
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
-        from langchain_groq import ChatGroq
-        
         data = request.get_json()
         original_content = data.get('originalContent', '')
         lesson_title = data.get('lessonTitle', '')
         
         if not original_content:
-            response = jsonify({
+            return jsonify({
                 "success": False,
                 "error": "Original content is required"
-            })
-            response.headers.add("Access-Control-Allow-Origin", "*")
-            return response, 400
+            }), 400
         
         print(f"Generating AI summary for {lesson_title}")
         
-        # Initialize Groq LLM
-        groq_llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.5)
+        cache_key = _lesson_cache_key(lesson_title, original_content)
+        summary = _lesson_summary_cache.get(cache_key)
+        if summary is not None:
+            return jsonify({"success": True, "summary": summary, "cached": True})
         
-        summary_prompt = f"""You are a financial education expert. Create a concise, crystal-clear summary of this lesson.
-
-Lesson: {lesson_title}
-
-Content:
-{original_content}
-
-Create a 1-2 sentence summary that captures the CORE concept in simple terms. Format:
-"[Topic] = [Simple Definition/Explanation]. Key insight: [Most important takeaway]"
-
-Examples:
-- "Investing = Making your money grow by buying assets. Key insight: Saving preserves money, investing multiplies it."
-- "Diversification = Spreading money across different investments. Key insight: Don't put all eggs in one basket to reduce risk."
-
-Output ONLY the summary, nothing else."""
+        summary_prompt = _SUMMARY_PROMPT.substitute(lesson_title=lesson_title, original_content=original_content)
 
-        summary_response = groq_llm.invoke(summary_prompt).content
+        summary_response = _groq_invoke(_summary_llm, summary_prompt).content
+        _lesson_summary_cache.set(cache_key, summary_response.strip())
         
-        response = jsonify({
+        return jsonify({
             "success": True,
             "summary": summary_response.strip()
         })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
         
     except Exception as e:
-        print(f"Error generating AI summary: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        response = jsonify({
+        log.exception("Error generating AI summary: %s", e)
+        return jsonify({
             "success": False,
             "error": str(e)
-        })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+        }), 500
 
 @app.route('/generate_lesson_content', methods=['POST', 'OPTIONS'])
 def generate_lesson_content():
     """Generate simplified and Hindi translations of lesson content using Groq AI"""
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
-        from langchain_groq import ChatGroq
-        
         data = request.get_json()
         original_content = data.get('originalContent', '')
         lesson_title = data.get('lessonTitle', '')
@@ -1308,172 +1570,81 @@ def generate_lesson_content():
         content_type = data.get('contentType', 'both')  # 'simplified', 'hindi', or 'both'
         
         if not original_content:
-            response = jsonify({
+            return jsonify({
                 "success": False,
                 "error": "Original content is required"
-            })
-            response.headers.add("Access-Control-Allow-Origin", "*")
-            return response, 400
+            }), 400
         
         print(f"Generating {content_type} content for {lesson_title}")
         
-        # Initialize Groq LLM
-        groq_llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.7)
-        
+        # Each variant is cached on its own, so 'both' and single requests share
+        cache_key = _lesson_cache_key(module_title, lesson_title, original_content)
         result = {}
+        for variant in ('simplified', 'hindi'):
+            if content_type in [variant, 'both']:
+                cached = _lesson_content_cache.get(f"{variant}:{cache_key}")
+                if cached is not None:
+                    result[variant] = cached
+        
+        prompts = {}
+        if content_type in ['simplified', 'both'] and 'simplified' not in result:
+            simplified_prompt = _SIMPLIFIED_PROMPT.substitute(
+                module_title=module_title, lesson_title=lesson_title, original_content=original_content
+            )
+            prompts['simplified'] = simplified_prompt
+        
+        if content_type in ['hindi', 'both'] and 'hindi' not in result:
+            hindi_prompt = _HINDI_PROMPT.substitute(
+                module_title=module_title, lesson_title=lesson_title, original_content=original_content
+            )
+            prompts['hindi'] = hindi_prompt
+        
+        # Generate the missing variants concurrently; one failing still returns the other
+        futures = {variant: _lesson_executor.submit(_groq_invoke, _lesson_llm, prompt)
+                   for variant, prompt in prompts.items()}
+        errors = {}
+        for variant, future in futures.items():
+            try:
+                result[variant] = future.result().content.strip()
+                _lesson_content_cache.set(f"{variant}:{cache_key}", result[variant])
+            except Exception as e:
+                log.exception("Error generating %s content: %s", variant, e)
+                errors[variant] = str(e)
         
-        # Generate simplified content
-        if content_type in ['simplified', 'both']:
-            simplified_prompt = f"""You are a financial education expert simplifying content for Indian retail investors who are beginners.
-
-Module: {module_title}
-Lesson: {lesson_title}
-
-Original Content:
-{original_content}
-
-Please rewrite this in simple, easy-to-understand language. Use:
-- Short sentences
-- Common everyday words
-- Indian examples (₹, NSE, BSE, Nifty, etc.)
-- Analogies and real-life scenarios
-- Conversational tone
-
-Keep the same length but make it accessible to someone with no financial background.
-Output only the simplified content, no additional commentary."""
-
-            simplified_response = groq_llm.invoke(simplified_prompt).content
-            result['simplified'] = simplified_response.strip()
-        
-        # Generate Hindi translation
-        if content_type in ['hindi', 'both']:
-            hindi_prompt = f"""You are a financial education expert translating content to Hindi for Indian investors.
-
-Module: {module_title}
-Lesson: {lesson_title}
-
-Original Content:
-{original_content}
-
-Please translate this to Hindi (Devanagari script). Requirements:
-- Use simple, conversational Hindi
-- Keep financial terms in English (stocks, bonds, mutual funds, SIP, etc.) with Hindi explanation
-- Use ₹ for rupees
-- Make it natural and easy to read
-- Maintain the same structure and key points
-
-Output only the Hindi translation, no additional commentary."""
-
-            hindi_response = groq_llm.invoke(hindi_prompt).content
-            result['hindi'] = hindi_response.strip()
+        if errors and not result:
+            return jsonify({
+                "success": False,
+                "error": "; ".join(errors.values())
+            }), 500
+        if errors:
+            result['errors'] = errors
         
-        response = jsonify({
+        return jsonify({
             "success": True,
             **result
         })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
         
     except Exception as e:
-        print(f"Error generating lesson content: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        response = jsonify({
+        log.exception("Error generating lesson content: %s", e)
+        return jsonify({
             "success": False,
             "error": str(e)
-        })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
-
-@app.route('/quiz_recommendations', methods=['POST', 'OPTIONS'])
-def quiz_recommendations():
-    """Generate AI-powered learning recommendations based on quiz performance"""
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
-    try:
-        from langchain_groq import ChatGroq
-        import os
-        
-        data = request.get_json()
-        module_title = data.get('moduleTitle', '')
-        pre_quiz = data.get('preQuizScore', {})
-        post_quiz = data.get('postQuizScore', {})
-        weak_topics = data.get('weakTopics', [])
-        strong_topics = data.get('strongTopics', [])
-        improved_topics = data.get('improvedTopics', [])
-        declined_topics = data.get('declinedTopics', [])
-        consistently_wrong_topics = data.get('consistentlyWrongTopics', [])
-        performance_trend = data.get('performanceTrend', 'stable')
-        
-        if not module_title or not pre_quiz or not post_quiz:
-            response = jsonify({
-                "success": False,
-                "error": "Missing required quiz data"
-            })
-            response.headers.add("Access-Control-Allow-Origin", "*")
-            return response, 400
-        
-        print(f"Generating quiz recommendations for {module_title} - Trend: {performance_trend}")
-        
-        # Initialize Groq LLM
-        groq_llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.7)
-        
-        improvement = post_quiz.get('percentage', 0) - pre_quiz.get('percentage', 0)
-        
-        # Create detailed prompt
-        improvement_pct = improvement
-        total_questions = post_quiz.get('total', 0)
-        correct_in_post = post_quiz.get('score', 0)
-        correct_in_pre = pre_quiz.get('score', 0)
-        
-        prompt = f"""As an expert AI learning advisor for financial education, analyze this Indian student's quiz performance with DETAILED topic-level tracking and provide highly personalized, actionable recommendations.
-
-**Module**: {module_title}
-
-**📊 PERFORMANCE TRACKING**:
-- **Pre-Quiz**: {correct_in_pre}/{total_questions} ({pre_quiz.get('percentage', 0)}%) - Baseline before learning
-- **Post-Quiz**: {correct_in_post}/{total_questions} ({post_quiz.get('percentage', 0)}%) - After completing module
-- **Net Change**: {improvement_pct:+.0f}% ({correct_in_post - correct_in_pre:+d} questions)
-- **Performance Trend**: {performance_trend.upper()} {"📈" if performance_trend == "improving" else "📉" if performance_trend == "declining" else "➡️"}
-
-**🎯 DETAILED TOPIC ANALYSIS**:
-
-**Topics IMPROVED** (Wrong → Correct) ✅ [{len(improved_topics)} topics]:
-{chr(10).join([f"  ✓ {t}" for t in improved_topics]) if improved_topics else "  None - No improvement shown"}
-
-**Topics DECLINED** (Correct → Wrong) ⚠️ [{len(declined_topics)} topics] **CRITICAL**:
-{chr(10).join([f"  ⚠️ {t}" for t in declined_topics]) if declined_topics else "  None - No decline"}
-
-**Topics CONSISTENTLY WRONG** (Wrong in both) 🔴 [{len(consistently_wrong_topics)} topics] **HIGH PRIORITY**:
-{chr(10).join([f"  🔴 {t}" for t in consistently_wrong_topics]) if consistently_wrong_topics else "  None"}
-
-**All Weak Topics in Post-Quiz** [{len(weak_topics)} total]:
-{chr(10).join([f"{i+1}. {t}" for i, t in enumerate(weak_topics[:8])]) if weak_topics else "✓ Perfect score! All topics mastered."}
+        }), 500
 
-**All Strong Topics in Post-Quiz** [{len(strong_topics)} total]:
-{chr(10).join([f"{i+1}. {t}" for i, t in enumerate(strong_topics[:8])]) if strong_topics else "Need comprehensive review of all concepts."}
-
-**CRITICAL INSIGHTS**:
-- Performance is {performance_trend} ({improvement_pct:+.0f}%)
-- {len(declined_topics)} topics REGRESSED (knew before, forgot now) - URGENT attention needed
-- {len(consistently_wrong_topics)} topics NEVER mastered (wrong in both quizzes) - Fundamental gaps
-- {len(improved_topics)} topics LEARNED successfully - Reinforcement needed
-- Focus areas: {"DECLINED topics first, then CONSISTENTLY WRONG topics" if declined_topics or consistently_wrong_topics else "Maintain and expand knowledge"}
+# Quiz recommendation prompt, parsed once; the handler only fills in fields.
+# The fixed instructions form the system message and the student's results
+# follow, so every request starts with the same prompt prefix.
+_QUIZ_SYSTEM_MESSAGE = SystemMessage(content="""As an expert AI learning advisor for financial education, analyze the Indian student's quiz performance given below with DETAILED topic-level tracking and provide highly personalized, actionable recommendations.
 
 **YOUR TASK**: Create HIGHLY detailed, topic-specific recommendations following this structure:
 
-# Learning Recommendations for {module_title}
+# Learning Recommendations for [Module]
 
 ## 📊 Performance Summary
 
 Write 3-4 sentences:
-- Overall trend: {"Improving" if performance_trend == "improving" else "Declining" if performance_trend == "declining" else "Stable"} performance
-- Specific numbers: {correct_in_pre} → {correct_in_post} correct ({improvement_pct:+.0f}%)
+- Overall trend: improving, declining or stable performance
+- Specific numbers: pre-quiz → post-quiz correct answers (net change %)
 - What this means for their learning effectiveness
 - Current mastery level and readiness
 
@@ -1514,7 +1685,7 @@ Provide 6-8 SPECIFIC action items in priority order:
 
 ## 🧠 Customized Study Strategy
 
-Based on {performance_trend} trend, recommend:
+Based on their performance trend, recommend:
 - For DECLINING: [Specific intervention strategies]
 - For IMPROVING: [Momentum building techniques]
 - For STABLE: [Breakthrough strategies]
@@ -1536,22 +1707,119 @@ Connect to their financial goals and real-world impact
 
 **Tone**: Supportive, specific, actionable. Like a personal mentor who knows Indian markets.
 **Language**: Use Indian financial terms (₹, Crore, Lakh, SIP, NSE, BSE, SEBI)
-**Format**: Clean markdown with proper headings, bullet points, bold text, and emojis."""
+**Format**: Clean markdown with proper headings, bullet points, bold text, and emojis.""")
+_QUIZ_PROMPT = Template("""Analyze this student's quiz performance.
+
+**Module**: $module_title
+
+**📊 PERFORMANCE TRACKING**:
+- **Pre-Quiz**: $correct_in_pre/$total_questions ($pre_percentage%) - Baseline before learning
+- **Post-Quiz**: $correct_in_post/$total_questions ($post_percentage%) - After completing module
+- **Net Change**: $improvement% ($question_change questions)
+- **Performance Trend**: $trend_upper $trend_icon
+
+**🎯 DETAILED TOPIC ANALYSIS**:
+
+**Topics IMPROVED** (Wrong → Correct) ✅ [$improved_count topics]:
+$improved_list
+
+**Topics DECLINED** (Correct → Wrong) ⚠️ [$declined_count topics] **CRITICAL**:
+$declined_list
+
+**Topics CONSISTENTLY WRONG** (Wrong in both) 🔴 [$wrong_count topics] **HIGH PRIORITY**:
+$wrong_list
+
+**All Weak Topics in Post-Quiz** [$weak_count total]:
+$weak_list
+
+**All Strong Topics in Post-Quiz** [$strong_count total]:
+$strong_list
+
+**CRITICAL INSIGHTS**:
+- Performance is $performance_trend ($improvement%)
+- $declined_count topics REGRESSED (knew before, forgot now) - URGENT attention needed
+- $wrong_count topics NEVER mastered (wrong in both quizzes) - Fundamental gaps
+- $improved_count topics LEARNED successfully - Reinforcement needed
+- Focus areas: $focus_areas""")
+_TREND_ICONS = {"improving": "📈", "declining": "📉"}
+
+
+def _topic_lines(topics, marker, empty):
+    return "\n".join(marker + t for t in topics) if topics else empty
+
+
+def _numbered_topics(topics, empty, limit=8):
+    return "\n".join(f"{i}. {t}" for i, t in enumerate(topics[:limit], 1)) if topics else empty
+
+
+@app.route('/quiz_recommendations', methods=['POST', 'OPTIONS'])
+def quiz_recommendations():
+    """Generate AI-powered learning recommendations based on quiz performance"""
+    try:
+        data = request.get_json()
+        module_title = data.get('moduleTitle', '')
+        pre_quiz = data.get('preQuizScore', {})
+        post_quiz = data.get('postQuizScore', {})
+        weak_topics = data.get('weakTopics', [])
+        strong_topics = data.get('strongTopics', [])
+        improved_topics = data.get('improvedTopics', [])
+        declined_topics = data.get('declinedTopics', [])
+        consistently_wrong_topics = data.get('consistentlyWrongTopics', [])
+        performance_trend = data.get('performanceTrend', 'stable')
+        
+        if not module_title or not pre_quiz or not post_quiz:
+            return jsonify({
+                "success": False,
+                "error": "Missing required quiz data"
+            }), 400
+        
+        print(f"Generating quiz recommendations for {module_title} - Trend: {performance_trend}")
+        
+        improvement = post_quiz.get('percentage', 0) - pre_quiz.get('percentage', 0)
+        
+        # Create detailed prompt
+        improvement_pct = improvement
+        total_questions = post_quiz.get('total', 0)
+        correct_in_post = post_quiz.get('score', 0)
+        correct_in_pre = pre_quiz.get('score', 0)
+        
+        prompt = _QUIZ_PROMPT.substitute(
+            module_title=module_title,
+            correct_in_pre=correct_in_pre,
+            correct_in_post=correct_in_post,
+            total_questions=total_questions,
+            pre_percentage=pre_quiz.get('percentage', 0),
+            post_percentage=post_quiz.get('percentage', 0),
+            improvement=f"{improvement_pct:+.0f}",
+            question_change=f"{correct_in_post - correct_in_pre:+d}",
+            performance_trend=performance_trend,
+            trend_upper=performance_trend.upper(),
+            trend_icon=_TREND_ICONS.get(performance_trend, "➡️"),
+            improved_count=len(improved_topics),
+            improved_list=_topic_lines(improved_topics, "  ✓ ", "  None - No improvement shown"),
+            declined_count=len(declined_topics),
+            declined_list=_topic_lines(declined_topics, "  ⚠️ ", "  None - No decline"),
+            wrong_count=len(consistently_wrong_topics),
+            wrong_list=_topic_lines(consistently_wrong_topics, "  🔴 ", "  None"),
+            weak_count=len(weak_topics),
+            weak_list=_numbered_topics(weak_topics, "✓ Perfect score! All topics mastered."),
+            strong_count=len(strong_topics),
+            strong_list=_numbered_topics(strong_topics, "Need comprehensive review of all concepts."),
+            focus_areas=("DECLINED topics first, then CONSISTENTLY WRONG topics"
+                         if declined_topics or consistently_wrong_topics
+                         else "Maintain and expand knowledge"),
+        )
         
         # Generate recommendations using Groq
-        response_text = groq_llm.invoke(prompt).content
+        response_text = _groq_invoke(_lesson_llm, [_QUIZ_SYSTEM_MESSAGE, HumanMessage(content=prompt)]).content
         
-        response = jsonify({
+        return jsonify({
             "success": True,
             "recommendations": response_text
         })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
         
     except Exception as e:
-        print(f"Error generating quiz recommendations: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error generating quiz recommendations: %s", e)
         
         # Fallback to mock recommendations
         try:
@@ -1587,19 +1855,15 @@ You've shown {'significant improvement' if improvement > 0 else 'consistent perf
 Remember: Every expert was once a beginner. Keep learning, stay curious, and don't hesitate to revisit topics as many times as needed! 🚀
 """
             
-            response = jsonify({
+            return jsonify({
                 "success": True,
                 "recommendations": mock_response
             })
-            response.headers.add("Access-Control-Allow-Origin", "*")
-            return response
         except:
-            response = jsonify({
+            return jsonify({
                 "success": False,
                 "error": "Failed to generate recommendations"
-            })
-            response.headers.add("Access-Control-Allow-Origin", "*")
-            return response, 500
+            }), 500
 
 # ==================== PORTFOLIO ANALYZER ENDPOINTS (Friend's work) ====================
 
@@ -1612,40 +1876,27 @@ def upload_portfolio():
     """
     Upload and analyze portfolio PDF
     """
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
         # Check if file is present
         if 'file' not in request.files:
-            response = jsonify({
+            return jsonify({
                 "success": False,
                 "error": "No file uploaded"
-            })
-            response.headers.add("Access-Control-Allow-Origin", "*")
-            return response, 400
+            }), 400
         
         file = request.files['file']
         
         if file.filename == '':
-            response = jsonify({
+            return jsonify({
                 "success": False,
                 "error": "No file selected"
-            })
-            response.headers.add("Access-Control-Allow-Origin", "*")
-            return response, 400
+            }), 400
         
         if not allowed_file(file.filename):
-            response = jsonify({
+            return jsonify({
                 "success": False,
                 "error": "Only PDF and CSV files are allowed"
-            })
-            response.headers.add("Access-Control-Allow-Origin", "*")
-            return response, 400
+            }), 400
         
         # Save file securely
         filename = secure_filename(file.filename)
@@ -1665,12 +1916,10 @@ def upload_portfolio():
             if not text:
                 # Clean up file
                 os.remove(filepath)
-                response = jsonify({
+                return jsonify({
                     "success": False,
                     "error": "Failed to extract text from PDF. Please ensure it's a valid portfolio statement or try CSV format."
-                })
-                response.headers.add("Access-Control-Allow-Origin", "*")
-                return response, 500
+                }), 500
             
             # Parse portfolio data
             portfolio = parse_portfolio_data(text)
@@ -1678,12 +1927,10 @@ def upload_portfolio():
         if not portfolio["stocks"] or len(portfolio["stocks"]) == 0:
             # Clean up file
             os.remove(filepath)
-            response = jsonify({
+            return jsonify({
                 "success": False,
                 "error": "No portfolio data found in PDF. Please upload a valid broker statement with stock holdings."
-            })
-            response.headers.add("Access-Control-Allow-Origin", "*")
-            return response, 400
+            }), 400
         
         # Analyze portfolio composition
         analysis = analyze_portfolio_composition(portfolio)
@@ -1693,17 +1940,15 @@ def upload_portfolio():
         
         print(f"✅ Portfolio parsed: {len(portfolio['stocks'])} stocks found")
         
-        response = jsonify({
+        return jsonify({
             "success": True,
             "portfolio": portfolio,
             "analysis": analysis,
             "message": f"Successfully analyzed portfolio with {len(portfolio['stocks'])} stocks"
         })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
         
     except Exception as e:
-        print(f"❌ Error processing portfolio: {str(e)}")
+        log.exception("❌ Error processing portfolio: %s", e)
         # Clean up file if it exists
         try:
             if 'filepath' in locals() and os.path.exists(filepath):
@@ -1711,37 +1956,26 @@ def upload_portfolio():
         except:
             pass
         
-        response = jsonify({
+        return jsonify({
             "success": False,
             "error": f"Error processing portfolio: {str(e)}"
-        })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+        }), 500
 
 @app.route('/analyze_portfolio_ai', methods=['POST', 'OPTIONS'])
 def analyze_portfolio_ai():
     """
     Get AI-powered insights for portfolio
     """
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
         data = request.get_json()
         portfolio = data.get('portfolio')
         analysis = data.get('analysis')
         
         if not portfolio or not analysis:
-            response = jsonify({
+            return jsonify({
                 "success": False,
                 "error": "Portfolio and analysis data required"
-            })
-            response.headers.add("Access-Control-Allow-Origin", "*")
-            return response, 400
+            }), 400
         
         print(f"🤖 Generating AI insights for portfolio...")
         
@@ -1753,21 +1987,17 @@ def analyze_portfolio_ai():
         
         print(f"✅ AI insights generated successfully")
         
-        response = jsonify({
+        return jsonify({
             "success": True,
             "insights": ai_insights
         })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response
         
     except Exception as e:
-        print(f"❌ Error generating AI insights: {str(e)}")
-        response = jsonify({
+        log.exception("❌ Error generating AI insights: %s", e)
+        return jsonify({
             "success": False,
             "error": f"Error generating insights: {str(e)}"
-        })
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        return response, 500
+        }), 500
 
 # ==================== STRATEGY BUILDER & BACKTESTING ENDPOINTS (Your work) ====================
 
@@ -1919,10 +2149,17 @@ def get_backtest_results(backtest_id):
         if not backtest:
             return jsonify({'error': 'Backtest not found'}), 404
         
-        return jsonify({
-            'success': True,
-            'backtest': backtest.to_dict()
-        })
+        # Results never change once done, so the encoded body lives on the record
+        body = backtest.response_body
+        if body is None:
+            body = _encode_json({
+                'success': True,
+                'backtest': backtest.to_dict()
+            })
+            if backtest.completed_at is not None:  # set last by the worker thread
+                backtest.response_body = body
+        
+        return app.response_class(body, mimetype='application/json')
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -2108,6 +2345,7 @@ def close_positions(portfolio_id):
         elif not symbol:
             # Close all positions
             portfolio.holdings = {}
+            portfolio.holdings_value = 0.0
             return jsonify({
                 'success': True,
                 'message': 'All positions closed'
@@ -2142,4 +2380,6 @@ if __name__ == "__main__":
     print("  - POST /generate_ai_summary (Generate AI lesson summary)")
     print("  - POST /generate_lesson_content (Generate simplified/Hindi content)")
     print("  - POST /quiz_recommendations (AI quiz performance recommendations)")
-    app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
+    warm_up_kernels()
+    # threaded: a request blocked on Yahoo/LLM I/O must not hold up the others
+    app.run(debug=True, host='0.0.0.0', port=5001, threaded=True)
\ No newline at end of file
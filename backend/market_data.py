@@ -159,19 +159,24 @@ def get_historical_data(ticker: str, period: str = '1mo', interval: str = '1d')
         stock = yf.Ticker(ticker)
         hist = stock.history(period=period, interval=interval)
         
-        data = []
-        for index, row in hist.iterrows():
-            data.append({
-                'date': index.strftime('%Y-%m-%d'),
-                'timestamp': int(index.timestamp() * 1000),
-                'open': round(row['Open'], 2),
-                'high': round(row['High'], 2),
-                'low': round(row['Low'], 2),
-                'close': round(row['Close'], 2),
-                'volume': int(row['Volume'])
-            })
-        
-        return data
+        # Convert whole columns at once (iterrows builds a Series per candle)
+        # and hand back plain Python numbers, which serialize fastest
+        index = hist.index
+        ohlc = hist[['Open', 'High', 'Low', 'Close']].round(2)
+        columns = zip(
+            index.strftime('%Y-%m-%d').tolist(),
+            index.as_unit('ms').asi8.tolist(),
+            ohlc['Open'].tolist(),
+            ohlc['High'].tolist(),
+            ohlc['Low'].tolist(),
+            ohlc['Close'].tolist(),
+            hist['Volume'].fillna(0).astype('int64').tolist()
+        )
+        return [
+            {'date': date, 'timestamp': timestamp, 'open': open_, 'high': high,
+             'low': low, 'close': close, 'volume': volume}
+            for date, timestamp, open_, high, low, close, volume in columns
+        ]
     except Exception as e:
         print(f"Error fetching historical data for {ticker}: {e}")
         return []
@@ -49,6 +49,7 @@ class Backtest:
         self.error = None
         self.created_at = datetime.utcnow()
         self.completed_at = None
+        self.response_body = None  # Encoded GET /backtest body, kept once completed
     
     def to_dict(self):
         return {
@@ -76,6 +77,7 @@ class Portfolio:
         self.initial_capital = initial_capital
         self.cash = initial_capital
         self.holdings = {}  # symbol -> {qty, avgPrice, currentPrice, pnl}
+        self.holdings_value = 0.0  # Sum of qty * currentPrice, kept up to date by the forward runner
         self.trades = []
         self.equity_curve = []
         self.created_at = datetime.utcnow()
@@ -2,16 +2,18 @@
 Progressive news fetcher - Returns articles one by one as they're processed
 """
 from content_aggregator import (
-    OFFICIAL_SOURCES, scrape_rss_feed, scrape_sebi_content,
-    get_ai_analysis_and_action, translate_content, LANGUAGES
+    OFFICIAL_SOURCES, _SOURCE_SLUGS, scrape_rss_feed, scrape_sebi_content,
+    get_ai_analysis_and_action, translate_batch, LANGUAGES
 )
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import time
 
 def process_article_progressive(article, idx, language='en', include_ai_analysis=True):
     """Process a single article and return it immediately"""
+    source_slug = _SOURCE_SLUGS.get(article['source']) or article['source'].lower().replace(' ', '_')
     processed_article = {
-        "id": f"{article['source'].lower().replace(' ', '_')}_{idx}_{int(time.time())}",
+        "id": f"{source_slug}_{idx}_{int(time.time())}",
         "title": article["title"],
         "content": article["content"],
         "source": article["source"],
@@ -40,9 +42,8 @@ def process_article_progressive(article, idx, language='en', include_ai_analysis
                 processed_article["summary"] = article["content"][:200] + "..."
                 processed_article["action"] = "WATCH"
                 processed_article["sentiment"] = "Neutral"
-            
-            # Longer delay to respect rate limits
-            time.sleep(2.0)
+            # Rate limits are handled inside get_ai_analysis_and_action
+            # (shared Groq semaphore + backoff on 429), so no fixed delay here
         except Exception as e:
             print(f"    ⚠️ AI failed: {str(e)[:80]}")
             processed_article["summary"] = article["content"][:200] + "..."
@@ -52,10 +53,14 @@ def process_article_progressive(article, idx, language='en', include_ai_analysis
     # Translate if needed
     if language != 'en':
         try:
-            processed_article["title_translated"] = translate_content(article["title"], language)
-            processed_article["content_translated"] = translate_content(article["content"][:800], language)
+            # All fields in one batched request instead of one call per field
+            fields = [("title_translated", article["title"]),
+                      ("content_translated", article["content"][:800])]
             if "summary" in processed_article:
-                processed_article["summary_translated"] = translate_content(processed_article["summary"], language)
+                fields.append(("summary_translated", processed_article["summary"]))
+            translated = translate_batch([text for _, text in fields], language)
+            for (key, _), text in zip(fields, translated):
+                processed_article[key] = text
             processed_article["language"] = LANGUAGES.get(language, language)
         except Exception as e:
             print(f"    ⚠️ Translation failed: {str(e)[:60]}")
@@ -149,25 +154,31 @@ def classify_news_type(title, content):
     return 'general', category
 
 
+def _scrape_source(source_info):
+    """Fetch the articles of one configured source (runs on the fetch thread pool)"""
+    print(f"  → Scraping {source_info['name']}...")
+    
+    if "rss_url" in source_info:
+        return scrape_rss_feed(
+            source_info["rss_url"], 
+            source_info["name"], 
+            max_articles=10  # Max articles per quality source
+        )
+    elif "url" in source_info:
+        return scrape_sebi_content(source_info["url"], max_articles=2)
+    return []
+
+
 def get_all_news_articles():
     """Fetch all news articles from sources"""
     all_content = []
     
     print("🔄 Fetching latest Indian financial news...")
-    for source_key, source_info in OFFICIAL_SOURCES.items():
-        print(f"  → Scraping {source_info['name']}...")
-        
-        if "rss_url" in source_info:
-            articles = scrape_rss_feed(
-                source_info["rss_url"], 
-                source_info["name"], 
-                max_articles=10  # Max articles per quality source
-            )
-        elif "url" in source_info:
-            articles = scrape_sebi_content(source_info["url"], max_articles=2)
-        else:
-            articles = []
-        
+    # Feeds are IO-bound - fetch them all at once, then merge in source order
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        source_articles = list(executor.map(_scrape_source, OFFICIAL_SOURCES.values()))
+    
+    for articles in source_articles:
         for article in articles:
             article["verified"] = True
             
@@ -0,0 +1,106 @@
+"""
+Precompute AI risk insights for the common input grid
+Usage (from backend/): python warm_insights.py [--workers 4] [--output insights.json]
+
+Writes the plans main.py loads at startup, so most /ai_risk_insights requests
+are answered without calling Groq. Entries already in the output file are
+kept and skipped, so re-running (e.g. nightly) only fills in what is missing.
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from risk_assessment import RISK_PROFILES, suggest_asset_allocation
+from main import INSIGHTS_SEED_PATH, InsightsRequest, _groq_invoke, _insights_llm, _insights_messages
+
+AGES = [25, 30, 35, 40, 45, 50, 55]
+HORIZONS = [1, 3, 5, 7, 10, 15, 20]
+CORPUS_LEVELS = [10000, 25000, 50000, 100000, 200000, 500000,
+                 1000000, 2500000, 5000000, 10000000]
+SAVE_EVERY = 50
+
+
+def _entry_key(entry):
+    return (entry["risk_profile"], entry["risk_score"], entry["corpus"],
+            entry["age"], entry["investment_horizon"])
+
+
+def build_grid():
+    """Input combinations to precompute: every 10 score points of each profile's range"""
+    grid = []
+    for profile, details in RISK_PROFILES.items():
+        low, high = details["score_range"]
+        for risk_score in range(low - low % 10 + 5, high + 1, 10):
+            for age in AGES:
+                for horizon in HORIZONS:
+                    # Questionnaire answers that would land on this score
+                    answers = {q: round(risk_score / 10) for q in range(1, 11)}
+                    allocation = suggest_asset_allocation(profile, age, horizon, answers)
+                    allocation = {k: allocation[k] for k in ("equity", "debt", "gold")}
+                    for corpus in CORPUS_LEVELS:
+                        grid.append({
+                            "risk_profile": profile,
+                            "risk_score": risk_score,
+                            "corpus": corpus,
+                            "age": age,
+                            "investment_horizon": horizon,
+                            "allocation": allocation,
+                        })
+    return grid
+
+
+def generate(entry):
+    """Call Groq for one grid point"""
+    result = _groq_invoke(_insights_llm, _insights_messages(InsightsRequest(entry)))
+    return {**entry, "insights": {
+        "raw_insights": result.content,
+        "profile": entry["risk_profile"],
+        "corpus": entry["corpus"],
+        "generated_at": datetime.now().isoformat()
+    }}
+
+
+def save(path, entries):
+    """Write atomically so a running server never reads a half-written file"""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"generated_at": datetime.now().isoformat(), "entries": entries}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute AI risk insights")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent Groq calls (keep under the rate limit)")
+    parser.add_argument("--output", default=INSIGHTS_SEED_PATH)
+    args = parser.parse_args()
+
+    entries = []
+    if os.path.exists(args.output):
+        with open(args.output, encoding="utf-8") as f:
+            entries = json.load(f).get("entries", [])
+    done = {_entry_key(e) for e in entries}
+    todo = [e for e in build_grid() if _entry_key(e) not in done]
+    print(f"🔥 {len(entries)} insights cached, {len(todo)} to generate with {args.workers} workers")
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(generate, e) for e in todo]
+        for i, future in enumerate(as_completed(futures), 1):
+            try:
+                entries.append(future.result())
+            except Exception as e:
+                failed += 1
+                print(f"⚠️ Generation failed: {str(e)[:80]}")
+            if i % SAVE_EVERY == 0:
+                save(args.output, entries)
+                print(f"   {i}/{len(todo)} done")
+
+    save(args.output, entries)
+    print(f"✅ Wrote {len(entries)} insights to {args.output} ({failed} failed, re-run to retry)")
+
+
+if __name__ == "__main__":
+    main()